@@ -0,0 +1,98 @@
+"""
+Débit de la classification sous appels concurrents, avec et sans regroupement.
+
+Un modèle synthétique (TF-IDF + MultinomialNB) est entraîné en mémoire; N
+threads appellent CVClassifier.rank en boucle sur des textes distincts (le
+cache des prédictions est désactivé), avec chacun des deux moteurs
+d'inférence. Le regroupement n'est utile que si le coût fixe d'un passage du
+modèle domine celui de chaque texte: c'est le cas du moteur scikit-learn,
+pas du moteur NumPy.
+
+    python benchmarks/inference_batching.py [threads] [appels par thread]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cvclassifier.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import override_settings  # noqa: E402
+
+WORDS = (
+    "python django react java spring audit tax accounting finance sales "
+    "marketing nurse hospital teacher school design photoshop lawyer contract"
+).split()
+
+
+def corpus(count, seed=0):
+    import random
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(WORDS) for _ in range(200)) for _ in range(count)]
+
+
+def train(path):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.naive_bayes import MultinomialNB
+    from resumes.model_bundle import save_bundle
+
+    texts = corpus(400, seed=1)
+    labels = [f'CATEGORY_{i % 24}' for i in range(len(texts))]
+    vectorizer = TfidfVectorizer()
+    model = MultinomialNB().fit(vectorizer.fit_transform(texts), labels)
+    save_bundle(model, vectorizer, path)
+
+
+def run(path, threads, calls, engine, batching):
+    from resumes.ml_classifier import CVClassifier
+
+    config = {'ENABLED': batching, 'MAX_BATCH_SIZE': 32, 'MAX_WAIT_MS': 2}
+    with override_settings(
+        PREDICTION_CACHE={'BACKEND': None}, INFERENCE_BATCHING=config, INFERENCE_ENGINE=engine
+    ):
+        classifier = CVClassifier(base_path=path)
+        # Chargement paresseux: forcé ici pour lire INFERENCE_ENGINE sous override_settings
+        classifier.is_loaded
+
+    texts = corpus(threads * calls, seed=2)
+
+    def worker(offset):
+        for i in range(calls):
+            classifier.rank(texts[offset * calls + i])
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    stats = classifier.batcher.stats() if classifier.batcher else None
+    return threads * calls / elapsed, stats
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    with tempfile.TemporaryDirectory() as path:
+        train(path)
+        print(f"{'moteur':<8} {'mode':<12} {'appels/s':>10} {'taille moyenne des lots':>24}")
+        for engine in ('numpy', 'sklearn'):
+            for batching in (False, True):
+                throughput, stats = run(path, threads, calls, engine, batching)
+                average = stats['average_batch_size'] if stats else 1
+                mode = 'regroupé' if batching else 'direct'
+                print(f"{engine:<8} {mode:<12} {throughput:>10.0f} {average:>24}")
+
+
+if __name__ == '__main__':
+    main()
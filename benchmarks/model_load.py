@@ -0,0 +1,79 @@
+"""
+Compare le chargement du modèle: pickles vs bundle mmap.
+
+Chaque format est chargé dans un processus neuf; on mesure le temps de
+chargement et la mémoire privée/partagée du processus (Linux, smaps_rollup).
+
+    python benchmarks/model_load.py [ml_models]
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, os, pickle, sys, time
+sys.path.insert(0, {root!r})
+
+def memory():
+    values = {{}}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                key, _, rest = line.partition(':')
+                if key in ('Rss', 'Private_Clean', 'Private_Dirty', 'Shared_Clean', 'Shared_Dirty'):
+                    values[key] = int(rest.split()[0])
+    except OSError:
+        pass
+    return values
+
+import numpy, sklearn.naive_bayes, sklearn.feature_extraction.text
+before = memory()
+started = time.perf_counter()
+
+if {fmt!r} == 'pickle':
+    with open(os.path.join({path!r}, 'resume_classifier.pkl'), 'rb') as f:
+        model = pickle.load(f)
+    with open(os.path.join({path!r}, 'vectorizer.pkl'), 'rb') as f:
+        vectorizer = pickle.load(f)
+else:
+    from resumes.model_bundle import load_bundle
+    model, vectorizer, _ = load_bundle({path!r}, verify=False)
+
+model.predict_proba(vectorizer.transform(['python developer']))
+elapsed = time.perf_counter() - started
+after = memory()
+private_kb = sum(after.get(k, 0) - before.get(k, 0) for k in ('Private_Clean', 'Private_Dirty'))
+print(json.dumps({{'load_ms': elapsed * 1000, 'private_kb': private_kb, 'rss_kb': after.get('Rss', 0)}}))
+"""
+
+
+def run(fmt, path):
+    code = CHILD.format(root=ROOT, fmt=fmt, path=path)
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    path = os.path.abspath(sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, 'ml_models'))
+
+    formats = []
+    if os.path.exists(os.path.join(path, 'resume_classifier.pkl')):
+        formats.append('pickle')
+    if os.path.exists(os.path.join(path, 'manifest.json')):
+        formats.append('bundle')
+    if not formats:
+        print(f"Aucun modèle dans {path}")
+        return 1
+
+    print(f"{'format':<8} {'chargement (ms)':>16} {'mémoire privée (Ko)':>20} {'RSS (Ko)':>10}")
+    for fmt in formats:
+        result = run(fmt, path)
+        print(f"{fmt:<8} {result['load_ms']:>16.1f} {result['private_kb']:>20} {result['rss_kb']:>10}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Mesure le temps de détection des compétences selon la taille de la taxonomie.
+
+La taxonomie par défaut est complétée par des compétences synthétiques; le
+temps par texte doit rester stable quand la taxonomie grossit.
+
+    python benchmarks/skill_matching.py [nombre de textes]
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from resumes.skills import DEFAULT_TAXONOMY, SkillMatcher  # noqa: E402
+
+TEXT = (
+    "Développeur Python et JavaScript, 5 ans d'expérience avec Django, React "
+    "et PostgreSQL. Déploiement sur k8s et AWS, CI avec Jenkins et Git. "
+    "Machine learning avec PyTorch, Pandas et NumPy; méthodes Agile/Scrum. "
+) * 20
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    for size in (0, 1000, 10000):
+        taxonomy = dict(DEFAULT_TAXONOMY)
+        taxonomy.update({f'Skill {i}': [f'skill-{i}-alias'] for i in range(size)})
+
+        started = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        for _ in range(count):
+            found = matcher.find(TEXT)
+        per_text_ms = (time.perf_counter() - started) * 1000 / count
+
+        print(
+            f"{len(taxonomy):>6} compétences: compilation {compile_ms:7.1f} ms, "
+            f"{per_text_ms:.3f} ms/texte ({len(found)} trouvées)"
+        )
+
+
+if __name__ == '__main__':
+    main()
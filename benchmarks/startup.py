@@ -0,0 +1,74 @@
+"""
+Temps de démarrage et d'import, mesurés avec `python -X importtime`.
+
+Chaque scénario tourne dans un processus neuf: durée totale (horloge),
+temps d'import cumulé des modules de premier niveau et modules les plus
+coûteux (temps cumulé, sous-modules inclus). Les dépendances lourdes
+(PyPDF2, python-docx, numpy/scipy, scikit-learn) ne doivent plus apparaître
+dans `manage.py check` ni à l'import des vues.
+
+    python benchmarks/startup.py [nombre de modules affichés]
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SETUP = (
+    "import os, django; "
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cvclassifier.settings'); "
+    "django.setup(); "
+)
+
+SCENARIOS = {
+    'manage.py check': ['manage.py', 'check'],
+    'import des vues': ['-c', SETUP + "import resumes.urls"],
+    'préchauffage': ['-c', SETUP + "import resumes.urls; from resumes.warmup import warm_up; warm_up()"],
+}
+
+HEAVY = ('PyPDF2', 'docx', 'numpy', 'scipy', 'sklearn')
+
+
+def parse_importtime(stderr):
+    """[(module, temps cumulé en µs, profondeur)] à partir de la sortie de -X importtime."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(cumulative), depth))
+    return rows
+
+
+def run(args):
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + args,
+        cwd=ROOT, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode:
+        raise RuntimeError(result.stderr[-2000:])
+    return elapsed, parse_importtime(result.stderr)
+
+
+def main():
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    for label, args in SCENARIOS.items():
+        elapsed, rows = run(args)
+        total = sum(cumulative for _, cumulative, depth in rows if depth == 0)
+        names = {name.split('.')[0] for name, _, _ in rows}
+        heavy = [name for name in HEAVY if name in names]
+
+        print(f"\n{label}: {elapsed:.2f}s au total, {total / 1000:.0f} ms d'imports")
+        print(f"  dépendances lourdes importées: {', '.join(heavy) or 'aucune'}")
+        for name, cumulative, _ in sorted(rows, key=lambda row: -row[1])[:limit]:
+            print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+
+if __name__ == '__main__':
+    main()
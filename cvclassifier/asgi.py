@@ -14,3 +14,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cvclassifier.settings')
 
 application = get_asgi_application()
+
+# Préchauffage optionnel (RESUMES_WARMUP): modèle et dépendances lourdes
+# chargés avant la première requête plutôt qu'à la demande.
+from resumes.warmup import warm_up_if_enabled  # noqa: E402
+
+warm_up_if_enabled()
@@ -178,3 +178,84 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=30),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=7),
 }
+
+
+# Modèle de classification
+# Intervalle (secondes) entre deux vérifications du manifeste ml_models/manifest.json.
+# Un nouveau modèle est chargé en arrière-plan puis échangé sans redémarrage. 0 = désactivé.
+MODEL_RELOAD_CHECK_INTERVAL = 30
+
+# Upload asynchrone: POST /api/resumes/ renvoie 202 et un job traité par
+# `python manage.py process_resume_jobs`. Activable aussi par requête avec ?async=true.
+RESUME_ASYNC_UPLOAD = False
+
+# Extraction de texte dans un pool de processus isolés: un document qui dépasse
+# le délai (secondes) ou la mémoire (Mo) est interrompu et renvoyé en erreur de validation.
+RESUME_EXTRACTION = {
+    'WORKERS': 2,
+    'TIMEOUT': 30,
+    'MAX_MEMORY_MB': 512,
+    # Limites de lecture: pages PDF lues et caractères conservés (None = illimité).
+    # Au-delà, le texte est tronqué et Resume.text_truncated passe à True.
+    'MAX_PAGES': 20,
+    'MAX_CHARS': 60000,
+}
+
+# Import d'archives ZIP (POST /api/resumes/bulk-upload/). Protection contre les
+# archives piégées: nombre de fichiers et taille décompressée totale bornés;
+# chaque fichier reste soumis aux règles d'un upload simple (PDF/DOCX, 5 Mo).
+RESUME_BULK_UPLOAD = {
+    'MAX_ARCHIVE_MB': 100,
+    'MAX_MEMBERS': 500,
+    'MAX_TOTAL_SIZE_MB': 500,
+}
+
+# Déduplication des CV par SHA-256, calculé pendant la réception de l'upload.
+FILE_UPLOAD_HANDLERS = [
+    'resumes.upload_handlers.SHA256UploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+# Partager sur disque le fichier d'un CV identique déjà stocké au lieu d'en écrire une copie.
+RESUME_DEDUPLICATE_FILES = False
+
+# Cache des prédictions, indexé par (hash du texte normalisé, version du modèle).
+# BACKEND: 'local' (LRU en mémoire de chaque processus, MAX_SIZE entrées),
+# 'django' (cache CACHE_ALIAS de CACHES, partageable entre workers) ou None.
+# Compteurs hits/misses visibles sur GET /api/model/.
+PREDICTION_CACHE = {
+    'BACKEND': 'local',
+    'MAX_SIZE': 2048,
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 24 * 3600,
+}
+
+# Moteur d'inférence des bundles: 'numpy' (resumes/inference.py, n'importe pas
+# scikit-learn dans les workers web) ou 'sklearn' (objets scikit-learn reconstruits).
+INFERENCE_ENGINE = 'numpy'
+
+# Le modèle et les dépendances lourdes (PyPDF2, python-docx, numpy/scipy) sont
+# chargés au premier usage. True: les workers WSGI/ASGI les chargent au démarrage
+# (resumes/warmup.py) pour que la première requête n'en paie pas le coût. Le pool
+# d'extraction n'est pas démarré ici (compatible avec gunicorn --preload).
+RESUMES_WARMUP = False
+
+# Regroupement des classifications concurrentes: les appels arrivés pendant
+# MAX_WAIT_MS (jusqu'à MAX_BATCH_SIZE) partagent un seul passage du modèle;
+# un appel seul (file vide) n'attend pas.
+# Désactivé par défaut: avec le moteur 'numpy', le coût d'un CV est surtout la
+# tokenisation, et le passage par le thread de regroupement coûte plus qu'il
+# ne fait gagner. À activer avec INFERENCE_ENGINE = 'sklearn' sous forte
+# concurrence (voir benchmarks/inference_batching.py).
+# Taille de file et des lots visibles sur GET /api/model/.
+INFERENCE_BATCHING = {
+    'ENABLED': False,
+    'MAX_BATCH_SIZE': 32,
+    'MAX_WAIT_MS': 2,
+}
+
+# Statistiques des classifications lues depuis une table d'agrégats par jour et
+# par catégorie (tenue à jour à chaque création/modification/suppression de
+# classification). Désactivée, aucun signal n'est connecté sur Classification.
+# Après activation: `python manage.py rebuild_classification_stats`.
+CLASSIFICATION_STATS_ROLLUP = False
@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Category, Resume, Classification, JobPosting
+from django.db.models import Count
+from django.db.models.expressions import RawSQL
+from .models import Category, Resume, Classification, JobPosting, IngestionJob, Skill
+from .search import matching_ids_sql
 
 
 @admin.register(Category)
@@ -19,10 +22,21 @@ class CategoryAdmin(admin.ModelAdmin):
 class ResumeAdmin(admin.ModelAdmin):
     list_display = ('id', 'user', 'uploaded_at', 'has_text_content', 'classifications_count')
     list_filter = ('uploaded_at', 'user')
-    search_fields = ('user__username', 'text_content')
-    readonly_fields = ('uploaded_at', 'text_content')
+    search_fields = ('user__username',)
+    readonly_fields = ('uploaded_at', 'sha256', 'text_content', 'text_truncated')
     ordering = ('-uploaded_at',)
 
+    def get_search_results(self, request, queryset, search_term):
+        # Le texte est cherché dans l'index plein texte (FTS5 / GIN) au lieu
+        # d'un LIKE '%...%' sur toute la colonne.
+        results, use_distinct = super().get_search_results(request, queryset, search_term)
+        subquery = matching_ids_sql(search_term)
+        if subquery is not None:
+            return results | queryset.filter(id__in=RawSQL(*subquery)), use_distinct
+        if search_term:
+            return results | queryset.filter(text_content__icontains=search_term), use_distinct
+        return results, use_distinct
+
     def has_text_content(self, obj):
         return bool(obj.text_content)
     has_text_content.boolean = True
@@ -33,12 +47,27 @@ class ResumeAdmin(admin.ModelAdmin):
     classifications_count.short_description = 'Classifications'
 
 
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ('name', 'resumes_count')
+    search_fields = ('name',)
+    ordering = ('name',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(resumes_total=Count('resume_skills'))
+
+    def resumes_count(self, obj):
+        return obj.resumes_total
+    resumes_count.short_description = 'CV'
+    resumes_count.admin_order_field = 'resumes_total'
+
+
 @admin.register(Classification)
 class ClassificationAdmin(admin.ModelAdmin):
-    list_display = ('id', 'resume', 'category', 'confidence_score', 'classified_at')
-    list_filter = ('category', 'classified_at')
+    list_display = ('id', 'resume', 'category', 'confidence_score', 'model_version', 'classified_at')
+    list_filter = ('category', 'model_version', 'classified_at')
     search_fields = ('resume__user__username', 'category__name')
-    readonly_fields = ('classified_at',)
+    readonly_fields = ('classified_at', 'model_version')
     ordering = ('-classified_at',)
 
     def get_queryset(self, request):
@@ -53,3 +82,11 @@ class JobPostingAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at',)
     ordering = ('-created_at',)
     list_editable = ('is_active',)
+
+
+@admin.register(IngestionJob)
+class IngestionJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'resume', 'status', 'stage', 'progress', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('status', 'created_at')
+    readonly_fields = ('created_at', 'started_at', 'finished_at', 'result', 'error')
+    ordering = ('-created_at',)
@@ -0,0 +1,196 @@
+"""
+Variantes asynchrones (ASGI) de l'upload, de la classification et des compétences.
+
+Servies par `cvclassifier.asgi` (uvicorn, daphne...), ces vues ne bloquent
+aucun thread pendant la réception du fichier ni pendant l'attente de
+l'extraction ou de l'inférence:
+- l'extraction tourne dans le pool de processus (extract_document_async);
+- le travail CPU (chargement du modèle, inférence, compétences, vecteur
+  TF-IDF, MinHash) dans l'exécuteur de la boucle d'événements;
+- la base est lue avec l'ORM asynchrone de Django (aget, afirst...); seules
+  les écritures transactionnelles du pipeline passent par sync_to_async, dont
+  le thread unique est partagé par tous les appels à l'ORM.
+
+La logique commune avec ResumeViewSet (réponses, erreurs, indexation) est
+dans resumes.pipeline.
+
+Les réponses ont le même format que les endpoints synchrones de ResumeViewSet.
+L'authentification utilise les classes DEFAULT_AUTHENTICATION_CLASSES de DRF.
+"""
+import asyncio
+import functools
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .models import Resume
+from .serializers import ResumeSerializer, check_resume_file
+from .utils import file_sha256, extract_skills
+from .extraction_pool import extract_document_async
+from .ml_classifier import cv_classifier
+from .pipeline import (
+    save_classification, find_duplicate, reuse_duplicate, compute_resume_indexes, save_resume_indexes,
+    discard_failed_upload, parse_top_k, classification_data, skills_data
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _authenticate(request):
+    drf_request = Request(
+        request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    )
+    user = drf_request.user
+    if not user or not user.is_authenticated:
+        raise NotAuthenticated()
+    return user
+
+
+def async_api_view(methods):
+    """
+    Décorateur des vues asynchrones: méthode HTTP, authentification DRF et
+    erreurs au format DRF. Sous Django 4.2, csrf_exempt et require_http_methods
+    ne préservent pas les coroutines: les équivalents sont faits ici (la
+    vérification CSRF des sessions est faite par SessionAuthentication).
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return JsonResponse(
+                    {'detail': f'Méthode "{request.method}" non autorisée.'},
+                    status=status.HTTP_405_METHOD_NOT_ALLOWED
+                )
+            try:
+                request.api_user = await sync_to_async(_authenticate)(request)
+                return await view(request, *args, **kwargs)
+            except APIException as e:
+                return JsonResponse({'detail': e.detail}, status=e.status_code)
+
+        wrapper.csrf_exempt = True
+        return wrapper
+    return decorator
+
+
+async def _get_resume(request, pk):
+    resumes = Resume.objects.select_related('user')
+    if not request.api_user.is_staff:
+        resumes = resumes.filter(user=request.api_user)
+    return await resumes.filter(pk=pk).afirst()
+
+
+def _not_found():
+    return JsonResponse({'detail': 'Pas trouvé.'}, status=status.HTTP_404_NOT_FOUND)
+
+
+async def run_in_executor(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+async def model_loaded():
+    # Le premier accès charge le modèle: hors de la boucle d'événements et du
+    # thread de l'ORM. Les accès suivants sont immédiats.
+    return await run_in_executor(lambda: cv_classifier.is_loaded)
+
+
+async def index_resume(resume):
+    """Équivalent asynchrone de pipeline.index_resume: calcul dans l'exécuteur, écritures via l'ORM."""
+    rows = [(resume.id, resume.text_content)]
+    indexes = await run_in_executor(compute_resume_indexes, rows)
+    return (await sync_to_async(save_resume_indexes)(rows, indexes))[resume.id]
+
+
+@async_api_view(['POST'])
+async def upload_resume(request):
+    files = await sync_to_async(lambda: request.FILES)()
+    uploaded_file = files.get('file')
+    if uploaded_file is None:
+        return JsonResponse({'file': ['Aucun fichier n’a été soumis.']}, status=status.HTTP_400_BAD_REQUEST)
+
+    error = check_resume_file(uploaded_file.name, uploaded_file.size)
+    if error:
+        return JsonResponse({'file': [error]}, status=status.HTTP_400_BAD_REQUEST)
+
+    sha256 = getattr(request, 'upload_sha256', {}).get('file') or await run_in_executor(file_sha256, uploaded_file)
+    original = await sync_to_async(find_duplicate)(sha256)
+
+    extra = {'file': uploaded_file}
+    if original is not None and getattr(settings, 'RESUME_DEDUPLICATE_FILES', False):
+        extra['file'] = original.file.name
+    resume = await Resume.objects.acreate(user=request.api_user, sha256=sha256, **extra)
+
+    if original is not None:
+        await model_loaded()
+        await sync_to_async(reuse_duplicate)(resume, original)
+    else:
+        try:
+            logger.info(f"Extraction du texte pour le CV {resume.id}")
+            resume.text_content, resume.text_truncated = await extract_document_async(resume.file.path)
+            await resume.asave(update_fields=['text_content', 'text_truncated'])
+        except Exception as e:
+            return JsonResponse(
+                {'error': await sync_to_async(discard_failed_upload)(resume, e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    await index_resume(resume)
+    data = await sync_to_async(lambda: ResumeSerializer(resume, context={'request': request}).data)()
+    return JsonResponse(data, status=status.HTTP_201_CREATED)
+
+
+@async_api_view(['POST'])
+async def classify_resume(request, pk):
+    resume = await _get_resume(request, pk)
+    if resume is None:
+        return _not_found()
+
+    try:
+        top_k = parse_top_k(request.GET.get('top_k', 0))
+    except ValueError:
+        return JsonResponse(
+            {'error': 'Paramètre "top_k" invalide (entier positif attendu)'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if not resume.text_content:
+        return JsonResponse({'error': 'Pas de texte dans le CV'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not await model_loaded():
+        return JsonResponse({'error': 'Modèle non chargé'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    try:
+        logger.info(f"Classification du CV {resume.id}")
+        prediction = await run_in_executor(cv_classifier.rank, resume.text_content, top_k=top_k)
+        classification = await sync_to_async(save_classification)(resume, prediction)
+        data = await sync_to_async(classification_data)(classification, prediction, top_k)
+        return JsonResponse(data, status=status.HTTP_201_CREATED)
+
+    except Exception as e:
+        logger.error(f"Erreur lors de la classification: {str(e)}")
+        return JsonResponse(
+            {'error': f'Erreur lors de la classification: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@async_api_view(['GET'])
+async def resume_skills(request, pk):
+    resume = await _get_resume(request, pk)
+    if resume is None:
+        return _not_found()
+
+    if not resume.text_content:
+        return JsonResponse({'error': 'Pas de texte dans le CV'}, status=status.HTTP_400_BAD_REQUEST)
+
+    skills = [name async for name in resume.skills.values_list('name', flat=True)]
+    if not skills:
+        skills = await run_in_executor(extract_skills, resume.text_content)
+
+    return JsonResponse(skills_data(resume, skills))
@@ -0,0 +1,200 @@
+"""
+Import de CV depuis une archive ZIP.
+
+L'archive n'est jamais décompressée en entier: seul son répertoire central
+est lu, puis chaque fichier est copié par blocs vers le stockage. Les limites
+(nombre de fichiers, taille décompressée totale) sont vérifiées sur le
+répertoire central avant toute copie; zipfile ne renvoie jamais plus que la
+taille déclarée d'un fichier (et lève BadZipFile si elle est fausse), et la
+copie s'arrête de toute façon au-delà de la taille maximale d'un CV.
+
+Les textes sont extraits en parallèle par le pool d'extraction, les CV
+insérés en une requête (bulk_create) puis indexés par lots.
+"""
+import hashlib
+import logging
+import posixpath
+import tempfile
+import zipfile
+import zlib
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+
+from .models import Resume
+from .serializers import check_resume_file, MAX_RESUME_SIZE
+from .extraction_pool import extract_documents
+from .pipeline import find_duplicate, reuse_duplicate, index_resumes
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+DEFAULTS = {
+    'MAX_ARCHIVE_MB': 100,
+    'MAX_MEMBERS': 500,
+    'MAX_TOTAL_SIZE_MB': 500,
+}
+
+
+class ArchiveError(ValueError):
+    pass
+
+
+def get_limits():
+    return {**DEFAULTS, **getattr(settings, 'RESUME_BULK_UPLOAD', {})}
+
+
+def _ignored(name):
+    # Dossiers, fichiers cachés et métadonnées ajoutées par macOS
+    base = posixpath.basename(name)
+    return not base or base.startswith('.') or name.startswith('__MACOSX/')
+
+
+def list_members(archive, limits):
+    """Fichiers à importer de l'archive; lève ArchiveError si elle dépasse les limites."""
+    members = [info for info in archive.infolist() if not info.is_dir() and not _ignored(info.filename)]
+
+    if len(members) > limits['MAX_MEMBERS']:
+        raise ArchiveError(
+            f"Trop de fichiers dans l'archive ({len(members)}, max {limits['MAX_MEMBERS']})"
+        )
+
+    total = sum(info.file_size for info in members)
+    if total > limits['MAX_TOTAL_SIZE_MB'] * 1024 * 1024:
+        raise ArchiveError(
+            f"Taille décompressée de l'archive trop importante (max {limits['MAX_TOTAL_SIZE_MB']} Mo)"
+        )
+
+    return members
+
+
+def copy_member(archive, info, destination):
+    """Copie un fichier de l'archive par blocs; renvoie son SHA-256."""
+    digest = hashlib.sha256()
+    size = 0
+    with archive.open(info) as source:
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > MAX_RESUME_SIZE:
+                raise ArchiveError("Fichier trop gros (max 5MB)")
+            digest.update(chunk)
+            destination.write(chunk)
+    return digest.hexdigest()
+
+
+def _store_member(archive, info, name, user):
+    """Copie un fichier vers le stockage des CV; renvoie (Resume non enregistré, CV identique ou None)."""
+    field = Resume._meta.get_field('file')
+
+    with tempfile.TemporaryFile() as tmp:
+        sha256 = copy_member(archive, info, tmp)
+        original = find_duplicate(sha256)
+
+        if original is not None and getattr(settings, 'RESUME_DEDUPLICATE_FILES', False):
+            file_name = original.file.name
+        else:
+            tmp.seek(0)
+            file_name = field.storage.save(field.generate_filename(None, name), File(tmp, name=name))
+
+    resume = Resume(user=user, file=file_name, sha256=sha256)
+    if original is not None:
+        resume.text_content = original.text_content
+        resume.text_truncated = original.text_truncated
+    return resume, original
+
+
+def import_archive(uploaded_file, user):
+    """
+    Importe les CV d'une archive ZIP pour `user`.
+
+    Renvoie un rapport par fichier: {'file', 'status' ('created' ou 'error'),
+    'resume_id', 'text_truncated', 'duplicate_of'} ou {'file', 'status', 'error'}.
+    Lève ArchiveError si l'archive est illisible ou dépasse les limites.
+    """
+    try:
+        archive = zipfile.ZipFile(uploaded_file)
+    except (zipfile.BadZipFile, OSError):
+        raise ArchiveError("Archive ZIP invalide")
+
+    report = []
+    stored = []
+    try:
+        accepted = _import_members(archive, user, report, stored)
+    except Exception:
+        # Aucune ligne n'est restée en base (transaction annulée): les fichiers
+        # copiés par cet import ne doivent pas rester orphelins dans le stockage.
+        _delete_stored_files(stored)
+        raise
+
+    logger.info(f"Import d'archive: {len(accepted)} CV créés sur {len(report)} fichiers")
+    return report
+
+
+def _delete_stored_files(stored):
+    for _, resume, original in stored:
+        # Un fichier partagé avec un CV identique (RESUME_DEDUPLICATE_FILES) n'appartient pas à l'import
+        if original is not None and resume.file.name == original.file.name:
+            continue
+        try:
+            resume.file.delete(save=False)
+        except Exception as e:
+            logger.error(f"Suppression de {resume.file.name} impossible: {str(e)}")
+
+
+def _import_members(archive, user, report, stored):
+    with archive:
+        for info in list_members(archive, get_limits()):
+            entry = {'file': info.filename, 'status': 'error'}
+            report.append(entry)
+
+            name = posixpath.basename(info.filename)
+            error = check_resume_file(name, info.file_size)
+            if error is None and info.flag_bits & 0x1:
+                error = "Fichier chiffré"
+            if error:
+                entry['error'] = error
+                continue
+
+            try:
+                resume, original = _store_member(archive, info, name, user)
+            except (ArchiveError, zipfile.BadZipFile, zlib.error, NotImplementedError) as e:
+                entry['error'] = str(e)
+                continue
+            stored.append((entry, resume, original))
+
+    # Extraction en parallèle des fichiers nouveaux (les doublons reprennent le texte existant)
+    to_extract = [(entry, resume) for entry, resume, original in stored if original is None]
+    extracted = extract_documents([resume.file.path for _, resume in to_extract])
+    failed = set()
+    for (entry, resume), (_, result, error) in zip(to_extract, extracted):
+        if error is not None:
+            logger.error(f"Import de {entry['file']}: {str(error)}")
+            entry['error'] = f"Impossible d'extraire le texte du fichier PDF/DOCX: {str(error)}"
+            failed.add(id(resume))
+            resume.file.delete(save=False)
+        else:
+            resume.text_content, resume.text_truncated = result
+
+    accepted = [(entry, resume, original) for entry, resume, original in stored if id(resume) not in failed]
+    # Insertion, reprise des doublons et indexation ensemble: un échec annule
+    # toutes les lignes et import_archive supprime les fichiers copiés.
+    with transaction.atomic():
+        Resume.objects.bulk_create([resume for _, resume, _ in accepted])
+        for _, resume, original in accepted:
+            if original is not None:
+                reuse_duplicate(resume, original)
+        index_resumes([resume for _, resume, _ in accepted])
+
+    for entry, resume, original in accepted:
+        entry.update({
+            'status': 'created',
+            'resume_id': resume.id,
+            'text_truncated': resume.text_truncated,
+            'duplicate_of': original.id if original is not None else None,
+        })
+    return accepted
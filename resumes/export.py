@@ -0,0 +1,102 @@
+"""
+Export en flux des classifications et des CV (NDJSON ou CSV).
+
+Les lignes sont lues par paquets de EXPORT_CHUNK_SIZE avec values() et
+.iterator(): ni instances de modèles ni résultat complet en mémoire, la
+réponse est produite au fil de la lecture quelle que soit la taille de la table.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework import renderers
+
+EXPORT_CHUNK_SIZE = 2000
+
+CLASSIFICATION_FIELDS = {
+    'id': 'id',
+    'resume_id': 'resume_id',
+    'user': 'resume__user__username',
+    'category': 'category__name',
+    'confidence': 'confidence_score',
+    'model_version': 'model_version',
+    'classified_at': 'classified_at',
+}
+
+# Les champs latest_* sont annotés par la vue (classification la plus récente).
+RESUME_FIELDS = {
+    'id': 'id',
+    'user': 'user__username',
+    'file': 'file',
+    'sha256': 'sha256',
+    'text_truncated': 'text_truncated',
+    'uploaded_at': 'uploaded_at',
+    'category': 'latest_category',
+    'confidence': 'latest_confidence',
+    'model_version': 'latest_model_version',
+}
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    """Un objet JSON par ligne (utilisé aussi pour les réponses d'erreur de l'export)."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return (json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+class CSVRenderer(renderers.BaseRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        fields = list(rows[0]) if rows else []
+        return ''.join(iter_csv(rows, fields)).encode('utf-8')
+
+
+class _Echo:
+    """Pseudo-fichier pour csv.writer: renvoie la ligne au lieu de l'écrire."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, fields=CLASSIFICATION_FIELDS):
+    """Itère sur les lignes (dict nom -> valeur) du queryset, par paquets, dans l'ordre des id."""
+    columns = list(fields.values())
+    rows = queryset.order_by('id').values_list(*columns).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    names = list(fields)
+    for row in rows:
+        yield dict(zip(names, row))
+
+
+def iter_ndjson(rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(row) + '\n'
+
+
+def iter_csv(rows, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in (row.get(field) for field in fields)
+        ])
+
+
+def streaming_export(rows, fields, export_format, filename):
+    """Réponse écrite au fil de `rows`, en CSV ou en NDJSON; `filename` sans extension."""
+    if export_format == 'csv':
+        response = StreamingHttpResponse(iter_csv(rows, list(fields)), content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    else:
+        response = StreamingHttpResponse(iter_ndjson(rows), content_type='application/x-ndjson; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="{filename}.ndjson"'
+    return response
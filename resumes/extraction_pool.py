@@ -0,0 +1,247 @@
+"""
+Extraction de texte isolée dans un pool borné de processus.
+
+Chaque worker est un processus long (démarré en "spawn") qui traite les
+documents un par un. Le processus parent surveille chaque document: au-delà
+du délai ou de la mémoire autorisée, le worker est tué puis remplacé, et
+l'appelant reçoit une ExtractionError (sous-classe de ValueError).
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from . import utils
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.02
+STARTUP_TIMEOUT = 60
+
+DEFAULTS = {
+    'WORKERS': 2,
+    'TIMEOUT': 30,
+    'MAX_MEMORY_MB': 512,
+    'MAX_PAGES': 20,
+    'MAX_CHARS': 60000,
+}
+
+
+class ExtractionError(ValueError):
+    pass
+
+
+class ExtractionTimeout(ExtractionError):
+    pass
+
+
+class ExtractionMemoryError(ExtractionError):
+    pass
+
+
+def _process_memory(pid, field):
+    # /proc/<pid>/statm: taille virtuelle puis RSS, en pages.
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[field]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _limit_address_space(max_memory_bytes):
+    try:
+        import resource
+    except ImportError:
+        return
+    current = _process_memory(os.getpid(), 0)
+    if current is None:
+        return
+    limit = current + max_memory_bytes
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _worker_main(conn, extractor, extractor_kwargs, max_memory_bytes):
+    if max_memory_bytes:
+        _limit_address_space(max_memory_bytes)
+    conn.send(('ready', None))
+
+    while True:
+        try:
+            argument = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+
+        try:
+            conn.send(('ok', extractor(argument, **extractor_kwargs)))
+        except MemoryError:
+            conn.send(('memory', None))
+        except Exception as e:
+            conn.send(('error', str(e)))
+
+
+class _Worker:
+
+    def __init__(self, context, extractor, extractor_kwargs, max_memory_bytes):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, extractor, extractor_kwargs, max_memory_bytes),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+        if not self.conn.poll(STARTUP_TIMEOUT):
+            self.kill()
+            raise ExtractionError("Le worker d'extraction n'a pas démarré")
+        self.conn.recv()
+
+    @property
+    def alive(self):
+        return self.process.is_alive()
+
+    def rss(self):
+        return _process_memory(self.process.pid, 1)
+
+    def kill(self):
+        self.process.kill()
+        self.process.join(1)
+        self.conn.close()
+
+
+class ExtractionPool:
+
+    def __init__(self, workers=2, timeout=30, max_memory_mb=512,
+                 extractor=utils.extract_document, extractor_kwargs=None):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.max_memory_bytes = max_memory_mb * 1024 * 1024 if max_memory_mb else 0
+        self.extractor = extractor
+        self.extractor_kwargs = extractor_kwargs or {}
+
+        self._context = multiprocessing.get_context('spawn')
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='extraction')
+        self._slots = queue.Queue()
+        for _ in range(self.workers):
+            self._slots.put(None)
+
+    def _run(self, argument):
+        worker = self._slots.get()
+        try:
+            if worker is None or not worker.alive:
+                worker = _Worker(
+                    self._context, self.extractor, self.extractor_kwargs, self.max_memory_bytes
+                )
+
+            worker.conn.send(argument)
+            deadline = time.monotonic() + self.timeout if self.timeout else None
+
+            while not worker.conn.poll(POLL_INTERVAL):
+                if not worker.alive:
+                    worker = None
+                    raise ExtractionError("Le worker d'extraction s'est arrêté brutalement")
+                if deadline and time.monotonic() > deadline:
+                    worker.kill()
+                    worker = None
+                    raise ExtractionTimeout(f"Délai d'extraction dépassé ({self.timeout} s)")
+                rss = worker.rss()
+                if self.max_memory_bytes and rss and rss > self.max_memory_bytes:
+                    worker.kill()
+                    worker = None
+                    raise ExtractionMemoryError(
+                        f"Mémoire d'extraction dépassée ({self.max_memory_bytes // (1024 * 1024)} Mo)"
+                    )
+
+            outcome, value = worker.conn.recv()
+            if outcome == 'memory':
+                worker.kill()
+                worker = None
+                raise ExtractionMemoryError(
+                    f"Mémoire d'extraction dépassée ({self.max_memory_bytes // (1024 * 1024)} Mo)"
+                )
+            if outcome == 'error':
+                raise ExtractionError(value)
+            return value
+
+        except (EOFError, OSError) as e:
+            # Tube rompu (BrokenPipeError, EOFError...): le worker est mort entre
+            # deux vérifications; il est remplacé comme après un dépassement.
+            if worker is not None:
+                worker.kill()
+                worker = None
+            raise ExtractionError(f"Le worker d'extraction s'est arrêté brutalement: {str(e)}")
+
+        finally:
+            self._slots.put(worker)
+
+    def submit(self, file_path):
+        return self._executor.submit(self._run, file_path)
+
+    def extract(self, file_path):
+        return self.submit(file_path).result()
+
+    def map(self, file_paths):
+        futures = [(path, self.submit(path)) for path in file_paths]
+        for path, future in futures:
+            try:
+                yield path, future.result(), None
+            except ExtractionError as e:
+                yield path, None, e
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+        while not self._slots.empty():
+            worker = self._slots.get_nowait()
+            if worker is not None and worker.alive:
+                worker.kill()
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool():
+    """
+    Pool du processus courant, créé au premier appel. Dans un processus issu
+    d'un fork (workers gunicorn --preload...), le pool hérité du parent est
+    abandonné: ses threads n'existent pas dans l'enfant et ses workers
+    appartiennent au parent. Un nouveau pool est créé, comme le thread de
+    InferenceBatcher.
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            config = {**DEFAULTS, **getattr(settings, 'RESUME_EXTRACTION', {})}
+            _pool = ExtractionPool(
+                workers=config['WORKERS'],
+                timeout=config['TIMEOUT'],
+                max_memory_mb=config['MAX_MEMORY_MB'],
+                extractor_kwargs={
+                    'max_pages': config['MAX_PAGES'],
+                    'max_chars': config['MAX_CHARS'],
+                }
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def extract_document(file_path):
+    """Équivalent de utils.extract_document, exécuté dans le pool isolé avec les limites des settings."""
+    return get_extraction_pool().extract(file_path)
+
+
+async def extract_document_async(file_path):
+    """Version asynchrone de extract_document: attend le pool sans bloquer la boucle d'événements."""
+    return await asyncio.wrap_future(get_extraction_pool().submit(file_path))
+
+
+def extract_documents(file_paths):
+    """Extrait plusieurs documents en parallèle dans le pool; itère sur (chemin, résultat, erreur)."""
+    return get_extraction_pool().map(file_paths)
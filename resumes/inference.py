@@ -0,0 +1,228 @@
+"""
+Moteur d'inférence NumPy, sans scikit-learn.
+
+Reproduit TfidfVectorizer (analyseur "word") et MultinomialNB à partir des
+tableaux du bundle (vocabulaire, IDF, log-priors, log-probabilités des
+termes): tokenisation par expression régulière, comptage sur le vocabulaire
+figé, pondération TF-IDF et normalisation faits pour tout le lot en quelques
+opérations NumPy, puis log-vraisemblance calculée directement depuis les
+(indices, valeurs) de chaque ligne. Les classes exposent la même interface
+que les objets scikit-learn utilisés par CVClassifier et le rapprochement
+(transform, idf_, predict_proba, classes_...). Seul NumPy est importé:
+SparseRows.tocsr() charge scipy à la demande pour le rapprochement.
+
+Les poids peuvent être stockés en float64, float32 ou float16
+(`save_bundle(..., precision=...)`); les calculs sont faits en float64 pour
+un bundle float64 (résultats identiques à scikit-learn) et en float32 sinon.
+Quelle que soit la précision, les tableaux restent en mmap (pages partagées
+entre workers): seules les colonnes lues pour un lot sont converties.
+"""
+import re
+import unicodedata
+
+import numpy as np
+
+
+def strip_accents_unicode(text):
+    try:
+        text.encode('ASCII', errors='strict')
+        return text
+    except UnicodeEncodeError:
+        normalized = unicodedata.normalize('NFKD', text)
+        return ''.join(c for c in normalized if not unicodedata.combining(c))
+
+
+def strip_accents_ascii(text):
+    return unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('ASCII')
+
+
+ACCENT_FUNCTIONS = {
+    None: None,
+    'unicode': strip_accents_unicode,
+    'ascii': strip_accents_ascii,
+}
+
+
+def compute_dtype(array):
+    return np.float64 if array.dtype == np.float64 else np.float32
+
+
+class SparseRows:
+    """
+    Lignes creuses au format CSR (indptr, indices triés, data), en NumPy seul.
+
+    Résultat de TextVectorizer.transform; tocsr() en fait une
+    scipy.sparse.csr_matrix pour les appelants qui en ont besoin.
+    """
+
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = shape
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def tocsr(self):
+        from scipy import sparse
+
+        return sparse.csr_matrix((self.data, self.indices, self.indptr), shape=self.shape)
+
+
+class TextVectorizer:
+    """Équivalent de TfidfVectorizer(vocabulary=..., analyzer='word') déjà entraîné."""
+
+    def __init__(self, vocabulary, idf, lowercase=True, strip_accents=None, stop_words=None,
+                 token_pattern=r"(?u)\b\w\w+\b", ngram_range=(1, 1), binary=False,
+                 norm='l2', use_idf=True, smooth_idf=True, sublinear_tf=False, analyzer='word'):
+        if analyzer != 'word':
+            raise ValueError(f"Analyseur non supporté: {analyzer}")
+        if strip_accents not in ACCENT_FUNCTIONS:
+            raise ValueError(f"strip_accents non supporté: {strip_accents}")
+
+        self.vocabulary_ = {term: index for index, term in enumerate(vocabulary)}
+        self.dtype = compute_dtype(idf)
+        self.idf_ = idf if use_idf else None
+        self.lowercase = lowercase
+        self.strip_accents = strip_accents
+        # Les mots vides n'ont d'effet que sur les n-grammes: en unigrammes,
+        # ils sont déjà absents du vocabulaire appris.
+        self.stop_words = _resolve_stop_words(stop_words) if ngram_range[1] > 1 else frozenset()
+        self.token_pattern = re.compile(token_pattern)
+        self.ngram_range = tuple(ngram_range)
+        self.binary = binary
+        self.norm = norm
+        self.use_idf = use_idf
+        self.sublinear_tf = sublinear_tf
+        self._accents = ACCENT_FUNCTIONS[strip_accents]
+
+    def analyze(self, text):
+        """Termes (mots et n-grammes) du texte, dans l'ordre de scikit-learn."""
+        if self.lowercase:
+            text = text.lower()
+        if self._accents is not None:
+            text = self._accents(text)
+
+        tokens = self.token_pattern.findall(text)
+        if self.stop_words:
+            tokens = [token for token in tokens if token not in self.stop_words]
+
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+
+        original = tokens
+        if min_n == 1:
+            tokens = list(original)
+            min_n += 1
+        else:
+            tokens = []
+        for n in range(min_n, min(max_n + 1, len(original) + 1)):
+            tokens.extend(' '.join(original[i:i + n]) for i in range(len(original) - n + 1))
+        return tokens
+
+    def transform(self, texts):
+        """Lignes TF-IDF (SparseRows, une par texte) comme TfidfVectorizer.transform."""
+        vocabulary = self.vocabulary_
+        columns, lengths = [], []
+        for text in texts:
+            found = [index for index in map(vocabulary.get, self.analyze(text)) if index is not None]
+            columns.extend(found)
+            lengths.append(len(found))
+
+        # Comptage de tout le lot en une passe sur les clés (ligne, colonne):
+        # np.unique les trie, d'où des indices triés par ligne comme scikit-learn.
+        n_rows, n_features = len(lengths), len(vocabulary)
+        keys = np.repeat(np.arange(n_rows, dtype=np.int64), lengths) * n_features
+        keys += np.array(columns, dtype=np.int64)
+        keys, counts = np.unique(keys, return_counts=True)
+        rows = keys // n_features
+        indices = (keys % n_features).astype(np.int32)
+        values = counts.astype(self.dtype)
+
+        if self.binary:
+            values[:] = 1
+        if self.sublinear_tf:
+            np.log(values, out=values)
+            values += 1
+        if self.idf_ is not None:
+            values *= self.idf_[indices]
+        if self.norm in ('l1', 'l2'):
+            weights = values * values if self.norm == 'l2' else np.abs(values)
+            norms = np.bincount(rows, weights=weights, minlength=n_rows)
+            if self.norm == 'l2':
+                norms = np.sqrt(norms)
+            norms[norms == 0] = 1
+            values /= norms[rows]
+
+        indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+        return SparseRows(indptr, indices, values, (n_rows, n_features))
+
+    def get_feature_names_out(self):
+        names = np.empty(len(self.vocabulary_), dtype=object)
+        for term, index in self.vocabulary_.items():
+            names[index] = term
+        return names
+
+
+def _resolve_stop_words(stop_words):
+    if stop_words is None:
+        return frozenset()
+    if isinstance(stop_words, str):
+        # Bundles antérieurs qui ne stockent que le nom de la liste
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+        if stop_words != 'english':
+            raise ValueError(f"Liste de mots vides non supportée: {stop_words}")
+        return ENGLISH_STOP_WORDS
+    return frozenset(stop_words)
+
+
+class NaiveBayesScorer:
+    """Équivalent de MultinomialNB déjà entraîné (prédiction seulement)."""
+
+    def __init__(self, classes, class_log_prior, feature_log_prob):
+        self.classes_ = np.asarray(classes)
+        self.dtype = compute_dtype(feature_log_prob)
+        self.class_log_prior_ = np.asarray(class_log_prior, dtype=self.dtype)
+        # Gardé tel quel (mmap): seules les colonnes utiles sont converties
+        self.feature_log_prob_ = feature_log_prob
+        self.n_features_in_ = feature_log_prob.shape[1]
+
+    def joint_log_likelihood(self, X):
+        """
+        Log-vraisemblance jointe de lignes creuses (SparseRows ou matrice CSR):
+        somme, par ligne, des colonnes de feature_log_prob pondérées par ses valeurs.
+        """
+        jll = np.zeros((len(X.indptr) - 1, len(self.classes_)), dtype=self.dtype)
+        nonempty = np.flatnonzero(np.diff(X.indptr))
+        if len(nonempty):
+            weighted = self.feature_log_prob_[:, X.indices].astype(self.dtype, copy=False).T
+            weighted *= X.data[:, None]
+            # Segments consécutifs: les lignes vides n'ont aucune valeur entre deux débuts
+            jll[nonempty] = np.add.reduceat(weighted, X.indptr[nonempty], axis=0)
+        return jll + self.class_log_prior_
+
+    def predict_log_proba(self, X):
+        # log-somme-exp calculée comme dans scikit-learn (maximum isolé, log1p)
+        jll = self.joint_log_likelihood(X)
+        top = jll.max(axis=1, keepdims=True)
+        is_top = jll == top
+        m = is_top.sum(axis=1, keepdims=True).astype(jll.dtype)
+        rest = np.exp(np.where(is_top, -np.inf, jll) - top).sum(axis=1, keepdims=True) / m
+        return jll - (np.log1p(rest) + np.log(m) + top)
+
+    def predict_proba(self, X):
+        return np.exp(self.predict_log_proba(X))
+
+    def predict(self, X):
+        return self.classes_[self.joint_log_likelihood(X).argmax(axis=1)]
+
+
+def build_engine(arrays, vectorizer_params):
+    """(scorer, vectorizer) NumPy à partir des tableaux et paramètres d'un bundle."""
+    vectorizer = TextVectorizer(arrays['vocabulary'].tolist(), arrays['idf'], **vectorizer_params)
+    model = NaiveBayesScorer(arrays['classes'], arrays['class_log_prior'], arrays['feature_log_prob'])
+    return model, vectorizer
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from resumes.models import Resume
+from resumes.pipeline import index_skills
+
+
+class Command(BaseCommand):
+    help = "Indexe les compétences des CV existants (table Resume <-> Skill)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Nombre de CV traités par transaction"
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Réindexer aussi les CV qui ont déjà des compétences"
+        )
+
+    def handle(self, *args, **options):
+        resumes = Resume.objects.exclude(text_content__isnull=True).exclude(text_content='')
+        if not options['all']:
+            resumes = resumes.filter(resume_skills__isnull=True)
+
+        last_id = 0
+        indexed = 0
+        skills = 0
+
+        # Parcours par id croissant: chaque lot est une requête indépendante,
+        # sans OFFSET, et les CV déjà traités ne sont pas relus.
+        while True:
+            rows = list(
+                resumes.filter(id__gt=last_id).order_by('id').values_list('id', 'text_content')[:options['batch_size']]
+            )
+            if not rows:
+                break
+
+            found = index_skills(rows)
+            last_id = rows[-1][0]
+            indexed += len(rows)
+            skills += sum(len(names) for names in found.values())
+            self.stdout.write(f"{indexed} CV indexé(s)...")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{indexed} CV indexé(s), {skills} compétence(s) enregistrée(s)"
+        ))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from resumes.matching import store_resume_vectors
+from resumes.ml_classifier import cv_classifier
+from resumes.models import Resume
+
+
+class Command(BaseCommand):
+    help = "Calcule les vecteurs TF-IDF des CV pour le rapprochement avec les offres"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Nombre de CV vectorisés par lot"
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help="Recalculer aussi les vecteurs déjà à jour pour le modèle chargé"
+        )
+
+    def handle(self, *args, **options):
+        if not cv_classifier.is_loaded:
+            raise CommandError("Modèle non chargé")
+
+        resumes = Resume.objects.exclude(text_content__isnull=True).exclude(text_content='')
+        if not options['all']:
+            # Vecteurs absents ou calculés avec une autre version du modèle.
+            resumes = resumes.exclude(vector__model_version=cv_classifier.version)
+
+        last_id = 0
+        stored = 0
+
+        while True:
+            rows = list(
+                resumes.filter(id__gt=last_id).order_by('id').values_list('id', 'text_content')[:options['batch_size']]
+            )
+            if not rows:
+                break
+
+            stored += store_resume_vectors(rows)
+            last_id = rows[-1][0]
+            self.stdout.write(f"{stored} vecteur(s) calculé(s)...")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{stored} vecteur(s) enregistré(s) pour le modèle {cv_classifier.version}"
+        ))
@@ -0,0 +1,74 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from resumes.models import Resume
+from resumes.near_duplicates import find_clusters, store_signatures
+
+
+class Command(BaseCommand):
+    help = "Rapport des groupes de CV quasi identiques (MinHash/LSH)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threshold', type=float, default=0.9,
+            help="Similarité minimale estimée (entre 0.5 et 1)"
+        )
+        parser.add_argument(
+            '--backfill', action='store_true',
+            help="Calculer d'abord les signatures des CV qui n'en ont pas"
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Nombre de CV indexés par lot avec --backfill"
+        )
+        parser.add_argument(
+            '--json', action='store_true',
+            help="Sortie JSON"
+        )
+
+    def backfill(self, batch_size):
+        resumes = Resume.objects.exclude(text_content__isnull=True).exclude(
+            text_content=''
+        ).filter(signature__isnull=True)
+
+        last_id = 0
+        indexed = 0
+        while True:
+            rows = list(
+                resumes.filter(id__gt=last_id).order_by('id').values_list('id', 'text_content')[:batch_size]
+            )
+            if not rows:
+                break
+            indexed += store_signatures(rows)
+            last_id = rows[-1][0]
+        return indexed
+
+    def handle(self, *args, **options):
+        if not 0.5 <= options['threshold'] <= 1:
+            raise CommandError("--threshold doit être entre 0.5 et 1")
+
+        if options['backfill']:
+            indexed = self.backfill(options['batch_size'])
+            if not options['json']:
+                self.stdout.write(f"{indexed} signature(s) calculée(s)")
+
+        clusters = find_clusters(options['threshold'])
+
+        if options['json']:
+            self.stdout.write(json.dumps([
+                {'resume_ids': members, 'min_similarity': round(score, 4)}
+                for members, score in clusters
+            ]))
+            return
+
+        for number, (members, score) in enumerate(clusters, start=1):
+            self.stdout.write(
+                f"Groupe {number} ({len(members)} CV, similarité min {score:.2f}): "
+                + ', '.join(str(resume_id) for resume_id in members)
+            )
+
+        duplicates = sum(len(members) - 1 for members, _ in clusters)
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(clusters)} groupe(s), {duplicates} CV en double"
+        ))
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from resumes.pipeline import claim_next_job, process_job, requeue_stale_jobs
+
+
+class Command(BaseCommand):
+    help = "Traite les CV uploadés en mode asynchrone (extraction, classification, compétences)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Traiter les jobs en attente puis s'arrêter"
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=2.0,
+            help="Attente en secondes quand la file est vide"
+        )
+        parser.add_argument(
+            '--stale-after', type=int, default=600,
+            help="Remettre en attente les jobs bloqués en cours depuis N secondes"
+        )
+        parser.add_argument(
+            '--max-jobs', type=int, default=0,
+            help="Nombre maximal de jobs à traiter (0 = illimité)"
+        )
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_jobs(options['stale_after'])
+        if requeued:
+            self.stdout.write(f"{requeued} job(s) bloqué(s) remis en attente")
+
+        processed = 0
+        try:
+            while not options['max_jobs'] or processed < options['max_jobs']:
+                job = claim_next_job()
+
+                if job is None:
+                    if options['once']:
+                        break
+                    requeue_stale_jobs(options['stale_after'])
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                job = process_job(job)
+                processed += 1
+                self.stdout.write(f"Job {job.id} (CV {job.resume_id}): {job.status}")
+
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f"{processed} job(s) traité(s)"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from resumes.stats import rebuild_rollup
+
+
+class Command(BaseCommand):
+    help = "Recalcule la table d'agrégats des classifications (par jour et par catégorie)"
+
+    def handle(self, *args, **options):
+        rows = rebuild_rollup()
+        self.stdout.write(self.style.SUCCESS(f"{rows} ligne(s) d'agrégats recalculée(s)"))
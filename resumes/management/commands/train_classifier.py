@@ -0,0 +1,101 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from resumes.model_bundle import save_bundle, PRECISIONS
+from resumes.training import (
+    CHUNK_SIZE, MAX_TRACKED_TERMS, VECTORIZER_DEFAULTS, TrainingError,
+    csv_source, database_source, train
+)
+
+
+def document_frequency(value):
+    """Entier (nombre de documents) ou réel (proportion), comme min_df/max_df de scikit-learn."""
+    return float(value) if '.' in value else int(value)
+
+
+class Command(BaseCommand):
+    help = "Entraîne le classifieur en flux (CSV ou base) et publie un bundle d'inférence"
+
+    def add_arguments(self, parser):
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument('--csv', help="Fichier CSV (ex: resume_dataset/Resume/Resume.csv)")
+        source.add_argument(
+            '--from-db', action='store_true',
+            help="CV en base, étiquetés par leur classification la plus récente"
+        )
+        parser.add_argument('--text-column', default='Resume_str', help="Colonne du texte (CSV)")
+        parser.add_argument('--label-column', default='Category', help="Colonne de la catégorie (CSV)")
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help="Nombre de documents lus et vectorisés par lot"
+        )
+        parser.add_argument(
+            '--test-size', type=float, default=0.2,
+            help="Proportion de documents mis de côté pour l'évaluation (0 = aucune)"
+        )
+        parser.add_argument('--max-features', type=int, default=VECTORIZER_DEFAULTS['max_features'])
+        parser.add_argument('--min-df', type=document_frequency, default=VECTORIZER_DEFAULTS['min_df'])
+        parser.add_argument('--max-df', type=document_frequency, default=VECTORIZER_DEFAULTS['max_df'])
+        parser.add_argument(
+            '--max-tracked-terms', type=int, default=MAX_TRACKED_TERMS,
+            help="Termes distincts suivis pendant la 1re passe avant élagage des plus rares"
+        )
+        parser.add_argument(
+            '--precision', choices=PRECISIONS, default='float64',
+            help="Précision des poids du bundle (float64: identique à scikit-learn)"
+        )
+        parser.add_argument(
+            '--output', default=None,
+            help="Dossier des modèles (défaut: ml_models/)"
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size doit être positif")
+        if not 0 <= options['test_size'] < 1:
+            raise CommandError("--test-size doit être compris entre 0 et 1")
+
+        if options['csv']:
+            if not os.path.exists(options['csv']):
+                raise CommandError(f"Fichier non trouvé: {options['csv']}")
+            source = csv_source(
+                options['csv'], options['text_column'], options['label_column'], options['chunk_size']
+            )
+        else:
+            source = database_source(options['chunk_size'])
+
+        verbose = options['verbosity'] > 1
+        try:
+            model, vectorizer, report = train(
+                source,
+                test_size=options['test_size'],
+                max_tracked_terms=options['max_tracked_terms'],
+                progress=self.stdout.write if verbose else None,
+                max_features=options['max_features'],
+                min_df=options['min_df'],
+                max_df=options['max_df'],
+            )
+        except TrainingError as e:
+            raise CommandError(str(e))
+
+        output = options['output'] or os.path.join(settings.BASE_DIR, 'ml_models')
+        os.makedirs(output, exist_ok=True)
+        manifest = save_bundle(model, vectorizer, output, precision=options['precision'])
+
+        self.stdout.write(f"Documents d'entraînement: {report['documents']}")
+        self.stdout.write(f"Vocabulaire: {report['vocabulary_size']} termes")
+        if report['pruned_below_df']:
+            self.stdout.write(
+                f"Termes élagués pendant le comptage: fréquence <= {report['pruned_below_df']}"
+            )
+        for category, count in report['categories'].items():
+            self.stdout.write(f"  - {category}: {count} CV")
+        if report['accuracy'] is not None:
+            self.stdout.write(
+                f"Précision sur {report['test_documents']} document(s) de test: {report['accuracy']:.2%}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Bundle {manifest['version']} ({manifest['precision']}) publié dans {output}"
+        ))
@@ -0,0 +1,451 @@
+"""
+Rapprochement offres d'emploi <-> CV par similarité cosinus TF-IDF.
+
+Les vecteurs des CV sont calculés à l'ingestion avec le vectoriseur du modèle
+chargé et stockés en base (ResumeVector). Chaque processus garde un index en
+mémoire: une matrice creuse CSR (une ligne par CV, normalisée L2) complétée de
+façon incrémentale avec les vecteurs modifiés depuis la dernière
+synchronisation. Classer tous les CV pour une offre est un seul produit
+matrice-vecteur.
+
+Après un changement de modèle (rechargement à chaud), les vecteurs absents
+ou calculés avec une autre version sont recalculés par lots dans un thread
+d'arrière-plan, jamais pendant une requête. En attendant, l'index continue
+de classer avec le modèle précédent et ses vecteurs. Un verrou dans le cache
+Django évite que chaque worker refasse les mêmes écritures quand CACHES est
+partagé (Redis, Memcached); sinon, lancer `manage.py build_resume_vectors`
+après la publication d'un modèle.
+
+Dans l'autre sens, les vecteurs des offres sont calculés à leur
+enregistrement (JobPostingVector) et les offres actives sont gardées en
+mémoire sous forme d'une matrice, invalidée dès qu'une offre est enregistrée
+ou supprimée (voir JobPostingMatrix pour les limites de QuerySet.update()).
+"""
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+import numpy as np
+from scipy import sparse
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, Max, Sum, Q
+from django.utils import timezone
+
+from .models import Resume, ResumeVector, JobPosting, JobPostingVector
+from .ml_classifier import cv_classifier
+
+logger = logging.getLogger(__name__)
+
+# Les vecteurs écrits par une transaction encore ouverte au moment de la
+# synchronisation peuvent porter une date antérieure: on relit cette marge.
+SYNC_MARGIN = timedelta(seconds=5)
+
+# Au-delà de cette proportion de lignes remplacées ou supprimées, l'index est
+# reconstruit au lieu d'être complété.
+COMPACT_RATIO = 0.5
+
+# CV revectorisés par lot quand l'index est reconstruit pour un nouveau modèle
+REVECTORIZE_BATCH_SIZE = 500
+
+# Verrou partagé de la revectorisation: durée maximale et attente entre deux
+# tentatives des workers qui ne le détiennent pas.
+REVECTORIZE_LOCK_TIMEOUT = 3600
+REVECTORIZE_POLL_INTERVAL = 5
+
+# `state` est le modèle (LoadedModel) avec lequel les vecteurs ont été
+# calculés: la requête est vectorisée avec lui.
+IndexSnapshot = namedtuple('IndexSnapshot', ['version', 'matrix', 'resume_ids', 'alive', 'state'])
+PostingMatrix = namedtuple('PostingMatrix', ['version', 'fingerprint', 'matrix', 'posting_ids'])
+
+
+def vectorize(state, texts):
+    X = state.vectorizer.transform(texts).tocsr().astype(np.float32)
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    X.data /= np.repeat(norms, np.diff(X.indptr)).astype(np.float32)
+    return X
+
+
+def top_scores(scores, ids, mask, limit):
+    """[(id, score)] des `limit` meilleurs scores positifs parmi `mask`, sans tri complet."""
+    candidates = np.flatnonzero(mask & (scores > 0))
+    if len(candidates) > limit:
+        candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+    candidates = candidates[np.lexsort((ids[candidates], -scores[candidates]))]
+
+    return [(int(ids[i]), float(scores[i])) for i in candidates]
+
+
+def pack_vector(X, i):
+    """(indices, valeurs) de la ligne i d'une matrice CSR, en octets."""
+    start, end = X.indptr[i], X.indptr[i + 1]
+    return X.indices[start:end].astype(np.int32).tobytes(), X.data[start:end].tobytes()
+
+
+def read_vectors(rows, n_features):
+    """
+    Assemble des vecteurs stockés en une matrice CSR.
+
+    `rows` itère sur des tuples (id, indices, valeurs, ...); renvoie les
+    tuples sans les vecteurs, dans l'ordre des lignes, et la matrice.
+    """
+    keys, indptr, indices, data = [], [0], [], []
+
+    for key, row_indices, row_values, *extra in rows:
+        row_indices = np.frombuffer(row_indices, dtype=np.int32)
+        keys.append((key, *extra))
+        indices.append(row_indices)
+        data.append(np.frombuffer(row_values, dtype=np.float32))
+        indptr.append(indptr[-1] + len(row_indices))
+
+    matrix = sparse.csr_matrix(
+        (
+            np.concatenate(data) if data else np.zeros(0, dtype=np.float32),
+            np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32),
+            np.array(indptr, dtype=np.int64)
+        ),
+        shape=(len(keys), n_features)
+    )
+    return keys, matrix
+
+
+def compute_resume_vectors(rows, state=None):
+    """
+    Calcule (sans accès à la base) les vecteurs de plusieurs CV.
+
+    `rows` est une liste de (resume_id, texte). Renvoie des ResumeVector non
+    enregistrés (liste vide si aucun modèle n'est chargé).
+    """
+    rows = [(resume_id, text) for resume_id, text in rows if text]
+    state = state or cv_classifier.snapshot()
+    if not rows or state is None:
+        return []
+
+    X = vectorize(state, [text for _, text in rows])
+    now = timezone.now()
+    vectors = []
+    for i, (resume_id, _) in enumerate(rows):
+        indices, values = pack_vector(X, i)
+        vectors.append(ResumeVector(
+            resume_id=resume_id,
+            model_version=state.version,
+            indices=indices,
+            values=values,
+            updated_at=now
+        ))
+    return vectors
+
+
+def save_resume_vectors(vectors):
+    """Remplace en base les vecteurs des CV concernés; renvoie leur nombre."""
+    if not vectors:
+        return 0
+
+    with transaction.atomic():
+        ResumeVector.objects.filter(resume_id__in=[vector.resume_id for vector in vectors]).delete()
+        ResumeVector.objects.bulk_create(vectors)
+
+    return len(vectors)
+
+
+def store_resume_vectors(rows, state=None):
+    """
+    Calcule et enregistre les vecteurs de plusieurs CV.
+
+    `rows` est une liste de (resume_id, texte). Renvoie le nombre de vecteurs
+    enregistrés (0 si aucun modèle n'est chargé).
+    """
+    return save_resume_vectors(compute_resume_vectors(rows, state))
+
+
+def _vectorizable_resumes():
+    return Resume.objects.exclude(text_content__isnull=True).exclude(text_content='')
+
+
+def store_stale_resume_vectors(state, batch_size=REVECTORIZE_BATCH_SIZE):
+    """Calcule les vecteurs absents ou d'une autre version du modèle; renvoie leur nombre."""
+    resumes = _vectorizable_resumes().exclude(vector__model_version=state.version)
+
+    last_id = 0
+    stored = 0
+    while True:
+        rows = list(
+            resumes.filter(id__gt=last_id).order_by('id').values_list('id', 'text_content')[:batch_size]
+        )
+        if not rows:
+            return stored
+        stored += store_resume_vectors(rows, state)
+        last_id = rows[-1][0]
+
+
+class ResumeVectorIndex:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._positions = {}
+        self._updated = {}
+        self._synced_at = None
+        self._backfill = None
+        self._backfill_version = None
+
+    def _read(self, vectors, n_features):
+        rows = vectors.values_list('resume_id', 'indices', 'values', 'updated_at')
+        keys, matrix = read_vectors(rows.iterator(chunk_size=2000), n_features)
+        return [key for key, _ in keys], [stamp for _, stamp in keys], matrix
+
+    def backfill(self, state):
+        """
+        Recalcule les vecteurs manquants pour `state`; renvoie leur nombre.
+
+        Si un autre worker détient le verrou, attend qu'il ait fini: il ne
+        reste alors plus rien à calculer.
+        """
+        key = f'resumes:revectorize:{state.version}'
+        while not cache.add(key, os.getpid(), REVECTORIZE_LOCK_TIMEOUT):
+            time.sleep(REVECTORIZE_POLL_INTERVAL)
+        try:
+            stored = store_stale_resume_vectors(state)
+        finally:
+            cache.delete(key)
+        if stored:
+            logger.info(f"{stored} vecteur(s) de CV recalculé(s) pour le modèle {state.version}")
+        return stored
+
+    def _run_backfill(self, state):
+        try:
+            self.backfill(state)
+        except Exception as e:
+            logger.error(f"Erreur lors de la revectorisation des CV: {str(e)}")
+        finally:
+            connection.close()
+
+    def _start_backfill(self, state):
+        thread = threading.Thread(
+            target=self._run_backfill, args=(state,), name='resume-vector-backfill', daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _backfilling(self, state):
+        """Lance au besoin la revectorisation pour `state`; indique si elle est en cours."""
+        if self._backfill_version != state.version:
+            self._backfill_version = state.version
+            self._backfill = self._start_backfill(state)
+        return self._backfill is not None and self._backfill.is_alive()
+
+    def _rebuild(self, state, started):
+        n_features = len(state.vectorizer.idf_)
+        resume_ids, stamps, matrix = self._read(
+            ResumeVector.objects.filter(model_version=state.version).order_by('resume_id'),
+            n_features
+        )
+
+        self._positions = {resume_id: i for i, resume_id in enumerate(resume_ids)}
+        self._updated = dict(zip(resume_ids, stamps))
+        self._synced_at = started
+        self._snapshot = IndexSnapshot(
+            state.version, matrix,
+            np.array(resume_ids, dtype=np.int64),
+            np.ones(len(resume_ids), dtype=bool),
+            state
+        )
+        logger.info(f"Index des CV reconstruit: {len(resume_ids)} vecteurs ({state.version})")
+
+        if len(resume_ids) < _vectorizable_resumes().count():
+            # Premier index d'un processus avec des vecteurs manquants: ils
+            # sont ajoutés par _sync au fil de la revectorisation.
+            self._backfilling(state)
+
+    def _sync(self, state, started):
+        snapshot = self._snapshot
+        n_features = snapshot.matrix.shape[1]
+        resume_ids, stamps, matrix = self._read(
+            ResumeVector.objects.filter(
+                model_version=state.version,
+                updated_at__gte=self._synced_at - SYNC_MARGIN
+            ).order_by('resume_id'),
+            n_features
+        )
+        self._synced_at = started
+
+        new_rows = [
+            i for i, (resume_id, stamp) in enumerate(zip(resume_ids, stamps))
+            if self._updated.get(resume_id) != stamp
+        ]
+        if not new_rows:
+            return
+
+        alive = snapshot.alive.copy()
+        offset = snapshot.matrix.shape[0]
+        for position, i in enumerate(new_rows, start=offset):
+            resume_id = resume_ids[i]
+            previous = self._positions.get(resume_id)
+            if previous is not None:
+                alive[previous] = False
+            self._positions[resume_id] = position
+            self._updated[resume_id] = stamps[i]
+
+        self._snapshot = IndexSnapshot(
+            snapshot.version,
+            sparse.vstack([snapshot.matrix, matrix[new_rows]], format='csr'),
+            np.concatenate([snapshot.resume_ids, np.array([resume_ids[i] for i in new_rows], dtype=np.int64)]),
+            np.concatenate([alive, np.ones(len(new_rows), dtype=bool)]),
+            snapshot.state
+        )
+
+    def refresh(self, state):
+        with self._lock:
+            started = timezone.now()
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.version != state.version and self._backfilling(state):
+                # Nouveau modèle dont les vecteurs sont en cours de calcul:
+                # classement avec le modèle précédent jusqu'à la fin.
+                self._sync(snapshot.state, started)
+                return self._snapshot
+            if (
+                snapshot is None
+                or snapshot.version != state.version
+                or (~snapshot.alive).sum() > COMPACT_RATIO * len(snapshot.alive)
+            ):
+                self._rebuild(state, started)
+            else:
+                self._sync(state, started)
+            return self._snapshot
+
+    def discard(self, resume_ids):
+        """Retire de l'index des CV supprimés (leurs vecteurs partent en cascade)."""
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None:
+                return
+            alive = snapshot.alive.copy()
+            for resume_id in resume_ids:
+                position = self._positions.pop(resume_id, None)
+                self._updated.pop(resume_id, None)
+                if position is not None:
+                    alive[position] = False
+            self._snapshot = snapshot._replace(alive=alive)
+
+    def rank(self, text, limit=50, allowed_ids=None):
+        """
+        Renvoie [(resume_id, score)] par similarité cosinus décroissante.
+
+        `allowed_ids` restreint les candidats (droits, catégorie); None = tous.
+        """
+        state = cv_classifier.snapshot()
+        if state is None:
+            raise Exception("Modèle non chargé. Téléchargez-le depuis Kaggle.")
+
+        snapshot = self.refresh(state)
+        query = vectorize(snapshot.state, [text])
+        scores = snapshot.matrix.dot(query.T).toarray().ravel()
+
+        mask = snapshot.alive
+        if allowed_ids is not None:
+            mask = mask & np.isin(snapshot.resume_ids, np.fromiter(allowed_ids, dtype=np.int64))
+
+        return top_scores(scores, snapshot.resume_ids, mask, limit)
+
+
+def posting_text(posting):
+    return f"{posting.title} {posting.description}"
+
+
+def store_posting_vector(posting):
+    state = cv_classifier.snapshot()
+    if state is None:
+        return False
+
+    indices, values = pack_vector(vectorize(state, [posting_text(posting)]), 0)
+    JobPostingVector.objects.update_or_create(
+        posting=posting,
+        defaults={'model_version': state.version, 'indices': indices, 'values': values}
+    )
+    posting_matrix.invalidate()
+    return True
+
+
+class JobPostingMatrix:
+    """
+    Matrice des vecteurs des offres actives, partagée par les recommandations.
+
+    L'empreinte est relue à chaque appel: un enregistrement (save()) ou une
+    suppression d'offre, y compris dans un autre processus, invalide la
+    matrice. Elle couvre aussi le nombre et la somme des ids des offres
+    actives, pour les changements de is_active faits par QuerySet.update()
+    (sans signal post_save).
+
+    Limites, faute de signal: un update() du titre ou de la description ne
+    recalcule pas le vecteur et n'est pas détecté, pas plus qu'un update()
+    qui désactive et active en même temps des offres dont les ids ont la
+    même somme. Appeler alors store_posting_vector() sur les offres
+    modifiées, ou posting_matrix.invalidate().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._matrix = None
+
+    def invalidate(self):
+        self._matrix = None
+
+    def _fingerprint(self):
+        values = JobPostingVector.objects.aggregate(count=Count('posting_id'), updated=Max('updated_at'))
+        active = JobPosting.objects.aggregate(
+            count=Count('id', filter=Q(is_active=True)), ids=Sum('id', filter=Q(is_active=True))
+        )
+        return values['count'], values['updated'], active['count'], active['ids']
+
+    def _build(self, state):
+        # Offres actives sans vecteur pour ce modèle (créées avant le
+        # chargement du modèle ou avec une autre version): calculées une fois.
+        missing = JobPosting.objects.filter(is_active=True).exclude(vector__model_version=state.version)
+        for posting in missing:
+            store_posting_vector(posting)
+
+        rows = JobPostingVector.objects.filter(
+            model_version=state.version, posting__is_active=True
+        ).order_by('posting_id').values_list('posting_id', 'indices', 'values')
+        keys, matrix = read_vectors(rows, len(state.vectorizer.idf_))
+        return matrix, np.array([key for key, in keys], dtype=np.int64)
+
+    def get(self, state):
+        fingerprint = self._fingerprint()
+        current = self._matrix
+        if current is not None and current.version == state.version and current.fingerprint == fingerprint:
+            return current
+
+        with self._lock:
+            matrix, posting_ids = self._build(state)
+            current = PostingMatrix(state.version, self._fingerprint(), matrix, posting_ids)
+            self._matrix = current
+            logger.info(f"Matrice des offres reconstruite: {len(posting_ids)} offres actives")
+            return current
+
+
+def recommend_jobs(resume, limit=10):
+    """Renvoie [(posting_id, score)] des offres actives les plus proches du CV."""
+    state = cv_classifier.snapshot()
+    if state is None:
+        raise Exception("Modèle non chargé. Téléchargez-le depuis Kaggle.")
+
+    stored = ResumeVector.objects.filter(
+        resume=resume, model_version=state.version
+    ).values_list('resume_id', 'indices', 'values')
+    _, query = read_vectors(stored, len(state.vectorizer.idf_))
+    if not query.shape[0]:
+        query = vectorize(state, [resume.text_content])
+
+    postings = posting_matrix.get(state)
+    scores = postings.matrix.dot(query.T).toarray().ravel()
+
+    return top_scores(scores, postings.posting_ids, True, limit)
+
+
+resume_index = ResumeVectorIndex()
+posting_matrix = JobPostingMatrix()
@@ -0,0 +1,30 @@
+# Generated by Django 4.2 on 2026-10-17 01:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='category',
+            options={'ordering': ['name'], 'verbose_name_plural': 'Categories'},
+        ),
+        migrations.AlterModelOptions(
+            name='jobposting',
+            options={'ordering': ['-created_at']},
+        ),
+        migrations.AlterModelOptions(
+            name='resume',
+            options={'ordering': ['-uploaded_at']},
+        ),
+        migrations.AddField(
+            model_name='classification',
+            name='model_version',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+    ]
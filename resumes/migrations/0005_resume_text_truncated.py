@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-17 01:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0004_resume_sha256'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='text_truncated',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2 on 2026-10-17 02:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0005_resume_text_truncated'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumeSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_skills', to='resumes.resume')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_skills', to='resumes.skill')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='skills',
+            field=models.ManyToManyField(blank=True, related_name='resumes', through='resumes.ResumeSkill', to='resumes.skill'),
+        ),
+        migrations.AddConstraint(
+            model_name='resumeskill',
+            constraint=models.UniqueConstraint(fields=('skill', 'resume'), name='unique_skill_resume'),
+        ),
+    ]
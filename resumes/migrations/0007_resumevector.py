@@ -0,0 +1,24 @@
+# Generated by Django 4.2 on 2026-10-17 02:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0006_skill_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeVector',
+            fields=[
+                ('resume', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='vector', serialize=False, to='resumes.resume')),
+                ('model_version', models.CharField(db_index=True, max_length=64)),
+                ('indices', models.BinaryField()),
+                ('values', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,62 @@
+from django.db import migrations
+
+# SQL figé ici (et non importé de resumes.search) pour que la migration
+# reste identique même si le module de recherche évolue.
+FTS_TABLE = 'resumes_resume_fts'
+
+SQLITE_SETUP = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        text_content, content='resumes_resume', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON resumes_resume BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, text_content) VALUES (new.id, new.text_content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON resumes_resume BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text_content) VALUES ('delete', old.id, old.text_content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF text_content ON resumes_resume BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text_content) VALUES ('delete', old.id, old.text_content);
+        INSERT INTO {FTS_TABLE}(rowid, text_content) VALUES (new.id, new.text_content);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_TEARDOWN = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRES_SETUP = [
+    """CREATE INDEX IF NOT EXISTS resumes_resume_text_search
+        ON resumes_resume USING gin (to_tsvector('french', coalesce(text_content, '')))""",
+]
+
+POSTGRES_TEARDOWN = [
+    "DROP INDEX IF EXISTS resumes_resume_text_search",
+]
+
+
+def create_index(apps, schema_editor):
+    statements = {'sqlite': SQLITE_SETUP, 'postgresql': POSTGRES_SETUP}
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def drop_index(apps, schema_editor):
+    statements = {'sqlite': SQLITE_TEARDOWN, 'postgresql': POSTGRES_TEARDOWN}
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0009_near_duplicate_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2 on 2026-10-17 02:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0010_resume_fulltext_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClassificationDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+                ('confidence_sum', models.FloatField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='resumes.category')),
+            ],
+            options={
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='classificationdailystats',
+            constraint=models.UniqueConstraint(fields=('day', 'category'), name='unique_day_category'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-17 02:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0011_classificationdailystats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='classification',
+            index=models.Index(fields=['category', '-classified_at', '-id'], name='classification_keyset_idx'),
+        ),
+    ]
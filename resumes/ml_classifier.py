@@ -1,42 +1,257 @@
+import logging
 import pickle
 import os
+import threading
+import time
+from collections import namedtuple
 from django.conf import settings
 
+from .prediction_cache import build_prediction_cache
+from .inference_batcher import build_inference_batcher
+
+logger = logging.getLogger(__name__)
+
+
+Prediction = namedtuple(
+    'Prediction',
+    ['category', 'confidence', 'top_categories', 'model_version'],
+    defaults=['']
+)
+
+# Instantané immuable du modèle chargé: une requête lit l'état une seule fois
+# et termine sur ce modèle même si un rechargement a lieu entre-temps.
+LoadedModel = namedtuple('LoadedModel', ['model', 'vectorizer', 'version', 'load_seconds'])
+
 
 class CVClassifier:
+    """
+    Classifieur partagé par le processus.
+
+    Le modèle (et numpy/scipy avec lui) n'est chargé qu'au premier usage:
+    les commandes de gestion et le démarrage des workers n'en paient pas le
+    coût. `resumes.warmup.warm_up()` force ce chargement au démarrage.
+    """
+
+    def __init__(self, base_path=None):
+
+        self.base_path = base_path or os.path.join(settings.BASE_DIR, 'ml_models')
+        self.check_interval = getattr(settings, 'MODEL_RELOAD_CHECK_INTERVAL', 30)
+        self.cache = build_prediction_cache()
+        self.batcher = build_inference_batcher(self)
+        self._state = None
+        self._loaded = False
+        self._reload_lock = threading.Lock()
+        self._manifest_mtime = None
+        self._next_check = 0
+
+    def _current(self):
+        if not self._loaded:
+            with self._reload_lock:
+                if not self._loaded:
+                    try:
+                        self._state = self._load()
+                    except Exception as e:
+                        logger.error(f"Erreur lors du chargement du modèle: {str(e)}")
+                    self._loaded = True
+        return self._state
+
+    @property
+    def is_loaded(self):
+        return self._current() is not None
+
+    @property
+    def model(self):
+        state = self._current()
+        return state.model if state else None
 
-    def __init__(self):
+    @property
+    def vectorizer(self):
+        state = self._current()
+        return state.vectorizer if state else None
 
-        base_path = os.path.join(settings.BASE_DIR, 'ml_models')
-        model_path = os.path.join(base_path, 'resume_classifier.pkl')
-        vectorizer_path = os.path.join(base_path, 'vectorizer.pkl')
+    @property
+    def version(self):
+        state = self._current()
+        return state.version if state else None
 
-        if os.path.exists(model_path) and os.path.exists(vectorizer_path):
-            with open(model_path, 'rb') as f:
-                self.model = pickle.load(f)
-            with open(vectorizer_path, 'rb') as f:
-                self.vectorizer = pickle.load(f)
-            self.is_loaded = True
+    @property
+    def load_seconds(self):
+        state = self._current()
+        return state.load_seconds if state else None
+
+    def _manifest_stat(self):
+        from .model_bundle import MANIFEST_NAME
+
+        try:
+            return os.stat(os.path.join(self.base_path, MANIFEST_NAME)).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self):
+        from .model_bundle import read_manifest, load_bundle, load_engine
+
+        started = time.perf_counter()
+        mtime = self._manifest_stat()
+        manifest = read_manifest(self.base_path)
+
+        if manifest is not None:
+            # 'numpy': moteur resumes.inference (sans scikit-learn), 'sklearn': objets reconstruits
+            if getattr(settings, 'INFERENCE_ENGINE', 'numpy') == 'numpy':
+                model, vectorizer, manifest = load_engine(self.base_path, manifest)
+            else:
+                model, vectorizer, manifest = load_bundle(self.base_path, manifest)
+            version = manifest['version']
         else:
-            self.model = None
-            self.vectorizer = None
-            self.is_loaded = False
+            model, vectorizer = self._load_pickles()
+            if model is None:
+                return None
+            version = 'legacy-pickle'
 
-    def predict(self, text):
+        self._manifest_mtime = mtime
+        load_seconds = time.perf_counter() - started
+        logger.info(f"Modèle {version} chargé en {load_seconds * 1000:.1f} ms")
+
+        return LoadedModel(model, vectorizer, version, load_seconds)
+
+    def _load_pickles(self):
+        model_path = os.path.join(self.base_path, 'resume_classifier.pkl')
+        vectorizer_path = os.path.join(self.base_path, 'vectorizer.pkl')
+
+        if not (os.path.exists(model_path) and os.path.exists(vectorizer_path)):
+            return None, None
+
+        with open(model_path, 'rb') as f:
+            model = pickle.load(f)
+        with open(vectorizer_path, 'rb') as f:
+            vectorizer = pickle.load(f)
+        return model, vectorizer
+
+    def reload(self):
+        with self._reload_lock:
+            # Lecture directe de l'état: self.version passerait par _current(),
+            # qui reprend ce verrou (non réentrant) si le modèle n'est pas chargé.
+            previous = self._state.version if self._state else None
+            state = self._load()
+            if state is None:
+                raise Exception("Aucun modèle à recharger")
 
-        if not self.is_loaded:
+            # Simple affectation d'attribut: l'échange est atomique pour
+            # les autres threads, qui voient l'ancien ou le nouvel état.
+            self._state = state
+            self._loaded = True
+
+        if previous != state.version:
+            logger.info(f"Modèle rechargé: {previous} -> {state.version}")
+        return state.version
+
+    def reload_in_background(self):
+        thread = threading.Thread(target=self._safe_reload, name='cv-classifier-reload', daemon=True)
+        thread.start()
+        return thread
+
+    def _safe_reload(self):
+        try:
+            self.reload()
+        except Exception as e:
+            logger.error(f"Erreur lors du rechargement du modèle: {str(e)}")
+
+    def check_for_update(self):
+        # Le premier appel charge le modèle et mémorise son manifeste.
+        self._current()
+        if not self.check_interval or self._reload_lock.locked():
+            return False
+
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + self.check_interval
+
+        mtime = self._manifest_stat()
+        if mtime is None or mtime == self._manifest_mtime:
+            return False
+
+        logger.info("Nouveau manifeste détecté, rechargement du modèle en arrière-plan")
+        self.reload_in_background()
+        return True
+
+    def rank_many(self, texts, top_k=0):
+
+        self.check_for_update()
+        state = self._current()
+
+        if state is None:
             raise Exception("Modèle non chargé. Téléchargez-le depuis Kaggle.")
 
-        X = self.vectorizer.transform([text])
-        predicted_category = self.model.predict(X)[0]
-        probabilities = self.model.predict_proba(X)[0]
-        confidence = max(probabilities)
+        if not texts:
+            return []
+
+        probabilities = self._probabilities(state, texts)
+        classes = state.model.classes_
+        top_k = min(top_k, len(classes))
+
+        predictions = []
+        for row in probabilities:
+            best = row.argmax()
+            top_categories = []
+            if top_k > 0:
+                ranked = (-row).argsort(kind='stable')[:top_k]
+                top_categories = [(classes[i], float(row[i])) for i in ranked]
+            predictions.append(Prediction(
+                classes[best], float(row[best]), top_categories, state.version
+            ))
+
+        return predictions
+
+    def _probabilities(self, state, texts):
+        # Le cache normalise la casse: il n'est utilisé que si le vectoriseur
+        # met lui-même le texte en minuscules.
+        cache = self.cache if getattr(state.vectorizer, 'lowercase', False) else None
+        if cache is None:
+            return list(self._predict_proba(state, texts))
+
+        keys = [cache.make_key(text, state.version) for text in texts]
+        cached = cache.get_many(list(set(keys)))
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+
+        if missing:
+            computed = self._predict_proba(state, [texts[i] for i in missing])
+            new_entries = {keys[i]: row for i, row in zip(missing, computed)}
+            cache.set_many(new_entries)
+            cached.update(new_entries)
+
+        return [cached[key] for key in keys]
+
+    def _predict_proba(self, state, texts):
+        # Une seule passe du modèle: le label et la confiance sont dérivés
+        # de la matrice de probabilités au lieu d'appeler aussi predict().
+        X = state.vectorizer.transform(texts)
+        return state.model.predict_proba(X)
+
+    def snapshot(self):
+        """État chargé (LoadedModel) à utiliser de bout en bout par un appelant, ou None."""
+        self.check_for_update()
+        return self._current()
+
+    def rank(self, text, top_k=0):
+        # Les appels concurrents sont regroupés en un seul passage du modèle.
+        if self.batcher is not None:
+            return self.batcher.rank(text, top_k)
+        return self.rank_many([text], top_k=top_k)[0]
+
+    def predict(self, text):
+        prediction = self.rank(text)
+        return prediction.category, prediction.confidence
 
-        return predicted_category, confidence
+    def predict_many(self, texts):
+        return [
+            (prediction.category, prediction.confidence)
+            for prediction in self.rank_many(texts)
+        ]
 
     def get_all_categories(self):
-        if self.is_loaded:
-            return list(self.model.classes_)
+        state = self._current()
+        if state is not None:
+            return list(state.model.classes_)
         return []
 
 
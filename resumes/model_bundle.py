@@ -0,0 +1,190 @@
+"""
+Bundle versionné du modèle de classification.
+
+Les poids du modèle sont sauvegardés en tableaux numpy (.npy) pour être
+ouverts en mmap: tous les workers partagent alors la même copie en page
+cache au lieu de désérialiser chacun leur propre pickle.
+
+    ml_models/
+        manifest.json               # version courante + sommes de contrôle
+        bundles/<version>/*.npy     # tableaux du modèle
+"""
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+
+BUNDLE_FORMAT = 1
+MANIFEST_NAME = 'manifest.json'
+BUNDLES_DIR = 'bundles'
+
+ARRAYS = ('classes', 'vocabulary', 'idf', 'class_log_prior', 'feature_log_prob')
+
+# Précision de stockage des poids (idf, class_log_prior, feature_log_prob)
+PRECISIONS = ('float64', 'float32', 'float16')
+
+VECTORIZER_PARAMS = (
+    'analyzer', 'lowercase', 'strip_accents', 'stop_words', 'token_pattern',
+    'ngram_range', 'binary', 'norm', 'use_idf', 'smooth_idf', 'sublinear_tf',
+)
+
+
+class BundleError(Exception):
+    pass
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _bundle_checksum(files):
+    digest = hashlib.sha256()
+    for name in sorted(files):
+        digest.update(f"{name}:{files[name]['sha256']}\n".encode())
+    return digest.hexdigest()
+
+
+def _vectorizer_params(vectorizer):
+    params = {}
+    for name in VECTORIZER_PARAMS:
+        value = getattr(vectorizer, name)
+        if name == 'stop_words' and value is not None:
+            # Liste résolue: le moteur NumPy n'a pas à importer scikit-learn
+            value = vectorizer.get_stop_words()
+        if isinstance(value, (set, frozenset)):
+            value = sorted(value)
+        elif isinstance(value, tuple):
+            value = list(value)
+        params[name] = value
+    return params
+
+
+def read_manifest(base_path):
+    manifest_path = os.path.join(base_path, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        return json.load(f)
+
+
+def save_bundle(model, vectorizer, base_path, precision='float64'):
+    if precision not in PRECISIONS:
+        raise BundleError(f"Précision non supportée: {precision}")
+
+    vocabulary = vectorizer.get_feature_names_out()
+    arrays = {
+        'classes': np.asarray(model.classes_).astype(str),
+        'vocabulary': np.asarray(vocabulary).astype(str),
+        'idf': np.ascontiguousarray(vectorizer.idf_, dtype=precision),
+        'class_log_prior': np.ascontiguousarray(model.class_log_prior_, dtype=precision),
+        'feature_log_prob': np.ascontiguousarray(model.feature_log_prob_, dtype=precision),
+    }
+
+    staging = os.path.join(base_path, BUNDLES_DIR, f".staging-{os.getpid()}-{time.time_ns()}")
+    os.makedirs(staging)
+
+    files = {}
+    for name, array in arrays.items():
+        file_name = f"{name}.npy"
+        np.save(os.path.join(staging, file_name), array, allow_pickle=False)
+        files[name] = {
+            'file': file_name,
+            'sha256': _file_sha256(os.path.join(staging, file_name)),
+            'shape': list(array.shape),
+            'dtype': str(array.dtype),
+        }
+
+    checksum = _bundle_checksum(files)
+    version = f"{time.strftime('%Y%m%d%H%M%S')}-{checksum[:8]}"
+    bundle_dir = os.path.join(BUNDLES_DIR, version)
+    os.replace(staging, os.path.join(base_path, bundle_dir))
+
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'version': version,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'checksum': checksum,
+        'precision': precision,
+        'path': bundle_dir,
+        'arrays': files,
+        'vectorizer': _vectorizer_params(vectorizer),
+    }
+
+    # Écriture atomique: un worker ne lit jamais un manifeste à moitié écrit.
+    manifest_path = os.path.join(base_path, MANIFEST_NAME)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+    return manifest
+
+
+def load_arrays(base_path, manifest, verify=True):
+    if manifest.get('format') != BUNDLE_FORMAT:
+        raise BundleError(f"Format de bundle non supporté: {manifest.get('format')}")
+
+    bundle_dir = os.path.join(base_path, manifest['path'])
+    files = manifest['arrays']
+
+    if verify:
+        actual = {
+            name: {'sha256': _file_sha256(os.path.join(bundle_dir, info['file']))}
+            for name, info in files.items()
+        }
+        if _bundle_checksum(actual) != manifest['checksum']:
+            raise BundleError(f"Somme de contrôle invalide pour le bundle {manifest['version']}")
+
+    return {
+        name: np.load(os.path.join(bundle_dir, files[name]['file']), mmap_mode='r', allow_pickle=False)
+        for name in ARRAYS
+    }
+
+
+def _read(base_path, manifest, verify):
+    if manifest is None:
+        manifest = read_manifest(base_path)
+        if manifest is None:
+            raise BundleError(f"Aucun manifeste dans {base_path}")
+    return manifest, load_arrays(base_path, manifest, verify=verify)
+
+
+def load_engine(base_path, manifest=None, verify=True):
+    """Modèle et vectoriseur NumPy (resumes.inference), sans importer scikit-learn."""
+    from .inference import build_engine
+
+    manifest, arrays = _read(base_path, manifest, verify)
+    params = dict(manifest['vectorizer'])
+    params['ngram_range'] = tuple(params['ngram_range'])
+    model, vectorizer = build_engine(arrays, params)
+    return model, vectorizer, manifest
+
+
+def load_bundle(base_path, manifest=None, verify=True):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.naive_bayes import MultinomialNB
+
+    manifest, arrays = _read(base_path, manifest, verify)
+
+    params = dict(manifest['vectorizer'])
+    params['ngram_range'] = tuple(params['ngram_range'])
+    vectorizer = TfidfVectorizer(
+        vocabulary={term: index for index, term in enumerate(arrays['vocabulary'].tolist())},
+        **params
+    )
+    vectorizer.idf_ = arrays['idf']
+
+    model = MultinomialNB()
+    model.classes_ = np.asarray(arrays['classes'])
+    model.class_log_prior_ = arrays['class_log_prior']
+    model.feature_log_prob_ = arrays['feature_log_prob']
+    model.n_features_in_ = arrays['feature_log_prob'].shape[1]
+
+    return model, vectorizer, manifest
@@ -17,9 +17,12 @@ class Category(models.Model):
 
 class Resume(models.Model):
     file = models.FileField(upload_to='resumes/')
+    sha256 = models.CharField(max_length=64, blank=True, default='', db_index=True)
     text_content = models.TextField(blank=True, null=True)
+    text_truncated = models.BooleanField(default=False)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='resumes')
+    skills = models.ManyToManyField('Skill', through='ResumeSkill', related_name='resumes', blank=True)
 
     class Meta:
         ordering = ['-uploaded_at']
@@ -28,19 +31,96 @@ class Resume(models.Model):
         return f"CV de {self.user.username} - {self.uploaded_at}"
 
 
+class Skill(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class ResumeSkill(models.Model):
+    # Index inversé compétence -> CV, alimenté à l'ingestion.
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='resume_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='resume_skills')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['skill', 'resume'], name='unique_skill_resume'),
+        ]
+
+    def __str__(self):
+        return f"CV {self.resume_id} - {self.skill_id}"
+
+
+class ResumeVector(models.Model):
+    # Vecteur TF-IDF creux (indices int32, valeurs float32) calculé à l'ingestion.
+    resume = models.OneToOneField(Resume, on_delete=models.CASCADE, primary_key=True, related_name='vector')
+    model_version = models.CharField(max_length=64, db_index=True)
+    indices = models.BinaryField()
+    values = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f"Vecteur du CV {self.resume_id} ({self.model_version})"
+
+
+class ResumeSignature(models.Model):
+    # Signature MinHash (uint32) du texte, pour la détection des quasi-doublons.
+    resume = models.OneToOneField(Resume, on_delete=models.CASCADE, primary_key=True, related_name='signature')
+    signature = models.BinaryField()
+
+    def __str__(self):
+        return f"Signature du CV {self.resume_id}"
+
+
+class ResumeBucket(models.Model):
+    # Une ligne par bande LSH: deux CV qui partagent une clé sont candidats.
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='lsh_buckets')
+    key = models.BigIntegerField(db_index=True)
+
+    def __str__(self):
+        return f"CV {self.resume_id} - {self.key}"
+
+
 class Classification(models.Model):
     resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='classifications')
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
     confidence_score = models.FloatField()
+    model_version = models.CharField(max_length=64, blank=True, default='', db_index=True)
     classified_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-classified_at']
+        indexes = [
+            # Pagination par curseur des CV d'une catégorie (KeysetPagination)
+            models.Index(fields=['category', '-classified_at', '-id'], name='classification_keyset_idx'),
+        ]
 
     def __str__(self):
         return f"{self.resume} -> {self.category.name} ({self.confidence_score:.2f})"
 
 
+class ClassificationDailyStats(models.Model):
+    # Agrégat par jour et par catégorie, tenu à jour dans la transaction qui
+    # crée, modifie ou supprime la classification (CLASSIFICATION_STATS_ROLLUP).
+    day = models.DateField()
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='daily_stats')
+    count = models.IntegerField(default=0)
+    confidence_sum = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'category'], name='unique_day_category'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} - {self.category_id}: {self.count}"
+
+
 class JobPosting(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -53,3 +133,48 @@ class JobPosting(models.Model):
 
     def __str__(self):
         return self.title
+
+
+class JobPostingVector(models.Model):
+    # Vecteur TF-IDF de l'offre (titre + description), recalculé à chaque enregistrement.
+    posting = models.OneToOneField(JobPosting, on_delete=models.CASCADE, primary_key=True, related_name='vector')
+    model_version = models.CharField(max_length=64, db_index=True)
+    indices = models.BinaryField()
+    values = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Vecteur de l'offre {self.posting_id} ({self.model_version})"
+
+
+class IngestionJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'En attente'),
+        (STATUS_RUNNING, 'En cours'),
+        (STATUS_DONE, 'Terminé'),
+        (STATUS_FAILED, 'Échec'),
+    ]
+
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    stage = models.CharField(max_length=30, blank=True, default='')
+    progress = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    result = models.JSONField(default=dict, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Job {self.id} ({self.status}) - CV {self.resume_id}"
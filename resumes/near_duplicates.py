@@ -0,0 +1,215 @@
+"""
+Détection des quasi-doublons de CV par MinHash et LSH.
+
+Le texte est découpé en shingles (suites de SHINGLE_SIZE mots); la signature
+MinHash (NUM_PERM minimums de hachages) estime la similarité de Jaccard entre
+deux ensembles de shingles. La signature est découpée en BANDS bandes de
+ROWS valeurs: deux CV qui ont une bande identique partagent une clé de bucket
+indexée en base. La recherche des candidats est une requête sur ces clés
+(indépendante du nombre de CV), puis la similarité est estimée sur les
+signatures des seuls candidats.
+
+Avec 16 bandes de 8 lignes, une paire de similarité 0.9 est candidate avec
+une probabilité > 99.9 %, une paire à 0.5 avec une probabilité de 6 %.
+"""
+import hashlib
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count
+
+from .models import ResumeSignature, ResumeBucket
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+
+# Les buckets plus grands (paragraphes types partagés par beaucoup de CV)
+# sont ignorés par le rapport pour éviter une comparaison quadratique.
+MAX_BUCKET_SIZE = 200
+
+WORD = re.compile(r'\w+')
+
+# Hachages universels (a * x + b) mod p, à coefficients fixes pour que les
+# signatures restent comparables entre processus et entre déploiements.
+# Avec p = 2^31 - 1 et a, x < p, le produit tient sur 64 bits sans débordement.
+_PRIME = (1 << 31) - 1
+_random = np.random.RandomState(20240101)
+_A = _random.randint(1, _PRIME, size=NUM_PERM).astype(np.uint64)
+_B = _random.randint(0, _PRIME, size=NUM_PERM).astype(np.uint64)
+
+
+def shingles(text):
+    words = WORD.findall((text or '').lower())
+    if not words:
+        return set()
+    if len(words) < SHINGLE_SIZE:
+        return {' '.join(words)}
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text):
+    """Signature MinHash (NUM_PERM entiers uint32) du texte, ou None s'il est vide."""
+    values = shingles(text)
+    if not values:
+        return None
+
+    hashes = np.fromiter(
+        (zlib.crc32(value.encode('utf-8')) % _PRIME for value in values),
+        dtype=np.uint64, count=len(values)
+    )
+    permuted = (_A[:, None] * hashes[None, :] + _B[:, None]) % np.uint64(_PRIME)
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def band_keys(signature):
+    keys = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(
+            signature[band * ROWS:(band + 1) * ROWS].tobytes(),
+            digest_size=8, person=band.to_bytes(2, 'little')
+        ).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+
+def similarity(signature, other):
+    return float(np.count_nonzero(signature == other)) / NUM_PERM
+
+
+def load_signature(value):
+    return np.frombuffer(value, dtype=np.uint32)
+
+
+def compute_signatures(rows):
+    """
+    Calcule (sans accès à la base) les signatures et clés LSH de plusieurs CV.
+
+    `rows` est une liste de (resume_id, texte); renvoie {resume_id: (signature, clés)}
+    pour les CV dont le texte n'est pas vide.
+    """
+    signatures = {}
+    for resume_id, text in rows:
+        signature = minhash(text)
+        if signature is not None:
+            signatures[resume_id] = (signature, band_keys(signature))
+    return signatures
+
+
+def save_signatures(resume_ids, signatures):
+    """Remplace en base les signatures et buckets des CV `resume_ids`; renvoie le nombre de CV indexés."""
+    with transaction.atomic():
+        ResumeSignature.objects.filter(resume_id__in=resume_ids).delete()
+        ResumeBucket.objects.filter(resume_id__in=resume_ids).delete()
+
+        ResumeSignature.objects.bulk_create([
+            ResumeSignature(resume_id=resume_id, signature=signature.tobytes())
+            for resume_id, (signature, _) in signatures.items()
+        ])
+        ResumeBucket.objects.bulk_create([
+            ResumeBucket(resume_id=resume_id, key=key)
+            for resume_id, (_, keys) in signatures.items()
+            for key in keys
+        ])
+
+    return len(signatures)
+
+
+def store_signatures(rows):
+    """
+    Calcule et enregistre les signatures et buckets LSH de plusieurs CV.
+
+    `rows` est une liste de (resume_id, texte). Renvoie le nombre de CV indexés.
+    """
+    return save_signatures([resume_id for resume_id, _ in rows], compute_signatures(rows))
+
+
+def find_near_duplicates(resume, threshold=0.9, candidates=None):
+    """
+    Renvoie [(resume_id, similarité)] des CV proches, par similarité décroissante.
+
+    `candidates` (queryset de Resume) restreint les CV examinés.
+    """
+    stored = ResumeSignature.objects.filter(resume=resume).values_list('signature', flat=True).first()
+    signature = load_signature(stored) if stored is not None else minhash(resume.text_content)
+    if signature is None:
+        return []
+
+    matching = ResumeBucket.objects.filter(key__in=band_keys(signature)).exclude(resume_id=resume.id)
+    if candidates is not None:
+        matching = matching.filter(resume__in=candidates)
+
+    others = ResumeSignature.objects.filter(
+        resume_id__in=matching.values('resume_id')
+    ).values_list('resume_id', 'signature')
+
+    results = []
+    for other_id, other in others:
+        score = similarity(signature, load_signature(other))
+        if score >= threshold:
+            results.append((other_id, score))
+
+    return sorted(results, key=lambda item: (-item[1], item[0]))
+
+
+def find_clusters(threshold=0.9):
+    """
+    Regroupe les quasi-doublons de toute la base.
+
+    Renvoie une liste de groupes [(resume_ids triés, similarité minimale des paires retenues)].
+    """
+    shared_keys = ResumeBucket.objects.values('key').annotate(
+        size=Count('resume_id')
+    ).filter(size__gt=1, size__lte=MAX_BUCKET_SIZE).values('key')
+
+    buckets = defaultdict(list)
+    for key, resume_id in ResumeBucket.objects.filter(key__in=shared_keys).values_list('key', 'resume_id'):
+        buckets[key].append(resume_id)
+
+    pairs = set()
+    for members in buckets.values():
+        members.sort()
+        for i, first in enumerate(members):
+            for second in members[i + 1:]:
+                pairs.add((first, second))
+
+    involved = sorted({resume_id for pair in pairs for resume_id in pair})
+    signatures = {}
+    for start in range(0, len(involved), 500):
+        rows = ResumeSignature.objects.filter(
+            resume_id__in=involved[start:start + 500]
+        ).values_list('resume_id', 'signature')
+        signatures.update((resume_id, load_signature(value)) for resume_id, value in rows)
+
+    parent = {}
+
+    def root(resume_id):
+        while parent.get(resume_id, resume_id) != resume_id:
+            resume_id = parent[resume_id]
+        return resume_id
+
+    scores = {}
+    for first, second in sorted(pairs):
+        if first not in signatures or second not in signatures:
+            continue
+        score = similarity(signatures[first], signatures[second])
+        if score < threshold:
+            continue
+        a, b = root(first), root(second)
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+        scores[(first, second)] = score
+
+    groups = defaultdict(set)
+    lowest = {}
+    for (first, second), score in scores.items():
+        group = root(first)
+        groups[group].update((first, second))
+        lowest[group] = min(score, lowest.get(group, 1.0))
+
+    clusters = [(sorted(members), lowest[group]) for group, members in groups.items()]
+    return sorted(clusters, key=lambda cluster: (-len(cluster[0]), cluster[0]))
@@ -0,0 +1,104 @@
+import base64
+from urllib import parse
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination par curseur sur (date, id), du plus récent au plus ancien.
+
+    Le curseur encode la dernière ligne renvoyée; la page suivante est une
+    requête `WHERE (date, id) < (curseur) ORDER BY date DESC, id DESC LIMIT n`
+    servie par l'index: une page profonde coûte autant que la première. Le
+    total (COUNT sur tout le filtre) n'est calculé que pour la première page,
+    ou sur demande (?include_count=true); ?include_count=false le supprime.
+    """
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    count_query_param = 'include_count'
+    ordering = ('classified_at', 'id')
+
+    invalid_cursor_message = 'Curseur invalide'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, position):
+        value, pk = position
+        raw = f"{value.isoformat()}|{pk}".encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            raw = base64.urlsafe_b64decode(parse.unquote(encoded).encode('ascii')).decode('utf-8')
+            value, pk = raw.rsplit('|', 1)
+            position = parse_datetime(value), int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if position[0] is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        field, tiebreak = self.ordering
+
+        queryset = queryset.order_by(f'-{field}', f'-{tiebreak}')
+        position = self.decode_cursor(request)
+        if position is not None:
+            value, pk = position
+            queryset = queryset.filter(
+                Q(**{f'{field}__lt': value}) | Q(**{field: value, f'{tiebreak}__lt': pk})
+            )
+
+        # Une ligne de plus que la page pour savoir s'il existe une suite.
+        items = list(queryset[:self.page_size + 1])
+        self.next_position = None
+        if len(items) > self.page_size:
+            items = items[:self.page_size]
+            last = items[-1]
+            self.next_position = (getattr(last, field), getattr(last, tiebreak))
+        return items
+
+    def get_count(self, queryset):
+        """Nombre total de résultats (première page ou sur demande), sinon None."""
+        value = self.request.query_params.get(self.count_query_param)
+        if value is None:
+            wanted = not self.request.query_params.get(self.cursor_query_param)
+        else:
+            wanted = value.lower() in ('1', 'true', 'yes')
+        return queryset.count() if wanted else None
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_first_link(self):
+        return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'page_count': len(data),
+            'results': data
+        })
@@ -0,0 +1,285 @@
+"""
+Traitement des CV hors requête: extraction, classification, compétences.
+
+Utilisé par le worker `manage.py process_resume_jobs` (file d'attente en base,
+sans broker externe) et par les vues pour l'enregistrement des classifications.
+"""
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Resume, Category, Classification, IngestionJob, Skill, ResumeSkill
+from .ml_classifier import cv_classifier
+from .utils import extract_skills
+from .extraction_pool import extract_document
+
+logger = logging.getLogger(__name__)
+
+
+def get_or_create_categories(names):
+    categories = {c.name: c for c in Category.objects.filter(name__in=names)}
+    missing = [name for name in names if name not in categories]
+
+    if missing:
+        Category.objects.bulk_create(
+            [Category(name=name, keywords='') for name in missing],
+            ignore_conflicts=True
+        )
+        for category in Category.objects.filter(name__in=missing):
+            categories[category.name] = category
+        logger.info(f"Nouvelles catégories créées: {', '.join(missing)}")
+
+    return categories
+
+
+def get_or_create_skills(names):
+    skills = {s.name: s for s in Skill.objects.filter(name__in=names)}
+    missing = [name for name in names if name not in skills]
+
+    if missing:
+        Skill.objects.bulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+        for skill in Skill.objects.filter(name__in=missing):
+            skills[skill.name] = skill
+
+    return skills
+
+
+def save_found_skills(found):
+    """Remplace en base les compétences des CV de `found` ({resume_id: [compétences]})."""
+    skills = get_or_create_skills(sorted({name for names in found.values() for name in names}))
+
+    with transaction.atomic():
+        ResumeSkill.objects.filter(resume_id__in=list(found)).delete()
+        ResumeSkill.objects.bulk_create([
+            ResumeSkill(resume_id=resume_id, skill=skills[name])
+            for resume_id, names in found.items()
+            for name in names
+        ])
+
+    return found
+
+
+def index_skills(rows):
+    """
+    Extrait et enregistre les compétences de plusieurs CV.
+
+    `rows` est une liste de (resume_id, texte); les compétences déjà indexées
+    pour ces CV sont remplacées. Renvoie {resume_id: [compétences]}.
+    """
+    return save_found_skills({resume_id: extract_skills(text or '') for resume_id, text in rows})
+
+
+def save_skills(resume):
+    return index_skills([(resume.id, resume.text_content)])[resume.id]
+
+
+def compute_resume_indexes(rows):
+    """
+    Partie CPU de l'indexation (compétences, vecteurs TF-IDF, MinHash), sans
+    accès à la base: les vues asynchrones l'exécutent dans un exécuteur.
+    """
+    from .matching import compute_resume_vectors
+    from .near_duplicates import compute_signatures
+
+    return {
+        'skills': {resume_id: extract_skills(text or '') for resume_id, text in rows},
+        'vectors': compute_resume_vectors(rows),
+        'signatures': compute_signatures(rows),
+    }
+
+
+def save_resume_indexes(rows, indexes):
+    """Partie base de l'indexation: enregistre le résultat de compute_resume_indexes."""
+    from .matching import save_resume_vectors
+    from .near_duplicates import save_signatures
+
+    save_found_skills(indexes['skills'])
+    save_resume_vectors(indexes['vectors'])
+    save_signatures([resume_id for resume_id, _ in rows], indexes['signatures'])
+    return indexes['skills']
+
+
+def index_resumes(resumes):
+    """Met à jour par lots les index de plusieurs CV; renvoie {resume_id: [compétences]}."""
+    rows = [(resume.id, resume.text_content) for resume in resumes]
+    if not rows:
+        return {}
+    return save_resume_indexes(rows, compute_resume_indexes(rows))
+
+
+def index_resume(resume):
+    """Met à jour les index d'un CV (compétences, vecteur TF-IDF, MinHash) et renvoie ses compétences."""
+    return index_resumes([resume])[resume.id]
+
+
+def save_classification(resume, prediction):
+    category = get_or_create_categories([prediction.category])[prediction.category]
+
+    with transaction.atomic():
+        resume.classifications.all().delete()
+        return Classification.objects.create(
+            resume=resume,
+            category=category,
+            confidence_score=prediction.confidence,
+            model_version=prediction.model_version
+        )
+
+
+def find_duplicate(sha256, exclude_id=None):
+    if not sha256:
+        return None
+
+    duplicates = Resume.objects.filter(sha256=sha256).exclude(text_content__isnull=True).exclude(text_content='')
+    if exclude_id is not None:
+        duplicates = duplicates.exclude(id=exclude_id)
+    return duplicates.order_by('uploaded_at').first()
+
+
+def reuse_duplicate(resume, original):
+    resume.text_content = original.text_content
+    resume.text_truncated = original.text_truncated
+    resume.save(update_fields=['text_content', 'text_truncated'])
+    logger.info(f"CV {resume.id} identique au CV {original.id}, texte réutilisé sans extraction")
+
+    if not cv_classifier.is_loaded:
+        return None
+
+    classification = original.classifications.filter(
+        model_version=cv_classifier.version
+    ).select_related('category').first()
+    if classification is None:
+        return None
+
+    with transaction.atomic():
+        resume.classifications.all().delete()
+        return Classification.objects.create(
+            resume=resume,
+            category=classification.category,
+            confidence_score=classification.confidence_score,
+            model_version=classification.model_version
+        )
+
+
+def discard_failed_upload(resume, error):
+    """Supprime un CV dont l'extraction a échoué; renvoie le message d'erreur de l'API."""
+    logger.error(f"Erreur lors de l'extraction du texte: {str(error)}")
+    resume.delete()
+    return f"Impossible d'extraire le texte du fichier PDF/DOCX: {str(error)}"
+
+
+def parse_top_k(value):
+    """Paramètre top_k des vues de classification; ValueError s'il n'est pas un entier positif."""
+    top_k = int(value)
+    if top_k < 0:
+        raise ValueError(value)
+    return top_k
+
+
+def classification_data(classification, prediction, top_k):
+    """Réponse des vues de classification (synchrone et asynchrone)."""
+    from .serializers import ClassificationSerializer
+
+    data = ClassificationSerializer(classification).data
+    if top_k:
+        data['top_categories'] = [{
+            'category': category_name,
+            'probability': round(probability, 4)
+        } for category_name, probability in prediction.top_categories]
+    return data
+
+
+def skills_data(resume, skills):
+    """Réponse des vues de compétences (synchrone et asynchrone)."""
+    return {
+        'resume_id': resume.id,
+        'user': resume.user.username,
+        'skills_found': len(skills),
+        'skills': sorted(skills),
+        'extracted_at': resume.uploaded_at
+    }
+
+
+def claim_next_job():
+    pending = IngestionJob.objects.filter(
+        status=IngestionJob.STATUS_PENDING
+    ).order_by('created_at').values_list('id', flat=True)[:10]
+
+    # UPDATE conditionnel: un seul worker peut passer le job en "running",
+    # même sur SQLite qui ne supporte pas SELECT ... FOR UPDATE SKIP LOCKED.
+    for job_id in pending:
+        claimed = IngestionJob.objects.filter(
+            id=job_id, status=IngestionJob.STATUS_PENDING
+        ).update(
+            status=IngestionJob.STATUS_RUNNING,
+            started_at=timezone.now(),
+            attempts=F('attempts') + 1
+        )
+        if claimed:
+            return IngestionJob.objects.select_related('resume').get(id=job_id)
+
+    return None
+
+
+def requeue_stale_jobs(stale_after):
+    limit = timezone.now() - timedelta(seconds=stale_after)
+    return IngestionJob.objects.filter(
+        status=IngestionJob.STATUS_RUNNING,
+        started_at__lt=limit
+    ).update(status=IngestionJob.STATUS_PENDING, stage='', progress=0)
+
+
+def _set_stage(job, stage, progress):
+    job.stage = stage
+    job.progress = progress
+    job.save(update_fields=['stage', 'progress'])
+
+
+def process_job(job):
+    resume = job.resume
+    result = {}
+
+    try:
+        _set_stage(job, 'extraction', 10)
+        classification = None
+        original = find_duplicate(resume.sha256, exclude_id=resume.id)
+        if original is not None:
+            classification = reuse_duplicate(resume, original)
+            result['duplicate_of'] = original.id
+        else:
+            logger.info(f"Job {job.id}: extraction du texte pour le CV {resume.id}")
+            resume.text_content, resume.text_truncated = extract_document(resume.file.path)
+            resume.save(update_fields=['text_content', 'text_truncated'])
+
+        _set_stage(job, 'classification', 50)
+        if classification is None and resume.text_content and cv_classifier.is_loaded:
+            classification = save_classification(resume, cv_classifier.rank(resume.text_content))
+
+        result['classification'] = None
+        if classification is not None:
+            result['classification'] = {
+                'id': classification.id,
+                'category': classification.category.name,
+                'confidence': round(classification.confidence_score, 4),
+                'model_version': classification.model_version
+            }
+
+        _set_stage(job, 'skills', 80)
+        result['skills'] = sorted(index_resume(resume))
+
+        job.status = IngestionJob.STATUS_DONE
+        job.progress = 100
+        job.error = ''
+        logger.info(f"Job {job.id} terminé pour le CV {resume.id}")
+
+    except Exception as e:
+        logger.error(f"Job {job.id} en échec: {str(e)}")
+        job.status = IngestionJob.STATUS_FAILED
+        job.error = str(e)
+
+    job.result = result
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'progress', 'error', 'result', 'finished_at'])
+    return job
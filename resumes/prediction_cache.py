@@ -0,0 +1,149 @@
+"""
+Cache des probabilités prédites, indexé par (hash du texte normalisé, version du modèle).
+
+Deux backends:
+- 'local': LRU borné en mémoire du processus;
+- 'django': framework de cache Django (partagé entre workers selon le backend
+  configuré dans CACHES, qui gère alors lui-même la taille et l'éviction).
+"""
+import abc
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+DEFAULTS = {
+    'BACKEND': 'local',
+    'MAX_SIZE': 2048,
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 24 * 3600,
+}
+
+WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text):
+    return WHITESPACE.sub(' ', text).strip().lower()
+
+
+class PredictionCache(abc.ABC):
+    """Base des backends: clés, compteurs hits/misses et statistiques."""
+
+    # Nom du backend exposé par stats(), défini par chaque sous-classe
+    backend = None
+
+    def __init__(self, max_size=2048):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text, model_version):
+        digest = hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+        return f"cvclf:{model_version}:{digest}"
+
+    def _count(self, requested, found):
+        with self._lock:
+            self.hits += found
+            self.misses += requested - found
+
+    @abc.abstractmethod
+    def get_many(self, keys):
+        """{clé: valeur} des clés présentes; compte hits et misses."""
+
+    @abc.abstractmethod
+    def set_many(self, values):
+        """Enregistre un dictionnaire {clé: valeur}."""
+
+    @abc.abstractmethod
+    def size(self):
+        """Nombre d'entrées, ou None si le backend ne le connaît pas."""
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            'backend': self.backend,
+            'size': self.size(),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / requests, 4) if requests else 0.0,
+        }
+
+
+class LocalPredictionCache(PredictionCache):
+    backend = 'local'
+
+    def __init__(self, max_size=2048):
+        super().__init__(max_size)
+        self._entries = OrderedDict()
+
+    def get_many(self, keys):
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+        self._count(len(keys), len(found))
+        return found
+
+    def set_many(self, values):
+        with self._lock:
+            for key, value in values.items():
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self):
+        return len(self._entries)
+
+    def __len__(self):
+        return self.size()
+
+
+class DjangoPredictionCache(PredictionCache):
+    backend = 'django'
+
+    def __init__(self, cache_alias='default', timeout=24 * 3600):
+        super().__init__(max_size=None)
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+
+    def get_many(self, keys):
+        found = caches[self.cache_alias].get_many(keys)
+        self._count(len(keys), len(found))
+        return found
+
+    def set_many(self, values):
+        caches[self.cache_alias].set_many(values, timeout=self.timeout)
+
+    def size(self):
+        # Taille et éviction sont gérées par le backend de cache Django
+        return None
+
+
+def build_prediction_cache():
+    config = {**DEFAULTS, **getattr(settings, 'PREDICTION_CACHE', {})}
+
+    if config['BACKEND'] == 'local':
+        return LocalPredictionCache(max_size=config['MAX_SIZE'])
+    if config['BACKEND'] == 'django':
+        return DjangoPredictionCache(
+            cache_alias=config['CACHE_ALIAS'],
+            timeout=config['TIMEOUT']
+        )
+    return None
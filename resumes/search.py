@@ -0,0 +1,187 @@
+"""
+Recherche plein texte dans le texte des CV.
+
+- SQLite: table virtuelle FTS5 `resumes_resume_fts` (contenu externe sur
+  resumes_resume), tenue à jour par des triggers; classement bm25.
+- PostgreSQL: index GIN sur to_tsvector('french', text_content); classement
+  ts_rank, extraits ts_headline.
+
+Les tables et index sont créés par la migration 0010_resume_fulltext_index.
+Sur les autres bases, la recherche retombe sur un filtre icontains.
+"""
+import re
+
+from django.db import connection
+
+FTS_TABLE = 'resumes_resume_fts'
+PG_CONFIG = 'french'
+PG_VECTOR = f"to_tsvector('{PG_CONFIG}', coalesce(r.text_content, ''))"
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_END = '</mark>'
+
+TERM = re.compile(r'\w+\*?')
+
+
+def parse_query(query):
+    """
+    Termes de recherche de l'utilisateur.
+
+    Seuls les mots (et un `*` final pour la recherche par préfixe) sont
+    conservés: la syntaxe propre à FTS5 ou à tsquery n'est pas exposée.
+    """
+    return TERM.findall(query or '')
+
+
+def _sqlite_match(terms):
+    return ' '.join(
+        f'"{term[:-1]}"*' if term.endswith('*') else f'"{term}"' for term in terms
+    )
+
+
+def _postgres_match(terms):
+    return ' & '.join(
+        f"{term[:-1]}:*" if term.endswith('*') else term for term in terms
+    )
+
+
+def matching_ids_sql(query):
+    """(sql, params) d'une sous-requête renvoyant les id des CV correspondants, ou None."""
+    terms = parse_query(query)
+    if not terms:
+        return None
+
+    if connection.vendor == 'sqlite':
+        return f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [_sqlite_match(terms)]
+    if connection.vendor == 'postgresql':
+        return (
+            f"SELECT r.id FROM resumes_resume r WHERE {PG_VECTOR} @@ to_tsquery('{PG_CONFIG}', %s)",
+            [_postgres_match(terms)]
+        )
+    return None
+
+
+class SearchResults:
+    """
+    Résultats paginables (count() et découpage) d'une recherche plein texte.
+
+    Chaque page est une requête LIMIT/OFFSET classée par pertinence; les
+    éléments sont des dict (resume_id, user, score, snippet, uploaded_at).
+    """
+
+    def __init__(self, query, user_id=None):
+        self.terms = parse_query(query)
+        self.user_id = user_id
+        self._count = None
+
+    def _filters(self):
+        sql, params = '', []
+        if self.user_id is not None:
+            sql, params = ' AND r.user_id = %s', [self.user_id]
+        return sql, params
+
+    def _sqlite(self, select, order='', limit=None, offset=0):
+        user_sql, user_params = self._filters()
+        sql = (
+            f"SELECT {select} FROM {FTS_TABLE} "
+            f"JOIN resumes_resume r ON r.id = {FTS_TABLE}.rowid "
+            f"JOIN auth_user u ON u.id = r.user_id "
+            f"WHERE {FTS_TABLE} MATCH %s{user_sql}{order}"
+        )
+        params = [_sqlite_match(self.terms), *user_params]
+        if limit is not None:
+            sql += " LIMIT %s OFFSET %s"
+            params += [limit, offset]
+        return sql, params
+
+    def _postgres(self, select, order='', limit=None, offset=0):
+        user_sql, user_params = self._filters()
+        sql = (
+            f"SELECT {select} FROM resumes_resume r "
+            f"JOIN auth_user u ON u.id = r.user_id, "
+            f"to_tsquery('{PG_CONFIG}', %s) query "
+            f"WHERE {PG_VECTOR} @@ query{user_sql}{order}"
+        )
+        params = [_postgres_match(self.terms), *user_params]
+        if limit is not None:
+            sql += " LIMIT %s OFFSET %s"
+            params += [limit, offset]
+        return sql, params
+
+    def _fetch(self, limit, offset):
+        if connection.vendor == 'sqlite':
+            sql, params = self._sqlite(
+                f"r.id, u.username, -bm25({FTS_TABLE}), "
+                f"snippet({FTS_TABLE}, 0, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', 16), r.uploaded_at",
+                order=f" ORDER BY bm25({FTS_TABLE}), r.id",
+                limit=limit, offset=offset
+            )
+        elif connection.vendor == 'postgresql':
+            sql, params = self._postgres(
+                f"r.id, u.username, ts_rank({PG_VECTOR}, query), "
+                f"ts_headline('{PG_CONFIG}', coalesce(r.text_content, ''), query, "
+                f"'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxWords=20, MinWords=8'), "
+                f"r.uploaded_at",
+                order=f" ORDER BY ts_rank({PG_VECTOR}, query) DESC, r.id",
+                limit=limit, offset=offset
+            )
+        else:
+            return self._fallback()[offset:offset + limit]
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        return [{
+            'resume_id': resume_id,
+            'user': username,
+            'score': round(float(score), 4),
+            'snippet': snippet,
+            'uploaded_at': uploaded_at
+        } for resume_id, username, score, snippet, uploaded_at in rows]
+
+    def _fallback(self):
+        from .models import Resume
+
+        resumes = Resume.objects.select_related('user').order_by('-uploaded_at')
+        if self.user_id is not None:
+            resumes = resumes.filter(user_id=self.user_id)
+        for term in self.terms:
+            resumes = resumes.filter(text_content__icontains=term.rstrip('*'))
+        return [{
+            'resume_id': resume.id,
+            'user': resume.user.username,
+            'score': 0.0,
+            'snippet': (resume.text_content or '')[:200],
+            'uploaded_at': resume.uploaded_at
+        } for resume in resumes]
+
+    def count(self):
+        if self._count is not None:
+            return self._count
+        if not self.terms:
+            self._count = 0
+        elif connection.vendor == 'sqlite':
+            sql, params = self._sqlite('COUNT(*)')
+        elif connection.vendor == 'postgresql':
+            sql, params = self._postgres('COUNT(*)')
+        else:
+            self._count = len(self._fallback())
+
+        if self._count is None:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                self._count = cursor.fetchone()[0]
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        if not self.terms:
+            return []
+        start = item.start or 0
+        stop = item.stop if item.stop is not None else self.count()
+        return self._fetch(max(0, stop - start), start)
@@ -1,5 +1,17 @@
 from rest_framework import serializers
-from .models import Resume, Category, Classification, JobPosting
+from .models import Resume, Category, Classification, JobPosting, IngestionJob
+
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+MAX_RESUME_SIZE = 5 * 1024 * 1024
+
+
+def check_resume_file(name, size):
+    """Message d'erreur si le fichier n'est pas un CV acceptable, sinon None."""
+    if not name.endswith(RESUME_EXTENSIONS):
+        return "Format non supporté"
+    if size > MAX_RESUME_SIZE:
+        return "Fichier trop gros (max 5MB)"
+    return None
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -19,16 +31,19 @@ class ResumeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Resume
-        fields = ['id', 'file', 'text_content', 'uploaded_at', 'user_name', 'classifications']
-        read_only_fields = ['id', 'text_content', 'uploaded_at', 'user_name', 'classifications']
+        fields = [
+            'id', 'file', 'sha256', 'text_content', 'text_truncated',
+            'uploaded_at', 'user_name', 'classifications'
+        ]
+        read_only_fields = [
+            'id', 'sha256', 'text_content', 'text_truncated',
+            'uploaded_at', 'user_name', 'classifications'
+        ]
 
     def validate_file(self, value):
-        if not value.name.endswith(('.pdf', '.docx')):
-            raise serializers.ValidationError("Format non supporté")
-
-        if value.size > 5 * 1024 * 1024:
-            raise serializers.ValidationError("Fichier trop gros (max 5MB)")
-
+        error = check_resume_file(value.name, value.size)
+        if error:
+            raise serializers.ValidationError(error)
         return value
 
     def get_classifications(self, obj):
@@ -46,9 +61,11 @@ class ClassificationSerializer(serializers.ModelSerializer):
         model = Classification
         fields = [
             'id', 'resume_id', 'user_name', 'resume_file',
-            'category', 'category_name', 'confidence_score', 'classified_at'
+            'category', 'category_name', 'confidence_score', 'model_version', 'classified_at'
+        ]
+        read_only_fields = [
+            'id', 'classified_at', 'resume_id', 'user_name', 'resume_file', 'model_version'
         ]
-        read_only_fields = ['id', 'classified_at', 'resume_id', 'user_name', 'resume_file']
 
     def validate_confidence_score(self, value):
         if not (0 <= value <= 1):
@@ -83,6 +100,16 @@ class ResumeListSerializer(serializers.ModelSerializer):
         return obj.classifications.count()
 
 
+class ResumeSkillMatchSerializer(serializers.ModelSerializer):
+    user_name = serializers.CharField(source='user.username', read_only=True)
+    skills = serializers.SlugRelatedField(many=True, read_only=True, slug_field='name')
+
+    class Meta:
+        model = Resume
+        fields = ['id', 'uploaded_at', 'user_name', 'skills']
+        read_only_fields = fields
+
+
 class CategoryDetailSerializer(serializers.ModelSerializer):
     resumes = serializers.SerializerMethodField()
 
@@ -93,3 +120,59 @@ class CategoryDetailSerializer(serializers.ModelSerializer):
     def get_resumes(self, obj):
         classifications = obj.classification_set.select_related('resume')
         return ClassificationSerializer(classifications, many=True).data
+
+
+# Nombre maximal de CV classifiés par appel, par liste d'ids comme par filtres
+MAX_CLASSIFY_BATCH = 10000
+
+
+class ClassifyBatchSerializer(serializers.Serializer):
+    resume_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=MAX_CLASSIFY_BATCH
+    )
+    unclassified = serializers.BooleanField(required=False, default=False)
+    uploaded_after = serializers.DateTimeField(required=False)
+    uploaded_before = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        has_filter = (
+            attrs.get('unclassified')
+            or 'uploaded_after' in attrs
+            or 'uploaded_before' in attrs
+        )
+        if 'resume_ids' not in attrs and not has_filter:
+            raise serializers.ValidationError(
+                "Fournir \"resume_ids\" ou au moins un filtre"
+            )
+        return attrs
+
+
+class BulkUploadSerializer(serializers.Serializer):
+    archive = serializers.FileField()
+
+    def validate_archive(self, value):
+        from .bulk_upload import get_limits
+
+        if not value.name.lower().endswith('.zip'):
+            raise serializers.ValidationError("Archive ZIP attendue")
+
+        max_size = get_limits()['MAX_ARCHIVE_MB']
+        if value.size > max_size * 1024 * 1024:
+            raise serializers.ValidationError(f"Archive trop grosse (max {max_size} Mo)")
+
+        return value
+
+
+class IngestionJobSerializer(serializers.ModelSerializer):
+    resume_id = serializers.IntegerField(source='resume.id', read_only=True)
+
+    class Meta:
+        model = IngestionJob
+        fields = [
+            'id', 'resume_id', 'status', 'stage', 'progress', 'error', 'result',
+            'attempts', 'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,83 @@
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import JobPosting, Classification
+from .stats import rollup_enabled, apply_classifications
+
+
+@receiver(post_save, sender=JobPosting)
+def update_posting_vector(sender, instance, raw=False, **kwargs):
+    from .matching import store_posting_vector
+
+    if raw:
+        # loaddata: pas de chargement du modèle, les vecteurs manquants sont
+        # calculés à la première construction de la matrice des offres.
+        return
+
+    # Recalculé à chaque enregistrement: la mise à jour du vecteur change
+    # l'empreinte de la matrice des offres et l'invalide dans tous les processus.
+    store_posting_vector(instance)
+
+
+@receiver(post_delete, sender=JobPosting)
+def invalidate_posting_matrix(sender, instance, **kwargs):
+    from .matching import posting_matrix
+
+    posting_matrix.invalidate()
+
+
+def remember_rollup_row(sender, instance, raw=False, **kwargs):
+    # Valeurs avant modification (admin, API): retirées de la table d'agrégats
+    # au post_save, pour que la catégorie ou la confiance modifiée y soit reportée.
+    instance._rollup_previous = None
+    if instance.pk is not None and not raw:
+        instance._rollup_previous = Classification.objects.filter(pk=instance.pk).only(
+            'category_id', 'confidence_score', 'classified_at'
+        ).first()
+
+
+def add_to_rollup(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_rollup_previous', None)
+    if created:
+        apply_classifications([instance])
+    elif previous is not None and (
+        (previous.category_id, previous.confidence_score, previous.classified_at)
+        != (instance.category_id, instance.confidence_score, instance.classified_at)
+    ):
+        apply_classifications([previous], sign=-1)
+        apply_classifications([instance])
+
+
+def remove_from_rollup(sender, instance, **kwargs):
+    apply_classifications([instance], sign=-1)
+
+
+ROLLUP_RECEIVERS = [
+    (pre_save, remember_rollup_row),
+    (post_save, add_to_rollup),
+    (post_delete, remove_from_rollup),
+]
+
+
+def connect_rollup_receivers():
+    """
+    Connecte les récepteurs de la table d'agrégats seulement si elle est activée:
+    un récepteur post_delete sur Classification désactive la suppression rapide
+    de Django (chaque ligne serait chargée, y compris en cascade depuis Resume).
+    """
+    for signal, receiver_function in ROLLUP_RECEIVERS:
+        uid = f'resumes.rollup.{receiver_function.__name__}'
+        if rollup_enabled():
+            signal.connect(receiver_function, sender=Classification, dispatch_uid=uid)
+        else:
+            signal.disconnect(sender=Classification, dispatch_uid=uid)
+
+
+@receiver(setting_changed)
+def rollup_setting_changed(setting, **kwargs):
+    if setting == 'CLASSIFICATION_STATS_ROLLUP':
+        connect_rollup_receivers()
+
+
+connect_rollup_receivers()
@@ -0,0 +1,109 @@
+"""
+Détection des compétences dans le texte d'un CV.
+
+La taxonomie (nom canonique -> alias) est compilée une seule fois en un
+dictionnaire de séquences de tokens. Le texte est découpé en tokens en une
+passe, puis chaque position est testée contre les n-grammes de longueur
+maximale à minimale: le coût dépend de la longueur du texte et de l'alias le
+plus long, pas du nombre de compétences.
+"""
+import re
+from functools import lru_cache
+
+
+# Nom canonique -> alias supplémentaires (le nom canonique est toujours reconnu).
+DEFAULT_TAXONOMY = {
+    'Python': [],
+    'Java': [],
+    'JavaScript': ['js', 'ecmascript'],
+    'C++': ['cpp'],
+    'C#': ['csharp', 'c sharp'],
+    'PHP': [],
+    'Ruby': [],
+    'Go': ['golang'],
+    'Swift': [],
+    'Django': [],
+    'Flask': [],
+    'React': ['react.js', 'reactjs'],
+    'Angular': ['angularjs', 'angular.js'],
+    'Vue': ['vue.js', 'vuejs'],
+    'Spring': ['spring boot'],
+    'Laravel': [],
+    'SQL': [],
+    'MySQL': [],
+    'PostgreSQL': ['postgres', 'psql'],
+    'MongoDB': ['mongo'],
+    'Oracle': [],
+    'Redis': [],
+    'Git': [],
+    'Docker': [],
+    'Kubernetes': ['k8s'],
+    'AWS': ['amazon web services'],
+    'Azure': ['microsoft azure'],
+    'Jenkins': [],
+    'Machine Learning': ['apprentissage automatique'],
+    'Deep Learning': ['apprentissage profond'],
+    'TensorFlow': [],
+    'PyTorch': [],
+    'Pandas': [],
+    'NumPy': [],
+    'Excel': [],
+    'PowerBI': ['power bi'],
+    'Tableau': [],
+    'SEO': [],
+    'Marketing': [],
+    'Agile': [],
+    'Scrum': [],
+}
+
+# Un token commence par un caractère de mot et peut contenir + et # (C++, C#)
+# ainsi que des points internes (vue.js); la ponctuation finale est ignorée.
+TOKEN = re.compile(r'\w[\w+#]*(?:\.\w+)*')
+
+
+def tokenize(text):
+    return TOKEN.findall(text.lower())
+
+
+class SkillMatcher:
+
+    def __init__(self, taxonomy=None):
+        taxonomy = DEFAULT_TAXONOMY if taxonomy is None else taxonomy
+        self.patterns = {}
+
+        for skill, aliases in taxonomy.items():
+            for alias in [skill, *aliases]:
+                tokens = tuple(tokenize(alias))
+                if tokens:
+                    self.patterns[tokens] = skill
+
+        self.max_tokens = max((len(tokens) for tokens in self.patterns), default=0)
+        self.skills = sorted(set(self.patterns.values()))
+
+    def canonical(self, name):
+        """Nom canonique d'une compétence ou d'un alias, None si inconnu."""
+        return self.patterns.get(tuple(tokenize(name)))
+
+    def find(self, text):
+        """Renvoie les compétences trouvées, dans l'ordre de première apparition."""
+        tokens = tokenize(text or '')
+        found = {}
+        i = 0
+
+        while i < len(tokens):
+            # Correspondance la plus longue d'abord: "machine learning" avant "machine".
+            for size in range(min(self.max_tokens, len(tokens) - i), 0, -1):
+                skill = self.patterns.get(tuple(tokens[i:i + size]))
+                if skill is not None:
+                    found.setdefault(skill, None)
+                    i += size
+                    break
+            else:
+                i += 1
+
+        return list(found)
+
+
+@lru_cache(maxsize=1)
+def get_skill_matcher():
+    return SkillMatcher()
@@ -0,0 +1,107 @@
+"""
+Statistiques des classifications.
+
+Deux sources, même format de réponse:
+- agrégation groupée sur Classification (une seule requête);
+- table ClassificationDailyStats (CLASSIFICATION_STATS_ROLLUP = True): compteurs
+  par jour et par catégorie, mis à jour à chaque création, modification
+  (save()) ou suppression d'une classification; une lecture coûte
+  O(catégories x jours). Les QuerySet.update() ne sont pas suivis: relancer
+  `manage.py rebuild_classification_stats` après une mise à jour en masse.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Classification, ClassificationDailyStats
+
+
+def rollup_enabled():
+    return getattr(settings, 'CLASSIFICATION_STATS_ROLLUP', False)
+
+
+def _day(value):
+    return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+
+
+def apply_classifications(classifications, sign=1):
+    """Ajoute (sign=1) ou retire (sign=-1) des classifications de la table d'agrégats."""
+    deltas = defaultdict(lambda: [0, 0.0])
+    for classification in classifications:
+        classified_at = classification.classified_at or timezone.now()
+        delta = deltas[(_day(classified_at), classification.category_id)]
+        delta[0] += sign
+        delta[1] += sign * classification.confidence_score
+
+    with transaction.atomic():
+        for (day, category_id), (count, confidence_sum) in sorted(deltas.items()):
+            stats, created = ClassificationDailyStats.objects.get_or_create(
+                day=day, category_id=category_id,
+                defaults={'count': count, 'confidence_sum': confidence_sum}
+            )
+            if not created:
+                ClassificationDailyStats.objects.filter(id=stats.id).update(
+                    count=F('count') + count,
+                    confidence_sum=F('confidence_sum') + confidence_sum
+                )
+
+
+def rebuild_rollup():
+    """Recalcule toute la table d'agrégats depuis les classifications."""
+    rows = Classification.objects.annotate(
+        day=TruncDate('classified_at')
+    ).values('day', 'category_id').annotate(
+        count=Count('id'), confidence_sum=Sum('confidence_score')
+    ).order_by()
+
+    with transaction.atomic():
+        ClassificationDailyStats.objects.all().delete()
+        ClassificationDailyStats.objects.bulk_create([
+            ClassificationDailyStats(
+                day=row['day'], category_id=row['category_id'],
+                count=row['count'], confidence_sum=row['confidence_sum']
+            )
+            for row in rows
+        ])
+    return len(rows)
+
+
+def _summary(groups):
+    total = sum(count for _, count, _ in groups)
+    confidence_sum = sum(confidence for _, _, confidence in groups)
+    return {
+        'total_classifications': total,
+        'average_confidence': round(confidence_sum / total, 4) if total else 0,
+        'categories_distribution': {
+            name: count for name, count, _ in sorted(groups) if count > 0
+        }
+    }
+
+
+def live_stats(classifications, date_from=None, date_to=None):
+    if date_from:
+        classifications = classifications.filter(classified_at__date__gte=date_from)
+    if date_to:
+        classifications = classifications.filter(classified_at__date__lte=date_to)
+
+    groups = classifications.values('category__name').annotate(
+        count=Count('id'), confidence_sum=Sum('confidence_score')
+    ).order_by()
+    return _summary([(g['category__name'], g['count'], g['confidence_sum']) for g in groups])
+
+
+def rollup_stats(date_from=None, date_to=None):
+    rows = ClassificationDailyStats.objects.all()
+    if date_from:
+        rows = rows.filter(day__gte=date_from)
+    if date_to:
+        rows = rows.filter(day__lte=date_to)
+
+    groups = rows.values('category__name').annotate(
+        count=Sum('count'), confidence_sum=Sum('confidence_sum')
+    ).order_by()
+    return _summary([(g['category__name'], g['count'], g['confidence_sum']) for g in groups])
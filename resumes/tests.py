@@ -1,14 +1,38 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.core.management import call_command
 from django.contrib.auth.models import User
+from django.utils import timezone
 from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from unittest.mock import patch, MagicMock
 import tempfile
 import os
+from datetime import timedelta
+from io import StringIO
 
-from .models import Resume, Category, Classification, JobPosting
+from .models import Resume, Category, Classification, JobPosting, IngestionJob, Skill, ResumeSkill
 from .serializers import ResumeSerializer, CategorySerializer, ClassificationSerializer
+from .ml_classifier import Prediction
+from .warmup import WARMUP_TEXT
+
+
+TRAINING_TEXTS = [
+    "python django flask developer", "java spring developer backend",
+    "audit accounting finance balance", "tax accounting audit ledger",
+]
+TRAINING_LABELS = ["IT", "IT", "ACCOUNTANT", "ACCOUNTANT"]
+
+
+def save_test_bundle(base_path, texts=TRAINING_TEXTS, labels=TRAINING_LABELS):
+    """Entraîne un petit modèle et l'enregistre comme bundle dans base_path"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.naive_bayes import MultinomialNB
+    from .model_bundle import save_bundle
+
+    vectorizer = TfidfVectorizer(stop_words='english', strip_accents='unicode')
+    model = MultinomialNB().fit(vectorizer.fit_transform(texts), labels)
+    return save_bundle(model, vectorizer, base_path)
 
 
 class CategoryModelTest(TestCase):
@@ -299,12 +323,36 @@ class ResumeClassifyAPITest(APITestCase):
     def test_classify_resume_success(self, mock_classifier):
         """Test de classification réussie"""
         mock_classifier.is_loaded = True
-        mock_classifier.predict.return_value = ("Python Developer", 0.92)
+        mock_classifier.rank.return_value = Prediction("Python Developer", 0.92, [], "v1")
 
         response = self.client.post(f'/api/resumes/{self.resume.id}/classify/')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['category_name'], "Python Developer")
         self.assertAlmostEqual(response.data['confidence_score'], 0.92, places=2)
+        self.assertEqual(response.data['model_version'], "v1")
+        self.assertNotIn('top_categories', response.data)
+
+    @patch('resumes.views.cv_classifier')
+    def test_classify_resume_top_k(self, mock_classifier):
+        """Test de classification avec les catégories suivantes"""
+        mock_classifier.is_loaded = True
+        mock_classifier.rank.return_value = Prediction(
+            "Python Developer", 0.7,
+            [("Python Developer", 0.7), ("Data Science", 0.2)]
+        )
+
+        response = self.client.post(f'/api/resumes/{self.resume.id}/classify/?top_k=2')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        mock_classifier.rank.assert_called_once_with(self.resume.text_content, top_k=2)
+        self.assertEqual(
+            [c['category'] for c in response.data['top_categories']],
+            ["Python Developer", "Data Science"]
+        )
+
+    def test_classify_resume_invalid_top_k(self):
+        """Test de classification avec un top_k invalide"""
+        response = self.client.post(f'/api/resumes/{self.resume.id}/classify/?top_k=abc')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
     def test_classify_resume_no_text(self):
         """Test de classification sans texte extrait"""
@@ -321,6 +369,1846 @@ class ResumeClassifyAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
 
 
+class ResumeClassifyBatchAPITest(APITestCase):
+    """Tests pour la classification par lot"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            username='otheruser',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.python_resume = Resume.objects.create(
+            user=self.user,
+            text_content="Python developer with Django experience"
+        )
+        self.accountant_resume = Resume.objects.create(
+            user=self.user,
+            text_content="Accountant with audit experience"
+        )
+        self.empty_resume = Resume.objects.create(user=self.user, text_content="")
+        self.other_resume = Resume.objects.create(
+            user=self.other_user,
+            text_content="Other user resume"
+        )
+
+    @patch('resumes.views.cv_classifier')
+    def test_classify_batch_success(self, mock_classifier):
+        """Test de classification d'un lot de CV en un seul appel"""
+        mock_classifier.is_loaded = True
+        mock_classifier.rank_many.return_value = [
+            Prediction("INFORMATION-TECHNOLOGY", 0.91, [], "v1"),
+            Prediction("ACCOUNTANT", 0.84, [], "v1"),
+        ]
+
+        response = self.client.post('/api/resumes/classify-batch/', {
+            'resume_ids': [
+                self.python_resume.id, self.accountant_resume.id,
+                self.empty_resume.id, self.other_resume.id
+            ]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['classified'], 2)
+        self.assertEqual(response.data['missing_text'], [self.empty_resume.id])
+        self.assertEqual(response.data['not_found'], [self.other_resume.id])
+        mock_classifier.rank_many.assert_called_once()
+        classification = self.accountant_resume.classifications.get()
+        self.assertEqual(classification.category.name, "ACCOUNTANT")
+        self.assertEqual(classification.model_version, "v1")
+        self.assertFalse(self.other_resume.classifications.exists())
+
+    @patch('resumes.views.cv_classifier')
+    def test_classify_batch_replaces_previous_classification(self, mock_classifier):
+        """Test que la classification par lot remplace l'ancienne"""
+        mock_classifier.is_loaded = True
+        mock_classifier.rank_many.return_value = [Prediction("INFORMATION-TECHNOLOGY", 0.9, [])]
+        old_category = Category.objects.create(name="OLD", keywords="")
+        Classification.objects.create(
+            resume=self.python_resume, category=old_category, confidence_score=0.5
+        )
+
+        response = self.client.post('/api/resumes/classify-batch/', {
+            'resume_ids': [self.python_resume.id]
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.python_resume.classifications.count(), 1)
+
+    @patch('resumes.views.cv_classifier')
+    def test_classify_batch_unclassified_filter(self, mock_classifier):
+        """Test du filtre sur les CV non classifiés"""
+        mock_classifier.is_loaded = True
+        mock_classifier.rank_many.return_value = [Prediction("ACCOUNTANT", 0.8, [])]
+        category = Category.objects.create(name="INFORMATION-TECHNOLOGY", keywords="")
+        Classification.objects.create(
+            resume=self.python_resume, category=category, confidence_score=0.9
+        )
+
+        response = self.client.post('/api/resumes/classify-batch/', {
+            'unclassified': True
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['results'][0]['resume_id'], self.accountant_resume.id)
+
+    @patch('resumes.views.CLASSIFY_CHUNK_SIZE', 1)
+    @patch('resumes.views.MAX_CLASSIFY_BATCH', 2)
+    @patch('resumes.views.cv_classifier')
+    def test_classify_batch_filter_mode_is_capped(self, mock_classifier):
+        """Test que le mode filtres est plafonné et lit les textes par tranches"""
+        mock_classifier.is_loaded = True
+        mock_classifier.rank_many.side_effect = lambda texts: [Prediction("ACCOUNTANT", 0.8, [])] * len(texts)
+        Resume.objects.create(user=self.user, text_content="Third resume")
+
+        response = self.client.post('/api/resumes/classify-batch/', {'unclassified': True}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(response.data['truncated'])
+        self.assertEqual(
+            [result['resume_id'] for result in response.data['results']],
+            [self.python_resume.id, self.accountant_resume.id]
+        )
+        self.assertEqual(mock_classifier.rank_many.call_count, 2)
+
+        response = self.client.post('/api/resumes/classify-batch/', {'unclassified': True}, format='json')
+        self.assertEqual(response.data['missing_text'], [self.empty_resume.id])
+        self.assertEqual(response.data['classified'], 1)
+        self.assertFalse(response.data['truncated'])
+
+    def test_classify_batch_requires_ids_or_filter(self):
+        """Test de classification par lot sans paramètre"""
+        response = self.client.post('/api/resumes/classify-batch/', {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CVClassifierPredictManyTest(TestCase):
+    """Tests de la prédiction vectorisée du classifieur"""
+
+    def setUp(self):
+        from .ml_classifier import CVClassifier
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        save_test_bundle(self.tmp_dir.name)
+        self.classifier = CVClassifier(base_path=self.tmp_dir.name)
+
+    def test_predict_many_matches_predict(self):
+        """Test que la prédiction par lot donne les mêmes résultats"""
+        texts = ["senior python developer", "audit and tax accounting"]
+        batch = self.classifier.predict_many(texts)
+
+        self.assertEqual(batch, [self.classifier.predict(text) for text in texts])
+        self.assertEqual([category for category, _ in batch], ["IT", "ACCOUNTANT"])
+
+    def test_predict_many_empty(self):
+        """Test de prédiction par lot sans texte"""
+        self.assertEqual(self.classifier.predict_many([]), [])
+
+    def test_rank_single_pass(self):
+        """Test que le label et le top-k viennent d'un seul predict_proba"""
+        with patch.object(self.classifier.model, 'predict',
+                          side_effect=AssertionError("predict appelé")):
+            prediction = self.classifier.rank("python developer", top_k=2)
+
+        self.assertEqual(prediction.category, "IT")
+        self.assertEqual(prediction.top_categories[0], ("IT", prediction.confidence))
+        self.assertEqual(len(prediction.top_categories), 2)
+        self.assertAlmostEqual(sum(p for _, p in prediction.top_categories), 1.0)
+
+    def test_rank_top_k_bounded_by_classes(self):
+        """Test que top_k est borné par le nombre de catégories"""
+        prediction = self.classifier.rank("audit", top_k=10)
+        self.assertEqual(len(prediction.top_categories), 2)
+
+
+class InferenceBatcherTest(TestCase):
+    """Tests du regroupement des inférences concurrentes"""
+
+    def setUp(self):
+        from .ml_classifier import CVClassifier
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        save_test_bundle(self.tmp_dir.name)
+        self.classifier = CVClassifier(base_path=self.tmp_dir.name)
+
+    def batcher(self, **kwargs):
+        from .inference_batcher import InferenceBatcher
+        return InferenceBatcher(self.classifier, **kwargs)
+
+    def test_concurrent_calls_share_one_batch(self):
+        """Test que des appels simultanés sont classés en un seul passage du modèle"""
+        texts = ["senior python developer", "audit and tax accounting", "java developer"]
+        batcher = self.batcher(max_batch_size=8, max_wait_ms=500)
+
+        with patch.object(self.classifier, '_predict_proba', wraps=self.classifier._predict_proba) as proba:
+            # Appels arrivés pendant que le thread est occupé: ils attendent ensemble dans la file
+            with patch.object(batcher, '_ensure_worker'):
+                futures = [batcher.submit(text, top_k=k) for k, text in enumerate(texts)]
+            batcher._ensure_worker()
+            predictions = [future.result(timeout=5) for future in futures]
+
+        self.assertEqual(proba.call_count, 1)
+        self.assertEqual([p.category for p in predictions], ["IT", "ACCOUNTANT", "IT"])
+        self.assertEqual([len(p.top_categories) for p in predictions], [0, 1, 2])
+        self.assertEqual(predictions[2], self.classifier.rank_many([texts[2]], top_k=2)[0])
+
+        stats = batcher.stats()
+        self.assertEqual((stats['requests'], stats['batches'], stats['largest_batch']), (3, 1, 3))
+        self.assertEqual(stats['batch_sizes'], {3: 1})
+        self.assertEqual(stats['queue_depth'], 0)
+
+    def test_lone_call_not_delayed(self):
+        """Test qu'un appel seul part sans attendre MAX_WAIT_MS"""
+        import time
+
+        batcher = self.batcher(max_wait_ms=2000)
+        started = time.monotonic()
+        self.assertEqual(batcher.rank("audit and tax accounting").category, "ACCOUNTANT")
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(batcher.stats()['batch_sizes'], {1: 1})
+
+    def test_batch_size_is_bounded(self):
+        batcher = self.batcher(max_batch_size=2, max_wait_ms=100)
+        futures = [batcher.submit("python developer") for _ in range(5)]
+        for future in futures:
+            future.result(timeout=5)
+
+        stats = batcher.stats()
+        self.assertEqual(stats['requests'], 5)
+        self.assertLessEqual(stats['largest_batch'], 2)
+        self.assertGreaterEqual(stats['batches'], 3)
+
+    def test_errors_reach_every_caller(self):
+        batcher = self.batcher(max_wait_ms=100)
+        with patch.object(self.classifier, 'rank_many', side_effect=Exception("Modèle non chargé")):
+            futures = [batcher.submit("python"), batcher.submit("audit")]
+            for future in futures:
+                with self.assertRaisesMessage(Exception, "Modèle non chargé"):
+                    future.result(timeout=5)
+
+    def test_disabled_by_default(self):
+        """Test que le regroupement est désactivé par défaut (moteur NumPy)"""
+        from django.conf import settings
+
+        self.assertFalse(settings.INFERENCE_BATCHING['ENABLED'])
+        self.assertIsNone(self.classifier.batcher)
+
+    @override_settings(INFERENCE_BATCHING={'ENABLED': True, 'MAX_BATCH_SIZE': 16})
+    def test_enabled(self):
+        from .ml_classifier import CVClassifier
+
+        classifier = CVClassifier(base_path=self.tmp_dir.name)
+        self.assertEqual(classifier.batcher.max_batch_size, 16)
+        self.assertEqual(classifier.rank("audit").category, "ACCOUNTANT")
+
+    @override_settings(INFERENCE_BATCHING={'ENABLED': False})
+    def test_disabled(self):
+        from .ml_classifier import CVClassifier
+
+        classifier = CVClassifier(base_path=self.tmp_dir.name)
+        self.assertIsNone(classifier.batcher)
+        self.assertEqual(classifier.rank("audit").category, "ACCOUNTANT")
+
+
+class ModelBundleTest(TestCase):
+    """Tests du bundle versionné du modèle"""
+
+    def setUp(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.naive_bayes import MultinomialNB
+
+        self.vectorizer = TfidfVectorizer(stop_words='english', strip_accents='unicode')
+        self.model = MultinomialNB().fit(
+            self.vectorizer.fit_transform(TRAINING_TEXTS), TRAINING_LABELS
+        )
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_classifier_loads_bundle(self):
+        """Test que le classifieur charge le bundle en mmap"""
+        import numpy as np
+        from .model_bundle import save_bundle
+        from .ml_classifier import CVClassifier
+
+        manifest = save_bundle(self.model, self.vectorizer, self.tmp_dir.name)
+        classifier = CVClassifier(base_path=self.tmp_dir.name)
+
+        self.assertTrue(classifier.is_loaded)
+        self.assertEqual(classifier.version, manifest['version'])
+        self.assertIsNotNone(classifier.load_seconds)
+        self.assertIsInstance(classifier.model.feature_log_prob_, np.memmap)
+
+        text = "senior python developer and tax audit"
+        expected = self.model.predict_proba(self.vectorizer.transform([text]))[0]
+        prediction = classifier.rank(text, top_k=2)
+        self.assertAlmostEqual(prediction.confidence, expected.max())
+
+    def test_corrupted_bundle_rejected(self):
+        """Test qu'un bundle corrompu est refusé"""
+        from .model_bundle import save_bundle, load_bundle, BundleError
+
+        manifest = save_bundle(self.model, self.vectorizer, self.tmp_dir.name)
+        path = os.path.join(self.tmp_dir.name, manifest['path'], 'idf.npy')
+        with open(path, 'r+b') as f:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)[0]
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last ^ 0xFF]))
+
+        with self.assertRaises(BundleError):
+            load_bundle(self.tmp_dir.name)
+
+    def test_classifier_without_model(self):
+        """Test du classifieur sans modèle disponible"""
+        from .ml_classifier import CVClassifier
+
+        classifier = CVClassifier(base_path=self.tmp_dir.name)
+        self.assertFalse(classifier.is_loaded)
+        self.assertIsNone(classifier.version)
+
+
+class NumpyInferenceEngineTest(TestCase):
+    """Tests de parité du moteur NumPy avec scikit-learn"""
+
+    CORPUS = [
+        "Senior Python/Django developer, 5 years of REST APIs and PostgreSQL",
+        "Développeur Java Spring, expérience en éléments réseau et sécurité",
+        "Audit, tax accounting and ledger reconciliation for a finance team",
+        "Comptable: bilan, fiscalité, audit interne et contrôle de gestion",
+        "Registered nurse with hospital and patient care experience",
+        "Graphic designer: Photoshop, Illustrator and brand identity",
+    ]
+    LABELS = ["IT", "IT", "ACCOUNTANT", "ACCOUNTANT", "HEALTHCARE", "DESIGNER"]
+    QUERIES = CORPUS + [
+        "", "!!!", "python python python audit", "ÉLÉMENTS RÉSEAU sécurité",
+        "nurse designer developer accounting", "mots totalement inconnus",
+    ]
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def train(self, **params):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.naive_bayes import MultinomialNB
+
+        vectorizer = TfidfVectorizer(**params)
+        model = MultinomialNB(alpha=0.5).fit(vectorizer.fit_transform(self.CORPUS), self.LABELS)
+        return model, vectorizer
+
+    def engine(self, model, vectorizer, precision='float64'):
+        from .model_bundle import save_bundle, load_engine
+
+        path = tempfile.mkdtemp(dir=self.tmp_dir.name)
+        save_bundle(model, vectorizer, path, precision=precision)
+        engine_model, engine_vectorizer, manifest = load_engine(path)
+        self.assertEqual(manifest['precision'], precision)
+        return engine_model, engine_vectorizer
+
+    def test_parity_with_sklearn(self):
+        """Test que le moteur NumPy reproduit TfidfVectorizer + MultinomialNB"""
+        import numpy as np
+
+        for params in (
+            {'stop_words': 'english', 'strip_accents': 'unicode'},
+            {'ngram_range': (1, 2), 'stop_words': 'english', 'sublinear_tf': True},
+            {'strip_accents': 'ascii', 'lowercase': False, 'binary': True, 'norm': 'l1'},
+        ):
+            with self.subTest(params=params):
+                model, vectorizer = self.train(**params)
+                engine_model, engine_vectorizer = self.engine(model, vectorizer)
+
+                expected_X = vectorizer.transform(self.QUERIES)
+                X = engine_vectorizer.transform(self.QUERIES)
+                np.testing.assert_array_equal(X.indptr, expected_X.indptr)
+                np.testing.assert_array_equal(X.indices, expected_X.indices)
+                np.testing.assert_allclose(X.data, expected_X.data, rtol=1e-12)
+
+                np.testing.assert_array_equal(engine_model.predict(X), model.predict(expected_X))
+                np.testing.assert_allclose(
+                    engine_model.predict_proba(X), model.predict_proba(expected_X), rtol=1e-12, atol=1e-15
+                )
+
+    def test_reduced_precision(self):
+        """Test des bundles float32 et float16"""
+        import numpy as np
+
+        model, vectorizer = self.train(stop_words='english', strip_accents='unicode')
+        expected = model.predict_proba(vectorizer.transform(self.QUERIES))
+
+        for precision, tolerance in (('float32', 1e-5), ('float16', 1e-2)):
+            with self.subTest(precision=precision):
+                engine_model, engine_vectorizer = self.engine(model, vectorizer, precision)
+                probabilities = engine_model.predict_proba(engine_vectorizer.transform(self.QUERIES))
+                np.testing.assert_allclose(probabilities, expected, atol=tolerance)
+                np.testing.assert_array_equal(probabilities.argmax(axis=1), expected.argmax(axis=1))
+
+    def test_reduced_precision_stays_mapped(self):
+        """Test que les poids float16 ne sont pas recopiés en float32: ils restent en mmap"""
+        import numpy as np
+
+        model, vectorizer = self.train(stop_words='english', strip_accents='unicode')
+        engine_model, engine_vectorizer = self.engine(model, vectorizer, 'float16')
+        self.assertIsInstance(engine_model.feature_log_prob_, np.memmap)
+        self.assertIsInstance(engine_vectorizer.idf_, np.memmap)
+        self.assertEqual(engine_model.predict_proba(engine_vectorizer.transform(self.QUERIES)).dtype, np.float32)
+
+    def test_serving_does_not_import_sklearn(self):
+        """Test qu'un worker qui charge le bundle n'importe ni scikit-learn ni scipy"""
+        import subprocess
+        import sys
+        from django.conf import settings
+
+        model, vectorizer = self.train(stop_words='english', strip_accents='unicode')
+        from .model_bundle import save_bundle
+        save_bundle(model, vectorizer, self.tmp_dir.name, precision='float32')
+
+        code = (
+            "import sys; sys.path.insert(0, %r)\n"
+            "from resumes.model_bundle import load_engine\n"
+            "model, vectorizer, _ = load_engine(%r)\n"
+            "print(model.predict(vectorizer.transform(['registered nurse']))[0])\n"
+            "print('sklearn' in sys.modules, 'scipy' in sys.modules)\n"
+        ) % (str(settings.BASE_DIR), self.tmp_dir.name)
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.split(), ['HEALTHCARE', 'False', 'False'])
+
+
+class ModelReloadTest(TestCase):
+    """Tests du rechargement à chaud du modèle"""
+
+    def setUp(self):
+        from .ml_classifier import CVClassifier
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.first = save_test_bundle(self.tmp_dir.name)
+        self.classifier = CVClassifier(base_path=self.tmp_dir.name)
+
+    def save_second_bundle(self):
+        return save_test_bundle(
+            self.tmp_dir.name,
+            TRAINING_TEXTS + ["marketing seo campaign brand"],
+            TRAINING_LABELS + ["MARKETING"]
+        )
+
+    def test_reload_swaps_version(self):
+        """Test que reload() charge le nouveau bundle"""
+        second = self.save_second_bundle()
+
+        self.assertEqual(self.classifier.reload(), second['version'])
+        prediction = self.classifier.rank("seo marketing campaign")
+        self.assertEqual(prediction.category, "MARKETING")
+        self.assertEqual(prediction.model_version, second['version'])
+
+    def test_in_flight_snapshot_keeps_old_model(self):
+        """Test qu'un instantané pris avant l'échange reste utilisable"""
+        snapshot = self.classifier.snapshot()
+        self.save_second_bundle()
+        self.classifier.reload()
+
+        self.assertEqual(snapshot.version, self.first['version'])
+        self.assertNotIn("MARKETING", list(snapshot.model.classes_))
+        self.assertIn("MARKETING", self.classifier.get_all_categories())
+
+    def test_manifest_watch_triggers_background_reload(self):
+        """Test de la détection d'un nouveau manifeste"""
+        self.classifier.check_interval = 1
+        self.assertFalse(self.classifier.check_for_update())
+
+        second = self.save_second_bundle()
+        self.classifier._next_check = 0
+        with patch.object(self.classifier, 'reload_in_background') as reload_mock:
+            self.assertTrue(self.classifier.check_for_update())
+        reload_mock.assert_called_once()
+
+        self.classifier._safe_reload()
+        self.assertEqual(self.classifier.version, second['version'])
+
+    def test_reload_before_first_load(self):
+        """Test que reload() sur un classifieur jamais chargé ne se bloque pas"""
+        import threading
+
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(version=self.classifier.reload()), daemon=True)
+        thread.start()
+        thread.join(timeout=10)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(result['version'], self.first['version'])
+        self.assertEqual(self.classifier.version, self.first['version'])
+
+    def test_failed_reload_keeps_current_model(self):
+        """Test qu'un bundle invalide ne remplace pas le modèle courant"""
+        self.assertEqual(self.classifier.version, self.first['version'])
+        second = self.save_second_bundle()
+        os.remove(os.path.join(self.tmp_dir.name, second['path'], 'idf.npy'))
+
+        with self.assertRaises(Exception):
+            self.classifier.reload()
+        self.assertEqual(self.classifier.version, self.first['version'])
+
+
+class LazyLoadingTest(TestCase):
+    """Tests du chargement paresseux du modèle et des dépendances lourdes"""
+
+    def test_model_loaded_on_first_use(self):
+        """Test que le modèle n'est lu qu'au premier usage"""
+        from .ml_classifier import CVClassifier
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bundle = save_test_bundle(tmp_dir)
+            classifier = CVClassifier(base_path=tmp_dir)
+            self.assertIsNone(classifier._state)
+
+            self.assertEqual(classifier.rank("python django").model_version, bundle['version'])
+            self.assertTrue(classifier.is_loaded)
+
+    def test_views_import_without_heavy_dependencies(self):
+        """Test que l'import des URLs n'importe ni PyPDF2, ni docx, ni numpy"""
+        import subprocess
+        import sys
+        from django.conf import settings
+
+        code = (
+            "import sys, django; django.setup(); import resumes.urls; "
+            "print(','.join(m for m in ('PyPDF2', 'docx', 'numpy', 'scipy', 'sklearn') if m in sys.modules))"
+        )
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'cvclassifier.settings'}
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=settings.BASE_DIR, env=env,
+            capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), '')
+
+    def test_warm_up_loads_model(self):
+        """Test que le préchauffage charge le modèle et renvoie ses durées"""
+        from .ml_classifier import CVClassifier
+        from .warmup import warm_up
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            save_test_bundle(tmp_dir)
+            classifier = CVClassifier(base_path=tmp_dir)
+            with patch('resumes.warmup.cv_classifier', classifier), \
+                    patch('resumes.warmup.extract_document') as extract, \
+                    patch('resumes.warmup._report', None):
+                timings = warm_up()
+
+            self.assertIsNotNone(classifier._state)
+            self.assertIn('model', timings)
+            self.assertIn('PyPDF2', timings)
+            # Le pool d'extraction n'est pas démarré avant un éventuel fork
+            extract.assert_not_called()
+
+
+class HealthEndpointTest(APITestCase):
+    """Tests des sondes /api/health/live et /api/health/ready"""
+
+    def setUp(self):
+        from .ml_classifier import CVClassifier
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.bundle = save_test_bundle(self.tmp_dir.name)
+        self.classifier = CVClassifier(base_path=self.tmp_dir.name)
+        for target, value in [
+            ('resumes.warmup.cv_classifier', self.classifier),
+            ('resumes.warmup._report', None),
+        ]:
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_live_without_authentication(self):
+        """Test que la sonde de vie répond sans authentification ni slash final"""
+        response = self.client.get('/api/health/live')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'alive')
+
+    def test_ready_warms_model_and_extraction(self):
+        """Test que la sonde de disponibilité préchauffe inférence et extraction"""
+        response = self.client.get('/api/health/ready/')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'ready')
+        model = response.data['model']
+        self.assertEqual(model['version'], self.bundle['version'])
+        self.assertEqual(model['vocabulary_size'], len(self.classifier.vectorizer.vocabulary_))
+        self.assertIsNotNone(model['load_seconds'])
+        self.assertGreaterEqual(model['warmup_ms'], 0)
+        self.assertTrue(response.data['extraction']['ok'])
+
+    def test_ready_result_reused(self):
+        """Test que les sondes suivantes ne refont pas le préchauffage"""
+        with patch('resumes.warmup.extract_document', return_value=(WARMUP_TEXT, False)) as extract:
+            self.client.get('/api/health/ready')
+            response = self.client.get('/api/health/ready')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(extract.call_count, 1)
+
+    def test_not_ready_without_model(self):
+        """Test que la sonde répond 503 tant que le modèle n'est pas chargé"""
+        from .ml_classifier import CVClassifier
+
+        with tempfile.TemporaryDirectory() as empty_dir, \
+                patch('resumes.warmup.cv_classifier', CVClassifier(base_path=empty_dir)):
+            response = self.client.get('/api/health/ready')
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.data['status'], 'not_ready')
+        self.assertFalse(response.data['model']['loaded'])
+        self.assertIn('error', response.data['model'])
+
+    def test_not_ready_when_extraction_fails(self):
+        """Test que la sonde répond 503 si l'extraction de préchauffage échoue"""
+        with patch('resumes.warmup.extract_document', side_effect=ValueError("pool indisponible")):
+            response = self.client.get('/api/health/ready')
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertTrue(response.data['model']['loaded'])
+        self.assertEqual(response.data['extraction']['error'], "pool indisponible")
+
+
+class StreamedTrainingTest(TestCase):
+    """Tests de l'entraînement en flux (manage.py train_classifier)"""
+
+    texts = TRAINING_TEXTS * 3 + ["python react developer frontend", "audit tax finance report"]
+    labels = TRAINING_LABELS * 3 + ["IT", "ACCOUNTANT"]
+
+    def chunked(self, size):
+        rows = list(zip(self.texts, self.labels))
+        return lambda: (rows[i:i + size] for i in range(0, len(rows), size))
+
+    def test_matches_in_memory_fit(self):
+        """Test que l'entraînement par lots donne le même modèle qu'un fit complet"""
+        import numpy as np
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.naive_bayes import MultinomialNB
+        from .training import train
+
+        params = {'max_features': None, 'min_df': 1, 'max_df': 1.0}
+        model, vectorizer, report = train(self.chunked(3), test_size=0, **params)
+
+        reference = TfidfVectorizer(stop_words='english', strip_accents='unicode', **params)
+        X = reference.fit_transform(self.texts)
+        expected = MultinomialNB().fit(X, self.labels)
+
+        self.assertEqual(vectorizer.vocabulary_, reference.vocabulary_)
+        np.testing.assert_allclose(vectorizer.idf_, reference.idf_)
+        np.testing.assert_allclose(model.feature_log_prob_, expected.feature_log_prob_)
+        np.testing.assert_allclose(model.class_log_prior_, expected.class_log_prior_)
+        self.assertEqual(report['documents'], len(self.texts))
+
+    def test_max_features_ties_match_scikit_learn(self):
+        """Test que max_features départage les égalités comme TfidfVectorizer"""
+        import random
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from .training import VocabularyBuilder
+
+        rng = random.Random(3)
+        words = [f"term{i:02d}" for i in range(60)]
+        texts = [' '.join(rng.sample(words, 8)) for _ in range(40)]
+        params = {'max_features': 25, 'min_df': 1, 'max_df': 1.0}
+
+        builder = VocabularyBuilder(**params)
+        for start in range(0, len(texts), 7):
+            builder.update([(text, 'IT') for text in texts[start:start + 7]])
+        reference = TfidfVectorizer(stop_words='english', strip_accents='unicode', **params).fit(texts)
+
+        self.assertEqual(builder.build().vocabulary_, reference.vocabulary_)
+
+    def test_vocabulary_pruning_bounds_tracked_terms(self):
+        """Test que la table des fréquences reste sous la limite de termes suivis"""
+        from .training import VocabularyBuilder
+
+        builder = VocabularyBuilder(max_tracked_terms=5, min_df=1, max_df=1.0)
+        for chunk in self.chunked(2)():
+            builder.update(chunk)
+            self.assertLessEqual(len(builder.document_frequency), 5)
+        self.assertGreater(builder.prune_floor, 0)
+
+    def test_command_from_csv(self):
+        """Test que la commande publie un bundle chargeable depuis un CSV"""
+        import csv
+        from .ml_classifier import CVClassifier
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = os.path.join(tmp_dir, 'Resume.csv')
+            with open(csv_path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['ID', 'Resume_str', 'Category'])
+                for i, (text, label) in enumerate(zip(self.texts, self.labels)):
+                    writer.writerow([i, text, label])
+                writer.writerow([99, '', 'IT'])
+
+            out = StringIO()
+            call_command(
+                'train_classifier', '--csv', csv_path, '--output', tmp_dir,
+                '--chunk-size', '4', '--min-df', '1', stdout=out
+            )
+
+            self.assertIn("Documents d'entraînement", out.getvalue())
+            classifier = CVClassifier(base_path=tmp_dir)
+            self.assertEqual(classifier.rank("python django developer").category, "IT")
+
+    def test_command_from_database(self):
+        """Test que la commande s'entraîne sur les CV classifiés en base"""
+        from .ml_classifier import CVClassifier
+
+        user = User.objects.create_user(username='trainer', password='testpass123')
+        for text, label in zip(self.texts, self.labels):
+            resume = Resume.objects.create(user=user, file='resumes/cv.pdf', text_content=text)
+            category, _ = Category.objects.get_or_create(name=label)
+            Classification.objects.create(resume=resume, category=category, confidence_score=0.9)
+        Resume.objects.create(user=user, file='resumes/cv.pdf', text_content="sans classification")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out = StringIO()
+            call_command(
+                'train_classifier', '--from-db', '--output', tmp_dir, '--test-size', '0',
+                '--min-df', '1', stdout=out
+            )
+
+            self.assertIn(f"Documents d'entraînement: {len(self.texts)}", out.getvalue())
+            classifier = CVClassifier(base_path=tmp_dir)
+            self.assertEqual(classifier.rank("audit tax ledger").category, "ACCOUNTANT")
+
+    def test_missing_csv_column(self):
+        """Test qu'une colonne absente est signalée"""
+        from django.core.management.base import CommandError
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = os.path.join(tmp_dir, 'Resume.csv')
+            with open(csv_path, 'w') as f:
+                f.write("ID,Text\n1,python\n")
+
+            with self.assertRaises(CommandError):
+                call_command('train_classifier', '--csv', csv_path, '--output', tmp_dir, stdout=StringIO())
+
+
+class MLModelAPITest(APITestCase):
+    """Tests de l'API de gestion du modèle"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.staff_user = User.objects.create_user(
+            username='staffuser', password='testpass123', is_staff=True
+        )
+        self.client = APIClient()
+
+    def test_reload_requires_staff(self):
+        """Test que le rechargement est réservé au staff"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post('/api/model/reload/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @patch('resumes.views.cv_classifier')
+    def test_reload_success(self, mock_classifier):
+        """Test du rechargement par le staff"""
+        mock_classifier.version = "v1"
+        mock_classifier.reload.return_value = "v2"
+        self.client.force_authenticate(user=self.staff_user)
+
+        response = self.client.post('/api/model/reload/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['previous_version'], "v1")
+        self.assertEqual(response.data['version'], "v2")
+        self.assertTrue(response.data['reloaded'])
+
+
+class AsyncUploadTest(APITestCase):
+    """Tests de l'upload asynchrone et du worker"""
+
+    def setUp(self):
+        self.media_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_dir.cleanup)
+        media_override = override_settings(MEDIA_ROOT=self.media_dir.name)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.other_user = User.objects.create_user(username='otheruser', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def upload(self, query='?async=true'):
+        cv_file = SimpleUploadedFile("cv.pdf", b"%PDF-1.4 fake", content_type="application/pdf")
+        return self.client.post(f'/api/resumes/{query}', {'file': cv_file}, format='multipart')
+
+    def test_async_upload_returns_job(self):
+        """Test que l'upload asynchrone renvoie 202 sans extraire le texte"""
+        with patch('resumes.views.extract_document') as extract_mock:
+            response = self.upload()
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        extract_mock.assert_not_called()
+        job = IngestionJob.objects.get(id=response.data['job_id'])
+        self.assertEqual(job.status, IngestionJob.STATUS_PENDING)
+        self.assertIn(f'/api/jobs/{job.id}/', response.data['status_url'])
+
+    @patch('resumes.pipeline.cv_classifier')
+    @patch('resumes.pipeline.extract_document', return_value=("Python developer with Docker", False))
+    def test_worker_processes_job(self, extract_mock, mock_classifier):
+        """Test du traitement complet par le worker"""
+        mock_classifier.is_loaded = True
+        mock_classifier.rank.return_value = Prediction("INFORMATION-TECHNOLOGY", 0.9, [], "v1")
+        job_id = self.upload().data['job_id']
+
+        call_command('process_resume_jobs', '--once', stdout=StringIO())
+
+        job = IngestionJob.objects.get(id=job_id)
+        self.assertEqual(job.status, IngestionJob.STATUS_DONE)
+        self.assertEqual(job.progress, 100)
+        self.assertEqual(job.result['classification']['category'], "INFORMATION-TECHNOLOGY")
+        self.assertIn("Python", job.result['skills'])
+        self.assertEqual(job.resume.text_content, "Python developer with Docker")
+        self.assertEqual(job.resume.classifications.get().model_version, "v1")
+
+        response = self.client.get(f'/api/jobs/{job_id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], IngestionJob.STATUS_DONE)
+
+    @patch('resumes.pipeline.extract_document', side_effect=ValueError("PDF illisible"))
+    def test_worker_records_failure(self, extract_mock):
+        """Test qu'un échec d'extraction est reporté dans le job"""
+        job_id = self.upload().data['job_id']
+
+        call_command('process_resume_jobs', '--once', stdout=StringIO())
+
+        job = IngestionJob.objects.get(id=job_id)
+        self.assertEqual(job.status, IngestionJob.STATUS_FAILED)
+        self.assertIn("PDF illisible", job.error)
+
+    def test_job_claimed_once(self):
+        """Test qu'un job ne peut être pris que par un seul worker"""
+        from .pipeline import claim_next_job
+
+        self.upload()
+        self.assertIsNotNone(claim_next_job())
+        self.assertIsNone(claim_next_job())
+
+    def test_job_status_private(self):
+        """Test qu'un utilisateur ne voit pas les jobs des autres"""
+        job_id = self.upload().data['job_id']
+
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.get(f'/api/jobs/{job_id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ExtractionPoolTest(TestCase):
+    """Tests du pool d'extraction isolé"""
+
+    def make_pool(self, **kwargs):
+        from .extraction_pool import ExtractionPool
+
+        pool = ExtractionPool(workers=1, **kwargs)
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    def test_extract_pdf(self):
+        """Test d'extraction d'un vrai PDF dans un worker"""
+        from .utils import extract_document
+
+        path = os.path.join(os.path.dirname(__file__), 'CV-Lora.pdf')
+        pool = self.make_pool(timeout=60)
+        self.assertEqual(pool.extract(path), extract_document(path))
+
+    def test_extraction_error_reported(self):
+        """Test qu'une erreur d'extraction est renvoyée proprement"""
+        from .extraction_pool import ExtractionError
+
+        pool = self.make_pool(timeout=60)
+        results = list(pool.map(['missing.pdf', 'cv.txt']))
+        self.assertTrue(all(isinstance(error, ExtractionError) for _, _, error in results))
+
+    def test_timeout_kills_worker(self):
+        """Test qu'un document trop long est interrompu"""
+        import time
+        from .extraction_pool import ExtractionTimeout
+
+        pool = self.make_pool(timeout=0.5, extractor=time.sleep)
+        with self.assertRaises(ExtractionTimeout):
+            pool.extract(30)
+        self.assertIsNone(pool.extract(0))
+
+    def test_memory_limit(self):
+        """Test qu'un document trop gourmand en mémoire est interrompu"""
+        from .extraction_pool import ExtractionMemoryError
+
+        pool = self.make_pool(timeout=30, max_memory_mb=64, extractor=bytearray)
+        with self.assertRaises(ExtractionMemoryError):
+            pool.extract(2 ** 31)
+        self.assertEqual(len(pool.extract(16)), 16)
+
+    def test_pool_recreated_after_fork(self):
+        """Test qu'un processus issu d'un fork n'utilise pas le pool hérité du parent"""
+        from . import extraction_pool
+
+        with patch.object(extraction_pool, '_pool', None), patch.object(extraction_pool, '_pool_pid', None):
+            parent_pool = extraction_pool.get_extraction_pool()
+            self.addCleanup(parent_pool.shutdown)
+            self.assertIs(extraction_pool.get_extraction_pool(), parent_pool)
+
+            with patch('os.getpid', return_value=os.getpid() + 1):
+                child_pool = extraction_pool.get_extraction_pool()
+                self.addCleanup(child_pool.shutdown)
+                self.assertIsNot(child_pool, parent_pool)
+                self.assertIs(extraction_pool.get_extraction_pool(), child_pool)
+
+    def test_broken_pipe_replaces_worker(self):
+        """Test qu'un tube rompu devient une ExtractionError sans interrompre map()"""
+        import time
+        from .extraction_pool import ExtractionError
+
+        pool = self.make_pool(timeout=30, extractor=time.sleep)
+        pool.extract(0)
+        worker = pool._slots.get()
+        worker.conn.send = MagicMock(side_effect=BrokenPipeError("tube rompu"))
+        pool._slots.put(worker)
+
+        results = list(pool.map([0, 0]))
+
+        self.assertIsInstance(results[0][2], ExtractionError)
+        self.assertEqual(results[1], (0, None, None))
+        self.assertFalse(worker.alive)
+
+
+class BoundedExtractionTest(TestCase):
+    """Tests de l'extraction bornée (pages et caractères)"""
+
+    pdf_path = os.path.join(os.path.dirname(__file__), 'CV-Lora.pdf')
+
+    def test_join_bounded(self):
+        """Test de l'assemblage borné des morceaux de texte"""
+        from .utils import join_bounded
+
+        self.assertEqual(join_bounded(["  Python\n", "", "Django  "]), ("Python Django", False))
+        self.assertEqual(join_bounded(["Python", "Django"], max_chars=13), ("Python Django", False))
+        self.assertEqual(join_bounded(["Python", "Django Flask"], max_chars=16), ("Python Django", True))
+        self.assertEqual(join_bounded(["hello", "world this is a long page"], max_chars=5), ("hello", True))
+        self.assertEqual(join_bounded(["hello", "world"], max_chars=6), ("hello", True))
+
+    def test_pdf_limits(self):
+        """Test que les limites de pages et de caractères tronquent le texte"""
+        from .utils import extract_document
+
+        full_text, truncated = extract_document(self.pdf_path)
+        self.assertFalse(truncated)
+
+        text, truncated = extract_document(self.pdf_path, max_chars=100)
+        self.assertTrue(truncated)
+        self.assertLessEqual(len(text), 100)
+        self.assertTrue(full_text.startswith(text))
+
+        text, truncated = extract_document(self.pdf_path, max_pages=0)
+        self.assertEqual((text, truncated), ("", True))
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ResumeUploadAPITest(APITestCase):
+    """Tests de l'upload synchrone"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def upload(self):
+        cv_file = SimpleUploadedFile("cv.pdf", b"%PDF-1.4 fake", content_type="application/pdf")
+        return self.client.post('/api/resumes/', {'file': cv_file}, format='multipart')
+
+    @patch('resumes.views.extract_document', return_value=("Python developer", False))
+    def test_upload_extracts_text(self, extract_mock):
+        """Test de l'upload avec extraction du texte"""
+        response = self.upload()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Resume.objects.get().text_content, "Python developer")
+        self.assertFalse(Resume.objects.get().text_truncated)
+
+    @patch('resumes.views.extract_document', return_value=("Python", True))
+    def test_upload_records_truncation(self, extract_mock):
+        """Test que la troncature du texte est enregistrée sur le CV"""
+        response = self.upload()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(response.data['text_truncated'])
+
+    def test_upload_extraction_timeout(self):
+        """Test qu'un dépassement de délai donne une erreur de validation"""
+        from .extraction_pool import ExtractionTimeout
+
+        with patch('resumes.views.extract_document',
+                   side_effect=ExtractionTimeout("Délai d'extraction dépassé (30 s)")):
+            response = self.upload()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Délai", str(response.data['error']))
+        self.assertFalse(Resume.objects.exists())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class AsyncResumeViewsTest(TestCase):
+    """Tests des variantes asynchrones (ASGI) de l'upload, de la classification et des compétences"""
+
+    def setUp(self):
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        token = RefreshToken.for_user(self.user).access_token
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+        self.resume = Resume.objects.create(user=self.user, text_content="Python Django developer")
+
+    @patch('resumes.async_views.extract_document_async')
+    def test_upload(self, extract_mock):
+        """Test de l'upload asynchrone"""
+        extract_mock.return_value = ("Python developer", True)
+        cv_file = SimpleUploadedFile("cv.pdf", b"%PDF-1.4 async", content_type="application/pdf")
+
+        response = self.client.post('/api/async/resumes/', {'file': cv_file}, **self.auth)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        resume = Resume.objects.get(id=response.json()['id'])
+        self.assertEqual(resume.text_content, "Python developer")
+        self.assertTrue(response.json()['text_truncated'])
+        self.assertEqual(list(resume.skills.values_list('name', flat=True)), ['Python'])
+
+    @patch('resumes.async_views.extract_document_async')
+    def test_indexing_cpu_work_off_orm_thread(self, extract_mock):
+        """Test que compétences, vecteurs et MinHash sont calculés hors du thread de l'ORM"""
+        import threading
+        from .pipeline import compute_resume_indexes
+
+        extract_mock.return_value = ("Python developer", False)
+        threads = []
+
+        def compute(rows):
+            threads.append(threading.get_ident())
+            return compute_resume_indexes(rows)
+
+        cv_file = SimpleUploadedFile("cv.pdf", b"%PDF-1.4 threads", content_type="application/pdf")
+        with patch('resumes.async_views.compute_resume_indexes', side_effect=compute):
+            response = self.client.post('/api/async/resumes/', {'file': cv_file}, **self.auth)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # Sous le client de test, le thread des appels sync_to_async est le thread courant
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+        self.assertEqual(
+            list(Resume.objects.get(id=response.json()['id']).skills.values_list('name', flat=True)),
+            ['Python']
+        )
+
+    def test_upload_invalid_file(self):
+        cv_file = SimpleUploadedFile("cv.txt", b"texte", content_type="text/plain")
+        response = self.client.post('/api/async/resumes/', {'file': cv_file}, **self.auth)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {'file': ["Format non supporté"]})
+
+    @patch('resumes.async_views.cv_classifier')
+    def test_classify(self, mock_classifier):
+        """Test de la classification asynchrone"""
+        mock_classifier.is_loaded = True
+        mock_classifier.rank.return_value = Prediction(
+            "Python Developer", 0.7, [("Python Developer", 0.7), ("Data Science", 0.2)], "v1"
+        )
+
+        response = self.client.post(f'/api/async/resumes/{self.resume.id}/classify/?top_k=2', **self.auth)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        mock_classifier.rank.assert_called_once_with(self.resume.text_content, top_k=2)
+        self.assertEqual(response.json()['category_name'], "Python Developer")
+        self.assertEqual(len(response.json()['top_categories']), 2)
+        self.assertEqual(self.resume.classifications.get().model_version, "v1")
+
+    def test_skills(self):
+        response = self.client.get(f'/api/async/resumes/{self.resume.id}/extract-skills/', **self.auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['skills'], ['Django', 'Python'])
+
+    def test_authentication_and_ownership(self):
+        response = self.client.get(f'/api/async/resumes/{self.resume.id}/extract-skills/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        other = Resume.objects.create(
+            user=User.objects.create_user(username='other', password='otherpass'), text_content="cv"
+        )
+        response = self.client.get(f'/api/async/resumes/{other.id}/extract-skills/', **self.auth)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get('/api/async/resumes/', **self.auth)
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class BulkUploadAPITest(APITestCase):
+    """Tests de l'import d'archives ZIP"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def archive(self, members):
+        import io
+        import zipfile
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for name, content in members.items():
+                archive.writestr(name, content)
+        return SimpleUploadedFile("cvs.zip", buffer.getvalue(), content_type="application/zip")
+
+    def upload(self, members):
+        return self.client.post(
+            '/api/resumes/bulk-upload/', {'archive': self.archive(members)}, format='multipart'
+        )
+
+    @staticmethod
+    def extracted(paths):
+        for path in paths:
+            if 'broken' in path:
+                from .extraction_pool import ExtractionError
+                yield path, None, ExtractionError("PDF illisible")
+            else:
+                yield path, (f"Python developer {os.path.basename(path)}", False), None
+
+    @patch('resumes.bulk_upload.extract_documents')
+    def test_per_file_report(self, extract_mock):
+        """Test du rapport par fichier et de l'insertion des CV valides"""
+        extract_mock.side_effect = self.extracted
+        response = self.upload({
+            'a/alice.pdf': b'%PDF-1.4 alice',
+            'bob.docx': b'PK docx bob',
+            'notes.txt': b'texte',
+            'broken.pdf': b'%PDF-1.4 broken',
+            '__MACOSX/._alice.pdf': b'meta',
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data['created'], response.data['failed']), (2, 2))
+        report = {entry['file']: entry for entry in response.data['files']}
+        self.assertEqual(set(report), {'a/alice.pdf', 'bob.docx', 'notes.txt', 'broken.pdf'})
+        self.assertEqual(report['notes.txt']['error'], "Format non supporté")
+        self.assertIn("PDF illisible", report['broken.pdf']['error'])
+
+        resume = Resume.objects.get(id=report['a/alice.pdf']['resume_id'])
+        self.assertEqual(resume.user, self.user)
+        self.assertTrue(resume.text_content.startswith("Python developer"))
+        self.assertEqual(len(resume.sha256), 64)
+        self.assertEqual(list(resume.skills.values_list('name', flat=True)), ['Python'])
+        self.assertEqual(Resume.objects.count(), 2)
+
+        # Les fichiers des documents illisibles ne restent pas dans le stockage
+        stored = os.listdir(os.path.dirname(resume.file.path))
+        self.assertFalse([name for name in stored if name.startswith('broken')])
+
+    @patch('resumes.bulk_upload.extract_documents')
+    def test_duplicates_reuse_text(self, extract_mock):
+        """Test qu'un fichier déjà importé n'est pas ré-extrait"""
+        extract_mock.side_effect = self.extracted
+        self.upload({'alice.pdf': b'%PDF-1.4 alice'})
+
+        response = self.upload({'copy.pdf': b'%PDF-1.4 alice'})
+        entry = response.data['files'][0]
+        self.assertEqual(entry['duplicate_of'], Resume.objects.order_by('id').first().id)
+        self.assertEqual(list(extract_mock.call_args[0][0]), [])
+
+    def assert_no_stored_files(self, prefix):
+        from django.conf import settings
+
+        directory = os.path.join(settings.MEDIA_ROOT, 'resumes')
+        stored = os.listdir(directory) if os.path.isdir(directory) else []
+        self.assertFalse([name for name in stored if name.startswith(prefix)])
+
+    @patch('resumes.bulk_upload.index_resumes', side_effect=RuntimeError("index indisponible"))
+    @patch('resumes.bulk_upload.extract_documents')
+    def test_failure_after_storage_removes_files(self, extract_mock, index_mock):
+        """Test qu'un échec à l'insertion ou l'indexation ne laisse ni lignes ni fichiers"""
+        from .bulk_upload import import_archive
+
+        extract_mock.side_effect = self.extracted
+        with self.assertRaises(RuntimeError):
+            import_archive(self.archive({'orphan-a.pdf': b'%PDF-1.4 a', 'orphan-b.docx': b'PK b'}), self.user)
+
+        self.assertEqual(Resume.objects.count(), 0)
+        self.assert_no_stored_files('orphan-')
+
+    @patch('resumes.bulk_upload.extract_documents')
+    def test_unexpected_extraction_error_removes_files(self, extract_mock):
+        """Test qu'une erreur inattendue pendant l'extraction supprime les fichiers copiés"""
+        from .bulk_upload import import_archive
+
+        def failing(paths):
+            raise OSError("pool indisponible")
+            yield
+
+        extract_mock.side_effect = failing
+        with self.assertRaises(OSError):
+            import_archive(self.archive({'stray-a.pdf': b'%PDF-1.4 a'}), self.user)
+
+        self.assertEqual(Resume.objects.count(), 0)
+        self.assert_no_stored_files('stray-')
+
+    @override_settings(RESUME_BULK_UPLOAD={'MAX_MEMBERS': 2})
+    def test_member_count_limit(self):
+        """Test de la limite du nombre de fichiers"""
+        response = self.upload({f'cv{i}.pdf': b'%PDF' for i in range(3)})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Resume.objects.count(), 0)
+
+    @override_settings(RESUME_BULK_UPLOAD={'MAX_TOTAL_SIZE_MB': 1})
+    def test_uncompressed_size_limit(self):
+        """Test qu'une archive très compressée est refusée sur sa taille décompressée"""
+        response = self.upload({'bomb.pdf': b'0' * (2 * 1024 * 1024)})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("décompressée", response.data['error'])
+
+    def test_invalid_archive(self):
+        """Test d'un fichier qui n'est pas une archive ZIP"""
+        archive = SimpleUploadedFile("cvs.zip", b"pas un zip", content_type="application/zip")
+        response = self.client.post('/api/resumes/bulk-upload/', {'archive': archive}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        archive = SimpleUploadedFile("cvs.rar", b"rar", content_type="application/octet-stream")
+        response = self.client.post('/api/resumes/bulk-upload/', {'archive': archive}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ResumeDeduplicationTest(APITestCase):
+    """Tests de la déduplication des CV par SHA-256"""
+
+    CONTENT = b"%PDF-1.4 same cv"
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(name="INFORMATION-TECHNOLOGY", keywords="")
+
+    def upload(self, content=CONTENT, query=''):
+        cv_file = SimpleUploadedFile("cv.pdf", content, content_type="application/pdf")
+        return self.client.post(f'/api/resumes/{query}', {'file': cv_file}, format='multipart')
+
+    @patch('resumes.views.extract_document', return_value=("Python developer", False))
+    def test_hash_computed_during_upload(self, extract_mock):
+        """Test que le SHA-256 est calculé pendant l'upload"""
+        import hashlib
+
+        response = self.upload()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['sha256'], hashlib.sha256(self.CONTENT).hexdigest())
+
+    @patch('resumes.pipeline.cv_classifier')
+    @patch('resumes.views.extract_document', return_value=("Python developer", False))
+    def test_duplicate_reuses_text_and_classification(self, extract_mock, mock_classifier):
+        """Test qu'un CV identique réutilise le texte et la classification"""
+        mock_classifier.is_loaded = True
+        mock_classifier.version = "v1"
+        first = Resume.objects.get(id=self.upload().data['id'])
+        Classification.objects.create(
+            resume=first, category=self.category, confidence_score=0.9, model_version="v1"
+        )
+
+        response = self.upload()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        extract_mock.assert_called_once()
+        second = Resume.objects.get(id=response.data['id'])
+        self.assertEqual(second.text_content, "Python developer")
+        self.assertEqual(second.classifications.get().category, self.category)
+        self.assertNotEqual(second.file.name, first.file.name)
+
+    @patch('resumes.pipeline.cv_classifier')
+    @patch('resumes.views.extract_document', return_value=("Python developer", False))
+    def test_duplicate_ignores_other_model_version(self, extract_mock, mock_classifier):
+        """Test qu'une classification d'un autre modèle n'est pas réutilisée"""
+        mock_classifier.is_loaded = True
+        mock_classifier.version = "v2"
+        first = Resume.objects.get(id=self.upload().data['id'])
+        Classification.objects.create(
+            resume=first, category=self.category, confidence_score=0.9, model_version="v1"
+        )
+
+        second = Resume.objects.get(id=self.upload().data['id'])
+        self.assertEqual(second.text_content, "Python developer")
+        self.assertFalse(second.classifications.exists())
+
+    @override_settings(RESUME_DEDUPLICATE_FILES=True)
+    @patch('resumes.views.extract_document', return_value=("Python developer", False))
+    def test_duplicate_file_shared_on_disk(self, extract_mock):
+        """Test du partage du fichier sur disque"""
+        first = Resume.objects.get(id=self.upload().data['id'])
+        second = Resume.objects.get(id=self.upload().data['id'])
+        self.assertEqual(second.file.name, first.file.name)
+
+    @patch('resumes.pipeline.extract_document')
+    @patch('resumes.views.extract_document', return_value=("Python developer", False))
+    def test_async_duplicate_skips_extraction(self, view_extract_mock, worker_extract_mock):
+        """Test que le worker n'extrait pas un CV déjà traité"""
+        first_id = self.upload().data['id']
+        job_id = self.upload(query='?async=true').data['job_id']
+
+        call_command('process_resume_jobs', '--once', stdout=StringIO())
+
+        worker_extract_mock.assert_not_called()
+        job = IngestionJob.objects.get(id=job_id)
+        self.assertEqual(job.status, IngestionJob.STATUS_DONE)
+        self.assertEqual(job.result['duplicate_of'], first_id)
+        self.assertEqual(job.resume.text_content, "Python developer")
+
+
+class PredictionCacheTest(TestCase):
+    """Tests du cache des prédictions"""
+
+    def setUp(self):
+        from .ml_classifier import CVClassifier
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        save_test_bundle(self.tmp_dir.name)
+        self.classifier = CVClassifier(base_path=self.tmp_dir.name)
+
+    def test_repeated_text_hits_cache(self):
+        """Test qu'un texte déjà classifié (aux espaces et à la casse près) est servi par le cache"""
+        first = self.classifier.rank("Python  Django developer", top_k=2)
+
+        with patch.object(self.classifier, '_predict_proba',
+                          side_effect=AssertionError("modèle appelé")):
+            second = self.classifier.rank("python django\ndeveloper", top_k=2)
+
+        self.assertEqual(first, second)
+        stats = self.classifier.cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_cache_keyed_by_model_version(self):
+        """Test qu'une nouvelle version du modèle n'utilise pas les anciennes entrées"""
+        from .prediction_cache import PredictionCache
+
+        self.assertNotEqual(
+            PredictionCache.make_key("python", "v1"),
+            PredictionCache.make_key("python", "v2")
+        )
+
+    def test_batch_only_computes_misses(self):
+        """Test que seuls les textes absents du cache sont calculés"""
+        self.classifier.rank("python developer")
+
+        with patch.object(self.classifier, '_predict_proba',
+                          wraps=self.classifier._predict_proba) as proba_mock:
+            predictions = self.classifier.rank_many(["python developer", "tax audit"])
+
+        proba_mock.assert_called_once()
+        self.assertEqual(proba_mock.call_args[0][1], ["tax audit"])
+        self.assertEqual([p.category for p in predictions], ["IT", "ACCOUNTANT"])
+
+    def test_lru_eviction(self):
+        """Test de l'éviction LRU quand le cache est plein"""
+        from .prediction_cache import LocalPredictionCache
+
+        cache = LocalPredictionCache(max_size=2)
+        cache.set_many({'a': 1, 'b': 2})
+        cache.get_many(['a'])
+        cache.set_many({'c': 3})
+
+        self.assertEqual(cache.get_many(['a', 'b', 'c']), {'a': 1, 'c': 3})
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertEqual(len(cache), 2)
+
+    def test_django_cache_backend(self):
+        """Test du backend basé sur le framework de cache Django"""
+        from .prediction_cache import build_prediction_cache
+
+        with self.settings(PREDICTION_CACHE={'BACKEND': 'django'}):
+            cache = build_prediction_cache()
+        cache.set_many({'cvclf:test:key': [0.2, 0.8]})
+
+        self.assertEqual(cache.get_many(['cvclf:test:key', 'missing']), {'cvclf:test:key': [0.2, 0.8]})
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+        self.assertEqual(cache.stats()['backend'], 'django')
+        self.assertIsNone(cache.stats()['size'])
+
+    def test_base_class_is_abstract(self):
+        """Test que la classe de base ne peut pas être instanciée"""
+        from .prediction_cache import PredictionCache
+
+        with self.assertRaises(TypeError):
+            PredictionCache()
+
+
+class SkillMatcherTest(TestCase):
+    """Tests de la détection des compétences"""
+
+    def test_word_boundaries(self):
+        """Test qu'une compétence n'est pas trouvée à l'intérieur d'un autre mot"""
+        from .utils import extract_skills
+
+        self.assertEqual(extract_skills("Good JavaScript developer"), ['JavaScript'])
+        self.assertEqual(extract_skills("Gitlab and Scrummaster"), [])
+
+    def test_aliases_and_symbols(self):
+        """Test des alias et des compétences contenant des symboles"""
+        from .utils import extract_skills
+
+        skills = extract_skills("k8s, Golang, C++ et C#. Front en Vue.js, Power BI.")
+        self.assertEqual(skills, ['Kubernetes', 'Go', 'C++', 'C#', 'Vue', 'PowerBI'])
+
+    def test_longest_match(self):
+        """Test que les compétences en plusieurs mots sont reconnues en entier"""
+        from .skills import SkillMatcher
+
+        matcher = SkillMatcher({'Machine Learning': ['ml'], 'Machine': [], 'Spring': ['spring boot']})
+        self.assertEqual(matcher.find("machine-learning, Spring Boot"), ['Machine Learning', 'Spring'])
+        self.assertEqual(matcher.find("machine à café"), ['Machine'])
+
+
+class SkillIndexTest(APITestCase):
+    """Tests de l'index des compétences et de la recherche par compétences"""
+
+    def setUp(self):
+        from .pipeline import save_skills
+
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        texts = [
+            "Python et Kubernetes sur AWS",
+            "Python, Docker et Azure",
+            "Java et Docker",
+        ]
+        self.resumes = []
+        for text in texts:
+            resume = Resume.objects.create(user=self.user, text_content=text)
+            save_skills(resume)
+            self.resumes.append(resume)
+
+    def search(self, query):
+        response = self.client.get(f'/api/resumes/by-skills/?{query}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(r['id'] for r in response.data['results'])
+
+    def test_skills_persisted(self):
+        """Test que les compétences sont enregistrées dans l'index"""
+        self.assertEqual(
+            sorted(self.resumes[0].skills.values_list('name', flat=True)),
+            ['AWS', 'Kubernetes', 'Python']
+        )
+        self.assertEqual(Skill.objects.filter(name='Docker').count(), 1)
+
+    def test_search_all_and_any(self):
+        """Test de la recherche avec intersection (all) et union (any)"""
+        first, second, third = [r.id for r in self.resumes]
+
+        self.assertEqual(self.search('all=Python,Docker'), [second])
+        self.assertEqual(self.search('any=AWS,Azure'), [first, second])
+        self.assertEqual(self.search('all=Docker&any=Java'), [third])
+        self.assertEqual(self.search('all=python,k8s'), [first])
+        self.assertEqual(self.search('all=Python,Cobol'), [])
+
+    def test_search_paginated(self):
+        """Test que la recherche est paginée et limitée aux CV de l'utilisateur"""
+        other = User.objects.create_user(username='other', password='testpass123')
+        Resume.objects.create(user=other, text_content="Python")
+
+        response = self.client.get('/api/resumes/by-skills/?any=Python')
+        self.assertEqual(response.data['count'], 2)
+        self.assertIn('next', response.data)
+        self.assertEqual(response.data['any'], ['Python'])
+
+    def test_search_requires_skills(self):
+        """Test que la recherche sans compétence est refusée"""
+        response = self.client.get('/api/resumes/by-skills/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_backfill_command(self):
+        """Test de la commande d'indexation des CV existants"""
+        resume = Resume.objects.create(user=self.user, text_content="Scrum et Agile")
+        ResumeSkill.objects.filter(resume=self.resumes[0]).delete()
+
+        call_command('backfill_resume_skills', '--batch-size', '1', stdout=StringIO())
+
+        self.assertEqual(sorted(resume.skills.values_list('name', flat=True)), ['Agile', 'Scrum'])
+        self.assertEqual(self.resumes[0].skills.count(), 3)
+
+
+class JobMatchingTest(APITestCase):
+    """Tests du classement des CV pour une offre d'emploi"""
+
+    def setUp(self):
+        from .ml_classifier import CVClassifier
+        from .matching import ResumeVectorIndex, store_resume_vectors
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        save_test_bundle(self.tmp_dir.name)
+        self.classifier = CVClassifier(base_path=self.tmp_dir.name)
+        self.index = ResumeVectorIndex()
+        for target, value in [
+            ('resumes.matching.cv_classifier', self.classifier),
+            ('resumes.views.cv_classifier', self.classifier),
+            ('resumes.matching.resume_index', self.index),
+        ]:
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.staff_user = User.objects.create_user(
+            username='staffuser', password='testpass123', is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.staff_user)
+
+        self.it = Category.objects.create(name="IT", keywords="")
+        self.python_resume = Resume.objects.create(user=self.user, text_content="python django developer")
+        self.java_resume = Resume.objects.create(user=self.staff_user, text_content="java spring developer")
+        self.audit_resume = Resume.objects.create(user=self.user, text_content="audit accounting finance")
+        store_resume_vectors([
+            (r.id, r.text_content) for r in (self.python_resume, self.java_resume, self.audit_resume)
+        ])
+
+        self.posting = JobPosting.objects.create(
+            title="Python developer", description="django flask", category=self.it
+        )
+
+    def matches(self, query=''):
+        response = self.client.get(f'/api/jobpostings/{self.posting.id}/matches/{query}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [r['resume_id'] for r in response.data['results']]
+
+    def test_ranked_by_similarity(self):
+        """Test que les CV sont classés par similarité cosinus"""
+        self.assertEqual(self.matches(), [self.python_resume.id, self.java_resume.id])
+        self.assertEqual(self.matches('?limit=1'), [self.python_resume.id])
+
+    def test_incremental_update(self):
+        """Test qu'un CV ingéré après la construction de l'index est ajouté sans reconstruction"""
+        from .pipeline import index_resume
+
+        self.matches()
+        resume = Resume.objects.create(user=self.user, text_content="python flask django")
+        index_resume(resume)
+
+        with patch.object(self.index, '_rebuild') as rebuild_mock:
+            self.assertEqual(self.matches()[0], resume.id)
+        rebuild_mock.assert_not_called()
+
+    def test_deleted_resume_discarded(self):
+        """Test qu'un CV supprimé n'apparaît plus dans les résultats"""
+        self.matches()
+        self.python_resume.delete()
+        self.assertEqual(self.matches(), [self.java_resume.id])
+
+    def test_same_category_filter(self):
+        """Test du pré-filtrage par la catégorie de la dernière classification"""
+        Classification.objects.create(resume=self.java_resume, category=self.it, confidence_score=0.9)
+        self.assertEqual(self.matches('?same_category=true'), [self.java_resume.id])
+
+    def test_non_staff_sees_own_resumes(self):
+        """Test qu'un utilisateur ne voit que ses propres CV"""
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.matches(), [self.python_resume.id])
+
+    def test_vectors_recomputed_after_reload(self):
+        """Test qu'après un rechargement les CV sont revectorisés hors requête, l'ancien index servant en attendant"""
+        from .models import ResumeVector
+
+        first = self.classifier.version
+        self.matches()
+        second = save_test_bundle(
+            self.tmp_dir.name,
+            TRAINING_TEXTS + ["marketing seo campaign brand"],
+            TRAINING_LABELS + ["MARKETING"]
+        )
+        self.classifier.reload()
+
+        backfill = MagicMock()
+        backfill.is_alive.return_value = True
+        with patch.object(self.index, '_start_backfill', return_value=backfill) as start_mock:
+            self.assertEqual(self.matches(), [self.python_resume.id, self.java_resume.id])
+            self.assertEqual(self.matches(), [self.python_resume.id, self.java_resume.id])
+        start_mock.assert_called_once()
+        self.assertEqual(set(ResumeVector.objects.values_list('model_version', flat=True)), {first})
+
+        self.assertEqual(self.index.backfill(self.classifier.snapshot()), 3)
+        backfill.is_alive.return_value = False
+        self.assertEqual(self.matches(), [self.python_resume.id, self.java_resume.id])
+        self.assertEqual(
+            set(ResumeVector.objects.values_list('model_version', flat=True)), {second['version']}
+        )
+        self.assertEqual(self.index._snapshot.version, second['version'])
+
+    def test_missing_vectors_backfilled_in_background(self):
+        """Test qu'un premier index incomplet lance la revectorisation sans la faire pendant la requête"""
+        from .models import ResumeVector
+
+        ResumeVector.objects.filter(resume=self.java_resume).delete()
+        with patch.object(self.index, '_start_backfill') as start_mock:
+            self.assertEqual(self.matches(), [self.python_resume.id])
+        start_mock.assert_called_once()
+        self.assertFalse(ResumeVector.objects.filter(resume=self.java_resume).exists())
+
+        self.index.backfill(self.classifier.snapshot())
+        self.assertEqual(self.matches(), [self.python_resume.id, self.java_resume.id])
+
+    def test_invalid_limit(self):
+        """Test qu'une limite invalide est refusée"""
+        response = self.client.get(f'/api/jobpostings/{self.posting.id}/matches/?limit=0')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class JobRecommendationTest(APITestCase):
+    """Tests de la recommandation d'offres pour un CV"""
+
+    def setUp(self):
+        from .ml_classifier import CVClassifier
+        from .matching import JobPostingMatrix
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        save_test_bundle(self.tmp_dir.name)
+        self.classifier = CVClassifier(base_path=self.tmp_dir.name)
+        self.matrix = JobPostingMatrix()
+        for target, value in [
+            ('resumes.matching.cv_classifier', self.classifier),
+            ('resumes.matching.posting_matrix', self.matrix),
+            ('resumes.views.cv_classifier', self.classifier),
+        ]:
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.category = Category.objects.create(name="IT", keywords="")
+        self.resume = Resume.objects.create(user=self.user, text_content="python django developer")
+        self.python_job = JobPosting.objects.create(
+            title="Python developer", description="django flask", category=self.category
+        )
+        self.java_job = JobPosting.objects.create(
+            title="Java developer", description="spring backend", category=self.category
+        )
+        JobPosting.objects.create(title="Auditor", description="audit finance", category=self.category)
+
+    def recommended(self):
+        response = self.client.get(f'/api/resumes/{self.resume.id}/recommended-jobs/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [r['job_posting_id'] for r in response.data['results']]
+
+    def test_vectors_computed_on_save(self):
+        """Test que le vecteur d'une offre est calculé à son enregistrement"""
+        from .models import JobPostingVector
+
+        self.assertEqual(JobPostingVector.objects.count(), 3)
+        self.assertEqual(self.python_job.vector.model_version, self.classifier.version)
+
+    def test_loaddata_skips_vectorization(self):
+        """Test qu'une offre chargée par loaddata n'est vectorisée qu'à la construction de la matrice"""
+        from django.core import serializers
+        from .models import JobPostingVector
+
+        data = serializers.serialize('json', [JobPosting(
+            id=1000, title="Python backend", description="django python", category=self.category,
+            created_at=timezone.now()
+        )])
+        with patch('resumes.matching.store_posting_vector') as store_mock:
+            for obj in serializers.deserialize('json', data):
+                obj.save()
+        store_mock.assert_not_called()
+        self.assertFalse(JobPostingVector.objects.filter(posting_id=1000).exists())
+
+        self.assertIn(1000, self.recommended())
+        self.assertTrue(JobPostingVector.objects.filter(posting_id=1000).exists())
+
+    def test_recommended_jobs(self):
+        """Test que les offres sont classées par similarité avec le CV"""
+        self.assertEqual(self.recommended(), [self.python_job.id, self.java_job.id])
+
+    def test_matrix_cached(self):
+        """Test que la matrice des offres n'est pas reconstruite entre deux appels"""
+        self.recommended()
+        with patch.object(self.matrix, '_build') as build_mock:
+            self.recommended()
+        build_mock.assert_not_called()
+
+    def test_invalidated_on_change(self):
+        """Test que désactiver ou modifier une offre invalide la matrice"""
+        self.recommended()
+
+        self.python_job.is_active = False
+        self.python_job.save()
+        self.assertEqual(self.recommended(), [self.java_job.id])
+
+        self.java_job.description = "python django"
+        self.java_job.save()
+        self.assertEqual(self.recommended()[0], self.java_job.id)
+
+    def test_invalidated_by_other_process(self):
+        """Test qu'une modification faite par un autre processus est détectée par l'empreinte"""
+        self.recommended()
+
+        with patch.object(self.matrix, 'invalidate'):
+            self.python_job.is_active = False
+            self.python_job.save()
+        self.assertEqual(self.recommended(), [self.java_job.id])
+
+    def test_invalidated_by_queryset_update(self):
+        """Test qu'un changement de is_active par QuerySet.update() (sans signal) est détecté"""
+        self.recommended()
+
+        JobPosting.objects.filter(id=self.python_job.id).update(is_active=False)
+        self.assertEqual(self.recommended(), [self.java_job.id])
+
+        JobPosting.objects.filter(id=self.python_job.id).update(is_active=True)
+        self.assertEqual(self.recommended(), [self.python_job.id, self.java_job.id])
+
+
+class NearDuplicateTest(APITestCase):
+    """Tests de la détection des quasi-doublons (MinHash/LSH)"""
+
+    BASE_TEXT = (
+        "Développeur Python senior avec huit ans d'expérience en Django, Flask et "
+        "PostgreSQL. Conception d'API REST, intégration continue avec Jenkins, "
+        "déploiement sur Kubernetes et AWS. Encadrement d'une équipe de quatre "
+        "développeurs en méthode Scrum. Formation: master en informatique à Lyon. "
+        "Langues: français, anglais courant. Téléphone 06 12 34 56 78."
+    )
+
+    def setUp(self):
+        from .near_duplicates import store_signatures
+
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.original = Resume.objects.create(user=self.user, text_content=self.BASE_TEXT)
+        self.edited = Resume.objects.create(
+            user=self.user, text_content=self.BASE_TEXT.replace("06 12 34 56 78", "07 98 76 54 32")
+        )
+        self.other = Resume.objects.create(
+            user=self.user, text_content="Comptable confirmé, audit financier, fiscalité et bilans annuels."
+        )
+        store_signatures([(r.id, r.text_content) for r in (self.original, self.edited, self.other)])
+
+    def test_similarity_estimate(self):
+        """Test que la signature MinHash estime la similarité de Jaccard"""
+        from .near_duplicates import minhash, shingles, similarity
+
+        edited = self.edited.text_content
+        exact = len(shingles(self.BASE_TEXT) & shingles(edited)) / len(shingles(self.BASE_TEXT) | shingles(edited))
+        estimate = similarity(minhash(self.BASE_TEXT), minhash(edited))
+        self.assertAlmostEqual(estimate, exact, delta=0.1)
+        self.assertIsNone(minhash(""))
+
+    def test_near_duplicates_endpoint(self):
+        """Test de l'endpoint des quasi-doublons"""
+        response = self.client.get(f'/api/resumes/{self.original.id}/near-duplicates/?threshold=0.8')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r['resume_id'] for r in response.data['results']], [self.edited.id])
+
+    def test_invalid_threshold(self):
+        """Test qu'un seuil invalide est refusé"""
+        response = self.client.get(f'/api/resumes/{self.original.id}/near-duplicates/?threshold=0.1')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_report_command(self):
+        """Test du rapport des groupes de quasi-doublons"""
+        import json
+
+        late = Resume.objects.create(user=self.user, text_content=self.BASE_TEXT + " Permis B.")
+        out = StringIO()
+        call_command('near_duplicate_report', '--threshold', '0.8', '--backfill', '--json', stdout=out)
+
+        clusters = json.loads(out.getvalue())
+        self.assertEqual(len(clusters), 1)
+        self.assertEqual(clusters[0]['resume_ids'], sorted([self.original.id, self.edited.id, late.id]))
+
+
+class FullTextSearchTest(APITestCase):
+    """Tests de la recherche plein texte (FTS5)"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.staff_user = User.objects.create_user(
+            username='staffuser', password='testpass123', is_staff=True, is_superuser=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.python_resume = Resume.objects.create(
+            user=self.user, text_content="Développeur Python, Django et Python scientifique"
+        )
+        self.java_resume = Resume.objects.create(user=self.user, text_content="Développeur Java et Spring")
+        self.other_resume = Resume.objects.create(user=self.staff_user, text_content="Python et data")
+
+    def search(self, query):
+        response = self.client.get('/api/resumes/search/', {'q': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_search_ranked_with_snippet(self):
+        """Test que les résultats sont classés et accompagnés d'un extrait"""
+        response = self.search("developpeur")
+
+        self.assertEqual(response.data['count'], 2)
+        results = {r['resume_id']: r for r in response.data['results']}
+        self.assertIn('<mark>Développeur</mark>', results[self.java_resume.id]['snippet'])
+
+        response = self.search("python")
+        self.assertEqual([r['resume_id'] for r in response.data['results']], [self.python_resume.id])
+
+    def test_prefix_and_all_terms(self):
+        """Test de la recherche par préfixe et de l'intersection des termes"""
+        self.assertEqual(self.search("spr*").data['count'], 1)
+        self.assertEqual(self.search("python java").data['count'], 0)
+        self.assertEqual(self.search('"python" OR NOT').data['count'], 0)
+
+    def test_index_kept_in_sync(self):
+        """Test que l'index suit les modifications et suppressions"""
+        self.java_resume.text_content = "Développeur Kotlin"
+        self.java_resume.save()
+        self.python_resume.delete()
+
+        self.assertEqual(self.search("java").data['count'], 0)
+        self.assertEqual(self.search("kotlin").data['count'], 1)
+        self.assertEqual(self.search("django").data['count'], 0)
+
+    def test_staff_sees_all(self):
+        """Test que le staff cherche dans tous les CV"""
+        self.client.force_authenticate(user=self.staff_user)
+        self.assertEqual(self.search("python").data['count'], 2)
+
+    def test_query_required(self):
+        """Test qu'une recherche vide est refusée"""
+        response = self.client.get('/api/resumes/search/?q=')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_admin_search_uses_index(self):
+        """Test que la recherche de l'admin passe par l'index plein texte"""
+        self.client.force_login(self.staff_user)
+        response = self.client.get('/admin/resumes/resume/', {'q': 'spring'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.context['cl'].result_list), [self.java_resume])
+
+
 class ResumeByCategoryAPITest(APITestCase):
     """Tests pour la recherche par catégorie"""
 
@@ -364,6 +2252,122 @@ class ResumeByCategoryAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
+class CategoryKeysetPaginationTest(APITestCase):
+    """Tests de la pagination par curseur des CV d'une catégorie"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.category = Category.objects.create(name="Data Science")
+        classified_at = timezone.now()
+        self.classifications = []
+        for i in range(7):
+            resume = Resume.objects.create(user=self.user, text_content=f"CV {i}")
+            classification = Classification.objects.create(
+                resume=resume, category=self.category, confidence_score=0.5
+            )
+            # Horodatages en partie identiques: l'id départage les égalités
+            Classification.objects.filter(id=classification.id).update(
+                classified_at=classified_at - timedelta(minutes=i // 3)
+            )
+            self.classifications.append(classification)
+
+    def _walk(self, url, params, key):
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [item[key] for item in response.data['results' if key == 'classification_id' else 'resumes']]
+            url, params, pages = response.data['next'], None, pages + 1
+        return ids, pages
+
+    def test_by_category_pages_cover_all_rows_once(self):
+        ids, pages = self._walk(
+            '/api/resumes/by-category/',
+            {'category': 'data science', 'page_size': 3},
+            'classification_id'
+        )
+        expected = [c.id for c in sorted(
+            Classification.objects.all(), key=lambda c: (c.classified_at, c.id), reverse=True
+        )]
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_category_resumes_pages(self):
+        ids, pages = self._walk(
+            f'/api/categories/{self.category.id}/resumes/', {'page_size': 2}, 'resume_id'
+        )
+        self.assertEqual(sorted(ids), sorted(c.resume_id for c in self.classifications))
+        self.assertEqual(pages, 4)
+
+    def test_page_size_is_bounded(self):
+        response = self.client.get('/api/resumes/by-category/', {'category': 'Data Science', 'page_size': 0})
+        self.assertEqual(response.data['page_count'], 1)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_count_on_first_page_only(self):
+        params = {'category': 'Data Science', 'page_size': 3}
+        response = self.client.get('/api/resumes/by-category/', params)
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual(response.data['page_count'], 3)
+
+        with self.assertNumQueries(2):
+            # Utilisateur authentifié + une page, sans COUNT
+            response = self.client.get(response.data['next'])
+        self.assertIsNone(response.data['count'])
+        self.assertEqual(response.data['page_count'], 3)
+
+        response = self.client.get(response.data['next'] + '&include_count=true')
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual(response.data['page_count'], 1)
+
+        response = self.client.get('/api/resumes/by-category/', {**params, 'include_count': 'false'})
+        self.assertIsNone(response.data['count'])
+
+        response = self.client.get(f'/api/categories/{self.category.id}/resumes/', {'page_size': 2})
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual(response.data['page_count'], 2)
+
+    def test_category_resumes_ignores_category_param(self):
+        response = self.client.get(
+            f'/api/categories/{self.category.id}/resumes/', {'category': 'Other', 'page_size': 10}
+        )
+        self.assertEqual(response.data['page_count'], 7)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/resumes/by-category/', {'category': 'Data Science', 'cursor': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_count_endpoints(self):
+        response = self.client.get('/api/resumes/by-category/count/', {'category': 'data science'})
+        self.assertEqual(response.data['count'], 7)
+
+        response = self.client.get(f'/api/categories/{self.category.id}/resumes/count/')
+        self.assertEqual(response.data['count'], 7)
+
+        response = self.client.get('/api/resumes/by-category/count/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_count_endpoints_apply_listing_filters(self):
+        Classification.objects.filter(id__in=[c.id for c in self.classifications[:2]]).update(
+            confidence_score=0.9
+        )
+        params = {'category': 'data science', 'min_confidence': 0.8}
+
+        listing = self.client.get('/api/resumes/by-category/', params)
+        count = self.client.get('/api/resumes/by-category/count/', params)
+        self.assertEqual(listing.data['count'], 2)
+        self.assertEqual(count.data['count'], 2)
+
+        response = self.client.get(
+            f'/api/categories/{self.category.id}/resumes/count/',
+            {'date_to': (timezone.localdate() - timedelta(days=1)).isoformat()}
+        )
+        self.assertEqual(response.data['count'], 0)
+
+
 class ResumeExtractSkillsAPITest(APITestCase):
     """Tests pour l'extraction de compétences"""
 
@@ -432,6 +2436,222 @@ class ClassificationAPITest(APITestCase):
         self.assertIn('categories_distribution', response.data)
 
 
+class ClassificationStatsTest(APITestCase):
+    """Tests des statistiques (agrégation groupée et table d'agrégats)"""
+
+    def setUp(self):
+        self.staff_user = User.objects.create_user(
+            username='staffuser', password='testpass123', is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.staff_user)
+
+        self.it = Category.objects.create(name="IT", keywords="")
+        self.finance = Category.objects.create(name="FINANCE", keywords="")
+        for category, confidence in [(self.it, 0.8), (self.it, 0.6), (self.finance, 0.4)]:
+            resume = Resume.objects.create(user=self.staff_user, text_content="cv")
+            Classification.objects.create(resume=resume, category=category, confidence_score=confidence)
+
+    def stats(self, query=''):
+        response = self.client.get(f'/api/classifications/stats/{query}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_single_grouped_query(self):
+        """Test que les statistiques sont calculées en une requête"""
+        from .stats import live_stats
+
+        with self.assertNumQueries(1):
+            stats = live_stats(Classification.objects.all())
+
+        self.assertEqual(stats['total_classifications'], 3)
+        self.assertEqual(stats['average_confidence'], 0.6)
+        self.assertEqual(stats['categories_distribution'], {'FINANCE': 1, 'IT': 2})
+
+    def test_date_filters(self):
+        """Test des filtres de dates"""
+        from datetime import timedelta
+        from django.utils import timezone
+
+        Classification.objects.filter(category=self.finance).update(
+            classified_at=timezone.now() - timedelta(days=10)
+        )
+        today = timezone.localdate()
+
+        self.assertEqual(self.stats(f'?date_from={today}')['categories_distribution'], {'IT': 2})
+        self.assertEqual(
+            self.stats(f'?date_to={today - timedelta(days=1)}')['categories_distribution'], {'FINANCE': 1}
+        )
+
+        response = self.client.get('/api/classifications/stats/?date_from=2024-13-45')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(CLASSIFICATION_STATS_ROLLUP=True)
+    def test_rollup_maintained(self):
+        """Test que la table d'agrégats suit les créations et suppressions"""
+        call_command('rebuild_classification_stats', stdout=StringIO())
+        self.assertEqual(self.stats()['categories_distribution'], {'FINANCE': 1, 'IT': 2})
+
+        Classification.objects.filter(category=self.finance).delete()
+        resume = Resume.objects.create(user=self.staff_user, text_content="cv")
+        Classification.objects.create(resume=resume, category=self.it, confidence_score=1.0)
+
+        with self.assertNumQueries(1):
+            from .stats import rollup_stats
+            stats = rollup_stats()
+        self.assertEqual(stats['categories_distribution'], {'IT': 3})
+        self.assertEqual(stats['average_confidence'], 0.8)
+        self.assertEqual(self.stats(), stats)
+
+
+    @override_settings(CLASSIFICATION_STATS_ROLLUP=True)
+    def test_rollup_follows_updates(self):
+        """Test qu'une catégorie ou une confiance modifiée (admin) est reportée dans la table d'agrégats"""
+        from .stats import rollup_stats
+
+        call_command('rebuild_classification_stats', stdout=StringIO())
+        classification = Classification.objects.get(category=self.finance)
+        classification.category = self.it
+        classification.confidence_score = 1.0
+        classification.save()
+
+        stats = rollup_stats()
+        self.assertEqual(stats['categories_distribution'], {'IT': 3})
+        self.assertEqual(stats['average_confidence'], 0.8)
+
+    def test_fast_delete_without_rollup(self):
+        """Test qu'aucun signal n'est connecté sans table d'agrégats: suppression en une requête"""
+        from django.db.models.signals import post_delete
+
+        self.assertFalse(post_delete.has_listeners(Classification))
+        with self.assertNumQueries(1):
+            Classification.objects.all().delete()
+
+        with override_settings(CLASSIFICATION_STATS_ROLLUP=True):
+            self.assertTrue(post_delete.has_listeners(Classification))
+
+
+class ClassificationExportTest(APITestCase):
+    """Tests de l'export en flux des classifications"""
+
+    def setUp(self):
+        self.staff_user = User.objects.create_user(username='admin', password='adminpass', is_staff=True)
+        self.user = User.objects.create_user(username='user', password='userpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.staff_user)
+
+        self.it = Category.objects.create(name="IT", keywords="")
+        self.finance = Category.objects.create(name="FINANCE", keywords="")
+        for category, confidence in [(self.it, 0.9), (self.it, 0.3), (self.finance, 0.7)]:
+            resume = Resume.objects.create(user=self.user, text_content="cv")
+            Classification.objects.create(resume=resume, category=category, confidence_score=confidence)
+
+    def export(self, query):
+        response = self.client.get(f'/api/classifications/export/{query}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson(self):
+        import json
+
+        response, body = self.export('?format=ndjson')
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row['id'] for row in rows], sorted(Classification.objects.values_list('id', flat=True)))
+        self.assertEqual(rows[0]['user'], 'user')
+        self.assertEqual(rows[0]['category'], 'IT')
+
+    def test_csv_with_filters(self):
+        import csv
+
+        response, body = self.export('?format=csv&category=it&min_confidence=0.5')
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        rows = list(csv.DictReader(body.splitlines()))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['category'], 'IT')
+        self.assertEqual(float(rows[0]['confidence']), 0.9)
+
+    def test_date_filter_and_errors(self):
+        Classification.objects.filter(category=self.finance).update(
+            classified_at=timezone.now() - timedelta(days=10)
+        )
+        _, body = self.export(f'?date_to={timezone.localdate() - timedelta(days=1)}')
+        self.assertEqual(len(body.splitlines()), 1)
+
+        response = self.client.get('/api/classifications/export/?format=csv&min_confidence=abc')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_listing_uses_same_filters(self):
+        response = self.client.get('/api/classifications/', {'category': 'IT', 'min_confidence': 0.5})
+        self.assertEqual(response.data['count'], 1)
+
+    def test_staff_only(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/classifications/export/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ResumeExportTest(APITestCase):
+    """Tests de l'export en flux des CV"""
+
+    def setUp(self):
+        self.staff_user = User.objects.create_user(username='admin', password='adminpass', is_staff=True)
+        self.user = User.objects.create_user(username='user', password='userpass')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.staff_user)
+
+        self.it = Category.objects.create(name="IT", keywords="")
+        self.finance = Category.objects.create(name="FINANCE", keywords="")
+        self.resumes = [
+            Resume.objects.create(user=self.user, text_content="python django"),
+            Resume.objects.create(user=self.user, text_content="audit"),
+            Resume.objects.create(user=self.staff_user, text_content=""),
+        ]
+        Classification.objects.create(resume=self.resumes[0], category=self.finance, confidence_score=0.2)
+        Classification.objects.create(resume=self.resumes[0], category=self.it, confidence_score=0.9)
+        Classification.objects.create(resume=self.resumes[1], category=self.finance, confidence_score=0.7)
+
+    def export(self, query=''):
+        response = self.client.get(f'/api/resumes/export/{query}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson_with_latest_classification(self):
+        import json
+
+        response, body = self.export()
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row['id'] for row in rows], [r.id for r in self.resumes])
+        self.assertEqual((rows[0]['category'], rows[0]['confidence']), ('IT', 0.9))
+        self.assertEqual(rows[1]['user'], 'user')
+        self.assertIsNone(rows[2]['category'])
+        self.assertNotIn('text', rows[0])
+
+    def test_csv_with_filters_and_text(self):
+        import csv
+
+        response, body = self.export('?format=csv&category=finance&include_text=true')
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        rows = list(csv.DictReader(body.splitlines()))
+        self.assertEqual([int(row['id']) for row in rows], [self.resumes[1].id])
+        self.assertEqual(rows[0]['text'], 'audit')
+
+        Resume.objects.filter(id=self.resumes[1].id).update(uploaded_at=timezone.now() - timedelta(days=10))
+        _, body = self.export(f'?date_to={timezone.localdate() - timedelta(days=1)}')
+        self.assertEqual(len(body.splitlines()), 1)
+
+        response = self.client.get('/api/resumes/export/?date_from=2024-13-45')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_staff_only(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/resumes/export/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
 class JobPostingAPITest(APITestCase):
     """Tests pour l'API des offres d'emploi"""
 
@@ -2,8 +2,20 @@ import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.model_selection import train_test_split
+import argparse
 import pickle
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from resumes.model_bundle import save_bundle, PRECISIONS
+
+parser = argparse.ArgumentParser(description="Entraîne le classifieur de CV et exporte le bundle d'inférence")
+parser.add_argument(
+    '--precision', choices=PRECISIONS, default='float64',
+    help="Précision des poids du bundle (float64: identique à scikit-learn)"
+)
+args = parser.parse_args()
 
 print("Chargement du dataset...")
 
@@ -106,7 +118,10 @@ categories = list(model.classes_)
 with open(f'{ml_models_path}/categories.pkl', 'wb') as f:
     pickle.dump(categories, f)
 
+manifest = save_bundle(model, vectorizer, ml_models_path, precision=args.precision)
+
 print(f"\nModele sauvegarde dans {ml_models_path}/")
+print(f"Bundle: version {manifest['version']} ({manifest['precision']})")
 
 print("RESUME FINAL")
 print("=" * 50)
@@ -122,5 +137,7 @@ print("\nFichiers crees:")
 print(f"  - {ml_models_path}/resume_classifier.pkl")
 print(f"  - {ml_models_path}/vectorizer.pkl")
 print(f"  - {ml_models_path}/categories.pkl")
+print(f"  - {ml_models_path}/manifest.json")
+print(f"  - {ml_models_path}/{manifest['path']}/")
 print("\n" + "=" * 50)
 print("Entrainement termine avec succes!")
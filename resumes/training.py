@@ -0,0 +1,204 @@
+"""
+Entraînement en flux (out-of-core) du classifieur de CV.
+
+Le corpus n'est jamais chargé en entier: il est relu par lots de CHUNK_SIZE
+documents, depuis un CSV ou depuis les tables Resume/Classification.
+- 1re passe: fréquences documentaires des termes (analyseur TfidfVectorizer),
+  puis vocabulaire (min_df, max_df, max_features) et IDF calculés comme
+  TfidfVectorizer.fit;
+- 2e passe: vectorisation de chaque lot sur ce vocabulaire figé et
+  MultinomialNB.partial_fit (équivalent à fit: les comptes s'additionnent);
+- 3e passe (facultative): précision sur les documents mis de côté.
+
+La mémoire est bornée par un lot, le modèle (catégories x vocabulaire) et la
+table des fréquences, elle-même élaguée au-delà de MAX_TRACKED_TERMS termes
+distincts. La répartition train/test dépend d'un hash du texte: elle est
+identique à chaque passe sans rien garder en mémoire.
+"""
+import csv
+import sys
+import zlib
+from collections import Counter
+
+import numpy as np
+from django.db.models import OuterRef, Subquery
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+from .models import Resume, Classification
+
+CHUNK_SIZE = 1000
+MAX_TRACKED_TERMS = 1_000_000
+
+# Paramètres de resumes/train_model.py
+VECTORIZER_DEFAULTS = {
+    'max_features': 1500,
+    'stop_words': 'english',
+    'min_df': 2,
+    'max_df': 0.8,
+    'strip_accents': 'unicode',
+    'lowercase': True,
+}
+
+
+class TrainingError(ValueError):
+    pass
+
+
+def _chunks(rows, chunk_size):
+    chunk = []
+    for text, label in rows:
+        if text and label:
+            chunk.append((text, label))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def csv_source(path, text_column='Resume_str', label_column='Category', chunk_size=CHUNK_SIZE):
+    """Source relisible: chaque appel rouvre le CSV et renvoie des lots de (texte, catégorie)."""
+    def read():
+        # Un CV peut dépasser la taille de champ par défaut du module csv (128 Ko)
+        csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            missing = {text_column, label_column} - set(reader.fieldnames or ())
+            if missing:
+                raise TrainingError(f"Colonnes absentes du CSV: {', '.join(sorted(missing))}")
+            yield from _chunks(((row[text_column], row[label_column]) for row in reader), chunk_size)
+    return read
+
+
+def database_source(chunk_size=CHUNK_SIZE):
+    """Source relisible: CV en base étiquetés par leur classification la plus récente."""
+    def read():
+        latest = Classification.objects.filter(resume=OuterRef('pk')).order_by('-classified_at', '-id')
+        resumes = (
+            Resume.objects.exclude(text_content__isnull=True).exclude(text_content='')
+            .annotate(label=Subquery(latest.values('category__name')[:1]))
+            .filter(label__isnull=False)
+            .order_by('id')
+        )
+        last_id = 0
+        while True:
+            rows = list(resumes.filter(id__gt=last_id).values_list('id', 'text_content', 'label')[:chunk_size])
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            yield [(text, label) for _, text, label in rows]
+    return read
+
+
+def is_test(text, test_size):
+    return test_size > 0 and zlib.crc32(text.encode('utf-8')) % 10000 < test_size * 10000
+
+
+def split_chunks(source, test_size, test=False):
+    for chunk in source():
+        chunk = [row for row in chunk if is_test(row[0], test_size) == test]
+        if chunk:
+            yield chunk
+
+
+class VocabularyBuilder:
+    """Fréquences documentaires cumulées lot par lot (1re passe)."""
+
+    def __init__(self, max_tracked_terms=MAX_TRACKED_TERMS, **vectorizer_params):
+        self.vectorizer_params = {**VECTORIZER_DEFAULTS, **vectorizer_params}
+        self.analyzer = TfidfVectorizer(**self.vectorizer_params).build_analyzer()
+        self.max_tracked_terms = max_tracked_terms
+        self.document_frequency = Counter()
+        self.term_frequency = Counter()
+        self.labels = Counter()
+        self.documents = 0
+        self.prune_floor = 0
+
+    def update(self, chunk):
+        for text, label in chunk:
+            terms = Counter(self.analyzer(text))
+            self.document_frequency.update(terms.keys())
+            self.term_frequency.update(terms)
+            self.labels[label] += 1
+            self.documents += 1
+
+        if self.max_tracked_terms and len(self.document_frequency) > self.max_tracked_terms:
+            self._prune()
+
+    def _prune(self):
+        # Élagage des termes les plus rares (approximation pour les corpus
+        # dont le nombre de termes distincts dépasse la limite)
+        while len(self.document_frequency) > self.max_tracked_terms:
+            self.prune_floor += 1
+            for term in [t for t, df in self.document_frequency.items() if df <= self.prune_floor]:
+                del self.document_frequency[term]
+                del self.term_frequency[term]
+
+    def build(self):
+        """TfidfVectorizer au vocabulaire et à l'IDF figés, comme après fit sur tout le corpus."""
+        if not self.documents:
+            raise TrainingError("Aucun document d'entraînement")
+
+        params = dict(self.vectorizer_params)
+        min_df, max_df, max_features = params.pop('min_df'), params.pop('max_df'), params.pop('max_features')
+        min_count = min_df if isinstance(min_df, int) else min_df * self.documents
+        max_count = max_df if isinstance(max_df, int) else max_df * self.documents
+
+        terms = sorted(
+            term for term, df in self.document_frequency.items() if min_count <= df <= max_count
+        )
+        if max_features is not None and len(terms) > max_features:
+            # Comme CountVectorizer._limit_features: argsort des fréquences
+            # (entières) négatives sur les termes triés, pour départager les
+            # égalités exactement comme scikit-learn.
+            frequencies = np.array([self.term_frequency[term] for term in terms], dtype=np.int64)
+            kept = np.sort((-frequencies).argsort()[:max_features])
+            terms = [terms[i] for i in kept]
+        if not terms:
+            raise TrainingError("Vocabulaire vide: réduisez min_df ou augmentez max_df")
+
+        df = np.array([self.document_frequency[term] for term in terms], dtype=np.float64)
+        vectorizer = TfidfVectorizer(vocabulary=terms, **params)
+        # smooth_idf: comme si un document contenait chaque terme une fois
+        vectorizer.idf_ = np.log((1 + self.documents) / (1 + df)) + 1
+        return vectorizer
+
+
+def train(source, test_size=0.2, max_tracked_terms=MAX_TRACKED_TERMS, progress=None, **vectorizer_params):
+    """
+    Entraîne vectoriseur et modèle en trois passes sur `source` (fonction qui
+    renvoie un itérable de lots). Renvoie (model, vectorizer, rapport).
+    """
+    progress = progress or (lambda message: None)
+
+    builder = VocabularyBuilder(max_tracked_terms=max_tracked_terms, **vectorizer_params)
+    for chunk in split_chunks(source, test_size):
+        builder.update(chunk)
+        progress(f"Vocabulaire: {builder.documents} document(s) lu(s)")
+    vectorizer = builder.build()
+    classes = sorted(builder.labels)
+
+    model = MultinomialNB()
+    trained = 0
+    for chunk in split_chunks(source, test_size):
+        texts, labels = zip(*chunk)
+        model.partial_fit(vectorizer.transform(texts), labels, classes=classes)
+        trained += len(chunk)
+        progress(f"Entraînement: {trained}/{builder.documents} document(s)")
+
+    tested = correct = 0
+    if test_size > 0:
+        for chunk in split_chunks(source, test_size, test=True):
+            texts, labels = zip(*chunk)
+            correct += int((model.predict(vectorizer.transform(texts)) == np.asarray(labels)).sum())
+            tested += len(chunk)
+
+    return model, vectorizer, {
+        'documents': builder.documents,
+        'test_documents': tested,
+        'accuracy': correct / tested if tested else None,
+        'vocabulary_size': len(vectorizer.vocabulary_),
+        'categories': dict(sorted(builder.labels.items())),
+        'pruned_below_df': builder.prune_floor,
+    }
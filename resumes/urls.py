@@ -1,13 +1,26 @@
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
-from .views import ResumeViewSet, CategoryViewSet, ClassificationViewSet, JobPostingViewSet
+from .views import (
+    ResumeViewSet, CategoryViewSet, ClassificationViewSet, JobPostingViewSet,
+    IngestionJobViewSet, MLModelViewSet, HealthViewSet
+)
+from . import async_views
 
 router = DefaultRouter()
 router.register(r'resumes', ResumeViewSet, basename='resume')
 router.register(r'categories', CategoryViewSet, basename='category')
 router.register(r'classifications', ClassificationViewSet, basename='classification')
 router.register(r'jobpostings', JobPostingViewSet, basename='jobposting')
+router.register(r'jobs', IngestionJobViewSet, basename='job')
+router.register(r'model', MLModelViewSet, basename='model')
 
 urlpatterns = [
+    # Sondes de disponibilité (slash final facultatif pour les répartiteurs de charge)
+    re_path(r'^health/live/?$', HealthViewSet.as_view({'get': 'live'}), name='health-live'),
+    re_path(r'^health/ready/?$', HealthViewSet.as_view({'get': 'ready'}), name='health-ready'),
+    # Variantes asynchrones (à servir en ASGI)
+    path('async/resumes/', async_views.upload_resume, name='async-resume-upload'),
+    path('async/resumes/<int:pk>/classify/', async_views.classify_resume, name='async-resume-classify'),
+    path('async/resumes/<int:pk>/extract-skills/', async_views.resume_skills, name='async-resume-skills'),
     path('', include(router.urls)),
 ]
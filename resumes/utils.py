@@ -1,6 +1,8 @@
-import PyPDF2
-from docx import Document
+import hashlib
 import re
+from itertools import islice
+
+from .skills import get_skill_matcher
 
 
 def clean_text(text):
@@ -9,51 +11,85 @@ def clean_text(text):
     return text.strip()
 
 
-def extract_text_from_pdf(file_path):
+def join_bounded(pieces, max_chars=None):
+    # Les morceaux (pages, paragraphes) sont consommés à la demande et joints
+    # une seule fois; la lecture s'arrête dès que le budget est atteint.
+    kept = []
+    size = 0
+
+    for piece in pieces:
+        piece = clean_text(piece)
+        if not piece:
+            continue
+
+        if max_chars is not None and size + len(piece) > max_chars:
+            remaining = max_chars - size
+            if remaining <= 0:
+                # Budget déjà rempli par les morceaux précédents (séparateur compris)
+                return ' '.join(kept), True
+            cut = piece[:remaining]
+            if remaining < len(piece) and ' ' in cut:
+                cut = cut.rsplit(' ', 1)[0]
+            if cut:
+                kept.append(cut)
+            return ' '.join(kept), True
+
+        kept.append(piece)
+        size += len(piece) + 1
+
+    return ' '.join(kept), False
+
+
+def iter_pdf_pages(reader, max_pages=None):
+    for page in islice(reader.pages, max_pages):
+        yield page.extract_text() or ""
+
+
+def extract_text_from_pdf(file_path, max_pages=None, max_chars=None):
+    # Importé à l'usage: la bibliothèque n'est chargée que par les processus qui extraient.
+    import PyPDF2
+
     try:
-        text = ""
         with open(file_path, 'rb') as file:
             reader = PyPDF2.PdfReader(file)
-            for page in reader.pages:
-                text += page.extract_text() or ""
-        return clean_text(text)
+            text, truncated = join_bounded(iter_pdf_pages(reader, max_pages), max_chars)
+            if max_pages is not None and len(reader.pages) > max_pages:
+                truncated = True
+        return text, truncated
     except Exception as e:
         raise ValueError(f"Erreur lors de l'extraction du PDF: {str(e)}")
 
 
-def extract_text_from_docx(file_path):
+def extract_text_from_docx(file_path, max_chars=None):
+    from docx import Document
+
     try:
         doc = Document(file_path)
-        text = "\n".join([para.text for para in doc.paragraphs])
-        return clean_text(text)
+        return join_bounded((para.text for para in doc.paragraphs), max_chars)
     except Exception as e:
         raise ValueError(f"Erreur lors de l'extraction du DOCX: {str(e)}")
 
 
-def extract_text(file_path):
+def extract_document(file_path, max_pages=None, max_chars=None):
     if file_path.endswith('.pdf'):
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(file_path, max_pages=max_pages, max_chars=max_chars)
     elif file_path.endswith('.docx'):
-        return extract_text_from_docx(file_path)
+        return extract_text_from_docx(file_path, max_chars=max_chars)
     else:
         raise ValueError("Format non supporté")
 
 
+def extract_text(file_path):
+    return extract_document(file_path)[0]
+
+
+def file_sha256(uploaded_file):
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
 def extract_skills(text):
-    skills_keywords = [
-        'Python', 'Java', 'JavaScript', 'C++', 'C#', 'PHP', 'Ruby', 'Go', 'Swift',
-        'Django', 'Flask', 'React', 'Angular', 'Vue', 'Spring', 'Laravel',
-        'SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'Oracle', 'Redis',
-        'Git', 'Docker', 'Kubernetes', 'AWS', 'Azure', 'Jenkins',
-        'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch', 'Pandas', 'NumPy',
-        'Excel', 'PowerBI', 'Tableau', 'SEO', 'Marketing', 'Agile', 'Scrum'
-    ]
-
-    found_skills = []
-    text_lower = text.lower()
-
-    for skill in skills_keywords:
-        if skill.lower() in text_lower:
-            found_skills.append(skill)
-
-    return list(set(found_skills))
\ No newline at end of file
+    return get_skill_matcher().find(text)
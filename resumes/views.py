@@ -1,22 +1,47 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from django.db.models import Avg
+from rest_framework.reverse import reverse
+from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
+from rest_framework.exceptions import ValidationError, NotFound
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.utils.dateparse import parse_date
 import logging
 
-from . import serializers
-from .models import Resume, Category, Classification, JobPosting
+from .models import Resume, Category, Classification, JobPosting, IngestionJob, ResumeSkill
 from .serializers import (
     ResumeSerializer, ResumeListSerializer,
     CategorySerializer, CategoryDetailSerializer,
-    ClassificationSerializer, JobPostingSerializer
+    ClassificationSerializer, JobPostingSerializer,
+    ClassifyBatchSerializer, IngestionJobSerializer, ResumeSkillMatchSerializer,
+    BulkUploadSerializer, MAX_CLASSIFY_BATCH
 )
-from .utils import extract_text, extract_skills as utils_extract_skills
+from .utils import file_sha256, extract_skills as utils_extract_skills
+from .skills import get_skill_matcher
+from .extraction_pool import extract_document
 from .ml_classifier import cv_classifier
+from .pipeline import (
+    get_or_create_categories, save_classification, find_duplicate, reuse_duplicate,
+    index_resume, discard_failed_upload, parse_top_k, classification_data, skills_data
+)
+from .search import SearchResults
+from .bulk_upload import import_archive, ArchiveError
+from .pagination import KeysetPagination
+from .export import (
+    NDJSONRenderer, CSVRenderer, CLASSIFICATION_FIELDS, RESUME_FIELDS, export_rows, streaming_export
+)
+from .stats import rollup_enabled, apply_classifications, live_stats, rollup_stats
+from .warmup import check_readiness
 
 logger = logging.getLogger(__name__)
 
+MAX_MATCHES = 500
+
+# Textes lus et classifiés ensemble par classify-batch (mémoire bornée)
+CLASSIFY_CHUNK_SIZE = 500
+
 
 class ResumeViewSet(viewsets.ModelViewSet):
 
@@ -35,27 +60,88 @@ class ResumeViewSet(viewsets.ModelViewSet):
             return Resume.objects.all()
         return Resume.objects.filter(user=self.request.user)
 
+    def _async_upload_requested(self, request):
+        value = request.query_params.get('async')
+        if value is None:
+            return getattr(settings, 'RESUME_ASYNC_UPLOAD', False)
+        return value.lower() in ('1', 'true', 'yes')
+
+    def _save_upload(self, serializer):
+        uploaded_file = serializer.validated_data['file']
+        sha256 = getattr(self.request, 'upload_sha256', {}).get('file') or file_sha256(uploaded_file)
+        original = find_duplicate(sha256)
+
+        extra = {}
+        if original is not None and getattr(settings, 'RESUME_DEDUPLICATE_FILES', False):
+            # Le fichier identique déjà stocké est partagé au lieu d'être réécrit.
+            extra['file'] = original.file.name
+
+        resume = serializer.save(user=self.request.user, sha256=sha256, **extra)
+        return resume, original
+
+    def create(self, request, *args, **kwargs):
+        if not self._async_upload_requested(request):
+            return super().create(request, *args, **kwargs)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        resume, _ = self._save_upload(serializer)
+        job = IngestionJob.objects.create(resume=resume)
+        logger.info(f"CV {resume.id} mis en file d'attente (job {job.id})")
+
+        return Response({
+            'job_id': job.id,
+            'resume_id': resume.id,
+            'status': job.status,
+            'status_url': reverse('job-detail', args=[job.id], request=request)
+        }, status=status.HTTP_202_ACCEPTED)
+
     def perform_create(self, serializer):
-        resume = serializer.save(user=self.request.user)
+        resume, original = self._save_upload(serializer)
+
+        if original is not None:
+            reuse_duplicate(resume, original)
+        else:
+            try:
+                logger.info(f"Extraction du texte pour le CV {resume.id}")
+                resume.text_content, resume.text_truncated = extract_document(resume.file.path)
+                resume.save()
+                logger.info(f"Texte extrait avec succès pour le CV {resume.id}")
+
+            except Exception as e:
+                raise ValidationError({'error': discard_failed_upload(resume, e)})
+
+        index_resume(resume)
+
+    @action(detail=False, methods=['post'], url_path='bulk-upload')
+    def bulk_upload(self, request):
+        serializer = BulkUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
         try:
-            logger.info(f"Extraction du texte pour le CV {resume.id}")
-            text = extract_text(resume.file.path)
-            resume.text_content = text
-            resume.save()
-            logger.info(f"Texte extrait avec succès pour le CV {resume.id}")
+            report = import_archive(serializer.validated_data['archive'], request.user)
+        except ArchiveError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        except Exception as e:
-            logger.error(f"Erreur lors de l'extraction du texte: {str(e)}")
-            resume.delete()
-            raise serializers.ValidationError({
-                'error': f"Impossible d'extraire le texte du fichier PDF/DOCX: {str(e)}"
-            })
+        created = sum(1 for entry in report if entry['status'] == 'created')
+        return Response({
+            'created': created,
+            'failed': len(report) - created,
+            'files': report
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'], url_path='classify')
     def classify(self, request, pk=None):
         resume = self.get_object()
 
+        try:
+            top_k = parse_top_k(request.query_params.get('top_k', 0))
+        except ValueError:
+            return Response(
+                {'error': 'Paramètre "top_k" invalide (entier positif attendu)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         if not resume.text_content:
             return Response(
                 {'error': 'Pas de texte dans le CV'},
@@ -70,36 +156,116 @@ class ResumeViewSet(viewsets.ModelViewSet):
                 )
 
             logger.info(f"Classification du CV {resume.id}")
-            predicted_category, confidence = cv_classifier.predict(resume.text_content)
+            prediction = cv_classifier.rank(resume.text_content, top_k=top_k)
+            predicted_category, confidence = prediction.category, prediction.confidence
+
+            classification = save_classification(resume, prediction)
+
+            logger.info(f"CV {resume.id} classifié comme {predicted_category} ({confidence:.2%})")
 
-            category, created = Category.objects.get_or_create(
-                name=predicted_category,
-                defaults={'keywords': ''}
+            return Response(
+                classification_data(classification, prediction, top_k), status=status.HTTP_201_CREATED
             )
 
-            if created:
-                logger.info(f"Nouvelle catégorie créée: {predicted_category}")
+        except Exception as e:
+            logger.error(f"Erreur lors de la classification: {str(e)}")
+            return Response(
+                {'error': f'Erreur lors de la classification: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
 
-            resume.classifications.all().delete()
+    @action(detail=False, methods=['post'], url_path='classify-batch')
+    def classify_batch(self, request):
+        input_serializer = ClassifyBatchSerializer(data=request.data)
+        input_serializer.is_valid(raise_exception=True)
+        params = input_serializer.validated_data
 
-            classification = Classification.objects.create(
-                resume=resume,
-                category=category,
-                confidence_score=confidence
+        if not cv_classifier.is_loaded:
+            return Response(
+                {'error': 'Modèle non chargé'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
 
-            logger.info(f"CV {resume.id} classifié comme {predicted_category} ({confidence:.2%})")
+        resumes = self.get_queryset()
+        requested_ids = params.get('resume_ids')
+        if requested_ids is not None:
+            resumes = resumes.filter(id__in=requested_ids)
+        if params.get('unclassified'):
+            resumes = resumes.filter(classifications__isnull=True)
+        if 'uploaded_after' in params:
+            resumes = resumes.filter(uploaded_at__gte=params['uploaded_after'])
+        if 'uploaded_before' in params:
+            resumes = resumes.filter(uploaded_at__lt=params['uploaded_before'])
+
+        # En mode filtres, même plafond que pour resume_ids: les CV suivants
+        # sont traités par un nouvel appel ('truncated' dans la réponse).
+        ids = list(resumes.order_by('id').values_list('id', flat=True)[:MAX_CLASSIFY_BATCH + 1])
+        truncated = len(ids) > MAX_CLASSIFY_BATCH
+        ids = ids[:MAX_CLASSIFY_BATCH]
+        found_ids = set(ids)
+        not_found = sorted({i for i in requested_ids or [] if i not in found_ids})
+
+        try:
+            logger.info(f"Classification par lot de {len(ids)} CV")
+            missing_text, classified_ids, predictions = [], [], []
+            # Textes lus et classifiés par tranches: seule une tranche est en mémoire
+            for start in range(0, len(ids), CLASSIFY_CHUNK_SIZE):
+                chunk_ids, texts = [], []
+                for resume_id, text in Resume.objects.filter(
+                    id__in=ids[start:start + CLASSIFY_CHUNK_SIZE]
+                ).order_by('id').values_list('id', 'text_content'):
+                    if text:
+                        chunk_ids.append(resume_id)
+                        texts.append(text)
+                    else:
+                        missing_text.append(resume_id)
+                if texts:
+                    predictions += cv_classifier.rank_many(texts)
+                    classified_ids += chunk_ids
+
+            categories = get_or_create_categories(
+                sorted({prediction.category for prediction in predictions})
+            )
 
-            serializer = ClassificationSerializer(classification)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            with transaction.atomic():
+                Classification.objects.filter(resume_id__in=classified_ids).delete()
+                created = Classification.objects.bulk_create([
+                    Classification(
+                        resume_id=resume_id,
+                        category=categories[prediction.category],
+                        confidence_score=prediction.confidence,
+                        model_version=prediction.model_version
+                    )
+                    for resume_id, prediction in zip(classified_ids, predictions)
+                ])
+                # bulk_create n'envoie pas post_save: agrégats mis à jour ici.
+                if rollup_enabled():
+                    apply_classifications(created)
 
         except Exception as e:
-            logger.error(f"Erreur lors de la classification: {str(e)}")
+            logger.error(f"Erreur lors de la classification par lot: {str(e)}")
             return Response(
                 {'error': f'Erreur lors de la classification: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+        results = [{
+            'resume_id': resume_id,
+            'category': prediction.category,
+            'confidence': round(prediction.confidence, 4),
+            'model_version': prediction.model_version
+        } for resume_id, prediction in zip(classified_ids, predictions)]
+
+        logger.info(f"{len(results)} CV classifiés, {len(missing_text)} sans texte")
+
+        return Response({
+            'classified': len(results),
+            'results': results,
+            'missing_text': missing_text,
+            'not_found': not_found,
+            'truncated': truncated
+        }, status=status.HTTP_201_CREATED if results else status.HTTP_200_OK)
+
     @action(detail=False, methods=['get'], url_path='by-category')
     def by_category(self, request):
         category_name = request.query_params.get('category')
@@ -111,16 +277,23 @@ class ResumeViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            classifications = Classification.objects.filter(
-                category__name__iexact=category_name
-            ).select_related('resume', 'category', 'resume__user')
-
-            if not classifications.exists():
+            category = Category.objects.filter(name__iexact=category_name).first()
+            paginator = KeysetPagination()
+            matches = filter_classifications(
+                Classification.objects.filter(category=category), request.query_params, by_category=False
+            ) if category else Classification.objects.none()
+            classifications = paginator.paginate_queryset(
+                matches.select_related('resume', 'category', 'resume__user'), request
+            ) if category else []
+
+            if not classifications and not request.query_params.get(paginator.cursor_query_param):
                 return Response(
                     {
                         'message': f'Aucun CV trouvé dans la catégorie "{category_name}"',
                         'category': category_name,
                         'count': 0,
+                        'page_count': 0,
+                        'next': None,
                         'results': []
                     },
                     status=status.HTTP_200_OK
@@ -139,10 +312,14 @@ class ResumeViewSet(viewsets.ModelViewSet):
 
             return Response({
                 'category': category_name,
-                'count': len(data),
+                'count': paginator.get_count(matches),
+                'page_count': len(data),
+                'next': paginator.get_next_link(),
                 'results': data
             }, status=status.HTTP_200_OK)
 
+        except (NotFound, ValidationError):
+            raise
         except Exception as e:
             logger.error(f"Erreur lors de la recherche par catégorie: {str(e)}")
             return Response(
@@ -150,6 +327,210 @@ class ResumeViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=False, methods=['get'], url_path='by-category/count')
+    def by_category_count(self, request):
+        category_name = request.query_params.get('category')
+
+        if not category_name:
+            return Response(
+                {'error': 'Paramètre "category" requis'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        classifications = filter_classifications(
+            Classification.objects.filter(category__name__iexact=category_name),
+            request.query_params, by_category=False
+        )
+        return Response({
+            'category': category_name,
+            'count': classifications.count()
+        })
+
+    def _skill_param(self, request, name):
+        matcher = get_skill_matcher()
+        names = []
+        for value in request.query_params.get(name, '').split(','):
+            value = value.strip()
+            if value:
+                names.append(matcher.canonical(value) or value)
+        return sorted(set(names))
+
+    @action(detail=False, methods=['get'], url_path='by-skills')
+    def by_skills(self, request):
+        required = self._skill_param(request, 'all')
+        optional = self._skill_param(request, 'any')
+
+        if not required and not optional:
+            return Response(
+                {'error': 'Paramètre "all" ou "any" requis (compétences séparées par des virgules)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        resumes = self.get_queryset()
+
+        if required:
+            # Intersection dans la base: CV qui possèdent toutes les compétences
+            # demandées (GROUP BY sur l'index compétence -> CV).
+            matching = ResumeSkill.objects.filter(
+                skill__name__in=required
+            ).values('resume_id').annotate(
+                matched=Count('skill_id')
+            ).filter(matched=len(required)).values('resume_id')
+            resumes = resumes.filter(id__in=matching)
+
+        if optional:
+            resumes = resumes.filter(id__in=ResumeSkill.objects.filter(
+                skill__name__in=optional
+            ).values('resume_id'))
+
+        resumes = resumes.select_related('user').prefetch_related('skills').order_by('-uploaded_at', '-id')
+        page = self.paginate_queryset(resumes)
+        serializer = ResumeSkillMatchSerializer(page, many=True)
+        response = self.get_paginated_response(serializer.data)
+        response.data['all'] = required
+        response.data['any'] = optional
+        return response
+
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        query = request.query_params.get('q', '')
+        results = SearchResults(query, user_id=None if request.user.is_staff else request.user.id)
+
+        if not results.terms:
+            return Response(
+                {'error': 'Paramètre "q" requis'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        page = self.paginate_queryset(results)
+        response = self.get_paginated_response(page)
+        response.data['query'] = query
+        return response
+
+    @action(
+        detail=False, methods=['get'], url_path='export',
+        permission_classes=[IsAdminUser], renderer_classes=[NDJSONRenderer, CSVRenderer]
+    )
+    def export(self, request):
+        """
+        Export en flux des CV avec leur dernière classification. Filtres:
+        category (dernière classification), date_from/date_to (dépôt);
+        include_text=true ajoute le texte extrait.
+        """
+        params = request.query_params
+        latest = Classification.objects.filter(resume=OuterRef('pk')).order_by('-classified_at', '-id')
+        resumes = self.get_queryset().annotate(
+            latest_category=Subquery(latest.values('category__name')[:1]),
+            latest_confidence=Subquery(latest.values('confidence_score')[:1]),
+            latest_model_version=Subquery(latest.values('model_version')[:1]),
+        )
+
+        if params.get('category'):
+            resumes = resumes.filter(latest_category__iexact=params['category'])
+        dates = _date_params(params)
+        if dates.get('date_from'):
+            resumes = resumes.filter(uploaded_at__date__gte=dates['date_from'])
+        if dates.get('date_to'):
+            resumes = resumes.filter(uploaded_at__date__lte=dates['date_to'])
+
+        fields = dict(RESUME_FIELDS)
+        if params.get('include_text', '').lower() in ('1', 'true', 'yes'):
+            fields['text'] = 'text_content'
+
+        return streaming_export(
+            export_rows(resumes, fields), fields, request.accepted_renderer.format, 'resumes'
+        )
+
+    @action(detail=True, methods=['get'], url_path='recommended-jobs')
+    def recommended_jobs(self, request, pk=None):
+        from .matching import recommend_jobs
+
+        resume = self.get_object()
+
+        try:
+            limit = int(request.query_params.get('limit', 10))
+            if not 1 <= limit <= MAX_MATCHES:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {'error': f'Paramètre "limit" invalide (entier entre 1 et {MAX_MATCHES})'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not resume.text_content:
+            return Response(
+                {'error': 'Pas de texte dans le CV'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not cv_classifier.is_loaded:
+            return Response(
+                {'error': 'Modèle non chargé'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        try:
+            ranked = recommend_jobs(resume, limit=limit)
+        except Exception as e:
+            logger.error(f"Erreur lors de la recommandation d'offres: {str(e)}")
+            return Response(
+                {'error': f'Erreur lors de la recommandation: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        postings = JobPosting.objects.select_related('category').in_bulk(
+            [posting_id for posting_id, _ in ranked]
+        )
+        results = [{
+            'job_posting_id': posting_id,
+            'title': postings[posting_id].title,
+            'category': postings[posting_id].category.name,
+            'score': round(score, 4)
+        } for posting_id, score in ranked if posting_id in postings]
+
+        return Response({
+            'resume_id': resume.id,
+            'count': len(results),
+            'results': results
+        })
+
+    @action(detail=True, methods=['get'], url_path='near-duplicates')
+    def near_duplicates(self, request, pk=None):
+        from .near_duplicates import find_near_duplicates
+
+        resume = self.get_object()
+
+        try:
+            threshold = float(request.query_params.get('threshold', 0.9))
+            if not 0.5 <= threshold <= 1:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {'error': 'Paramètre "threshold" invalide (nombre entre 0.5 et 1)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not resume.text_content:
+            return Response(
+                {'error': 'Pas de texte dans le CV'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        duplicates = find_near_duplicates(resume, threshold=threshold, candidates=self.get_queryset())
+        resumes = Resume.objects.select_related('user').in_bulk([resume_id for resume_id, _ in duplicates])
+
+        return Response({
+            'resume_id': resume.id,
+            'threshold': threshold,
+            'count': len(duplicates),
+            'results': [{
+                'resume_id': resume_id,
+                'user': resumes[resume_id].user.username,
+                'similarity': round(score, 4),
+                'uploaded_at': resumes[resume_id].uploaded_at
+            } for resume_id, score in duplicates if resume_id in resumes]
+        })
+
     @action(detail=True, methods=['get'], url_path='extract-skills')
     def get_resume_skills(self, request, pk=None):
         resume = self.get_object()
@@ -161,16 +542,14 @@ class ResumeViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            logger.info(f"Extraction des compétences du CV {resume.id}")
-            skills = utils_extract_skills(resume.text_content)
+            # Compétences indexées à l'ingestion; recalcul seulement pour les
+            # CV pas encore indexés (voir `manage.py backfill_resume_skills`).
+            skills = list(resume.skills.values_list('name', flat=True))
+            if not skills:
+                logger.info(f"Extraction des compétences du CV {resume.id}")
+                skills = utils_extract_skills(resume.text_content)
 
-            return Response({
-                'resume_id': resume.id,
-                'user': resume.user.username,
-                'skills_found': len(skills),
-                'skills': sorted(skills),
-                'extracted_at': resume.uploaded_at
-            }, status=status.HTTP_200_OK)
+            return Response(skills_data(resume, skills), status=status.HTTP_200_OK)
 
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction des compétences: {str(e)}")
@@ -193,7 +572,14 @@ class CategoryViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'], url_path='resumes')
     def get_category_resumes(self, request, pk=None):
         category = self.get_object()
-        classifications = category.classification_set.select_related('resume', 'resume__user')
+        paginator = KeysetPagination()
+        # La catégorie vient de l'URL: le paramètre ?category= n'est pas appliqué
+        matches = filter_classifications(
+            category.classification_set.all(), request.query_params, by_category=False
+        )
+        classifications = paginator.paginate_queryset(
+            matches.select_related('resume', 'resume__user'), request
+        )
 
         data = [{
             'resume_id': c.resume.id,
@@ -205,10 +591,63 @@ class CategoryViewSet(viewsets.ModelViewSet):
 
         return Response({
             'category': category.name,
-            'count': len(data),
+            'count': paginator.get_count(matches),
+            'page_count': len(data),
+            'next': paginator.get_next_link(),
             'resumes': data
         })
 
+    @action(detail=True, methods=['get'], url_path='resumes/count')
+    def get_category_resumes_count(self, request, pk=None):
+        category = self.get_object()
+        classifications = filter_classifications(
+            category.classification_set.all(), request.query_params, by_category=False
+        )
+        return Response({
+            'category': category.name,
+            'count': classifications.count()
+        })
+
+
+def _date_params(params):
+    dates = {}
+    for name in ('date_from', 'date_to'):
+        value = params.get(name)
+        if value:
+            try:
+                dates[name] = parse_date(value)
+            except ValueError:
+                dates[name] = None
+            if dates[name] is None:
+                raise ValidationError({'error': f'Paramètre "{name}" invalide (format AAAA-MM-JJ)'})
+    return dates
+
+
+def filter_classifications(classifications, params, by_category=True):
+    """
+    Filtres communs des listes et de l'export: category, date_from, date_to,
+    min_confidence. by_category=False pour les vues déjà limitées à une catégorie.
+    """
+    category = params.get('category') if by_category else None
+    if category:
+        classifications = classifications.filter(category__name__iexact=category)
+
+    dates = _date_params(params)
+    if dates.get('date_from'):
+        classifications = classifications.filter(classified_at__date__gte=dates['date_from'])
+    if dates.get('date_to'):
+        classifications = classifications.filter(classified_at__date__lte=dates['date_to'])
+
+    min_confidence = params.get('min_confidence')
+    if min_confidence:
+        try:
+            min_confidence = float(min_confidence)
+        except ValueError:
+            raise ValidationError({'error': 'Paramètre "min_confidence" invalide (nombre entre 0 et 1)'})
+        classifications = classifications.filter(confidence_score__gte=min_confidence)
+
+    return classifications
+
 
 class ClassificationViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Classification.objects.all().select_related('resume', 'category')
@@ -219,29 +658,35 @@ class ClassificationViewSet(viewsets.ReadOnlyModelViewSet):
         if getattr(self, 'swagger_fake_view', False):
             return Classification.objects.none()
         if self.request.user.is_staff:
-            return Classification.objects.all()
-        return Classification.objects.filter(resume__user=self.request.user)
+            classifications = Classification.objects.all()
+        else:
+            classifications = Classification.objects.filter(resume__user=self.request.user)
+
+        if self.action in ('list', 'export'):
+            classifications = filter_classifications(classifications, self.request.query_params)
+        return classifications
 
     @action(detail=False, methods=['get'], url_path='stats')
     def get_stats(self, request):
-        classifications = self.get_queryset()
-
-        stats = {
-            'total_classifications': classifications.count(),
-            'average_confidence': round(
-                classifications.aggregate(
-                    avg=Avg('confidence_score')
-                )['avg'] or 0, 4
-            ),
-            'categories_distribution': {}
-        }
-
-        for category in Category.objects.all():
-            count = classifications.filter(category=category).count()
-            if count > 0:
-                stats['categories_distribution'][category.name] = count
-
-        return Response(stats)
+        dates = _date_params(request.query_params)
+
+        # La table d'agrégats couvre toutes les classifications: elle ne sert
+        # que pour le staff, les autres utilisateurs ne voient que leurs CV.
+        if request.user.is_staff and rollup_enabled():
+            return Response(rollup_stats(**dates))
+        return Response(live_stats(self.get_queryset(), **dates))
+
+    @action(
+        detail=False, methods=['get'], url_path='export',
+        permission_classes=[IsAdminUser], renderer_classes=[NDJSONRenderer, CSVRenderer]
+    )
+    def export(self, request):
+        # ?format=ndjson|csv (ou l'en-tête Accept) choisit le renderer; la
+        # réponse est écrite en flux sans passer par celui-ci.
+        return streaming_export(
+            export_rows(self.get_queryset()), CLASSIFICATION_FIELDS,
+            request.accepted_renderer.format, 'classifications'
+        )
 
 
 class JobPostingViewSet(viewsets.ModelViewSet):
@@ -255,3 +700,141 @@ class JobPostingViewSet(viewsets.ModelViewSet):
         if not self.request.user.is_staff:
             return JobPosting.objects.filter(is_active=True)
         return JobPosting.objects.all()
+
+    @action(detail=True, methods=['get'], url_path='matches')
+    def matches(self, request, pk=None):
+        from .matching import resume_index
+
+        posting = self.get_object()
+
+        try:
+            limit = int(request.query_params.get('limit', 50))
+            if not 1 <= limit <= MAX_MATCHES:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {'error': f'Paramètre "limit" invalide (entier entre 1 et {MAX_MATCHES})'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        same_category = request.query_params.get('same_category') == 'true'
+
+        if not cv_classifier.is_loaded:
+            return Response(
+                {'error': 'Modèle non chargé'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        resumes = Resume.objects.all()
+        if not request.user.is_staff:
+            resumes = resumes.filter(user=request.user)
+        if same_category:
+            # Catégorie de la classification la plus récente de chaque CV.
+            latest_category = Classification.objects.filter(
+                resume=OuterRef('pk')
+            ).order_by('-classified_at').values('category_id')[:1]
+            resumes = resumes.annotate(
+                latest_category=Subquery(latest_category)
+            ).filter(latest_category=posting.category_id)
+
+        allowed_ids = None
+        if same_category or not request.user.is_staff:
+            allowed_ids = list(resumes.values_list('id', flat=True))
+
+        try:
+            ranked = resume_index.rank(
+                f"{posting.title} {posting.description}", limit=limit, allowed_ids=allowed_ids
+            )
+        except Exception as e:
+            logger.error(f"Erreur lors du classement des CV: {str(e)}")
+            return Response(
+                {'error': f'Erreur lors du classement des CV: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        found = Resume.objects.select_related('user').in_bulk([resume_id for resume_id, _ in ranked])
+        deleted = [resume_id for resume_id, _ in ranked if resume_id not in found]
+        if deleted:
+            resume_index.discard(deleted)
+
+        results = [{
+            'resume_id': resume_id,
+            'user': found[resume_id].user.username,
+            'score': round(score, 4),
+            'uploaded_at': found[resume_id].uploaded_at
+        } for resume_id, score in ranked if resume_id in found]
+
+        return Response({
+            'job_posting': posting.id,
+            'title': posting.title,
+            'same_category': same_category,
+            'count': len(results),
+            'results': results
+        })
+
+
+class IngestionJobViewSet(viewsets.ReadOnlyModelViewSet):
+    serializer_class = IngestionJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return IngestionJob.objects.none()
+        jobs = IngestionJob.objects.select_related('resume')
+        if self.request.user.is_staff:
+            return jobs
+        return jobs.filter(resume__user=self.request.user)
+
+
+class MLModelViewSet(viewsets.ViewSet):
+    permission_classes = [IsAdminUser]
+
+    def list(self, request):
+        return Response({
+            'is_loaded': cv_classifier.is_loaded,
+            'version': cv_classifier.version,
+            'load_seconds': cv_classifier.load_seconds,
+            'categories': cv_classifier.get_all_categories(),
+            'prediction_cache': cv_classifier.cache.stats() if cv_classifier.cache else None,
+            'inference_batching': cv_classifier.batcher.stats() if cv_classifier.batcher else None
+        })
+
+    @action(detail=False, methods=['post'], url_path='reload')
+    def reload(self, request):
+        previous_version = cv_classifier.version
+
+        try:
+            logger.info(f"Rechargement du modèle demandé par {request.user.username}")
+            version = cv_classifier.reload()
+        except Exception as e:
+            logger.error(f"Erreur lors du rechargement du modèle: {str(e)}")
+            return Response(
+                {
+                    'error': f'Erreur lors du rechargement du modèle: {str(e)}',
+                    'version': previous_version
+                },
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        return Response({
+            'previous_version': previous_version,
+            'version': version,
+            'reloaded': version != previous_version
+        })
+
+
+class HealthViewSet(viewsets.ViewSet):
+    """Sondes du répartiteur de charge, sans authentification."""
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def live(self, request):
+        return Response({'status': 'alive'})
+
+    def ready(self, request):
+        # La première sonde préchauffe le worker (inférence + extraction):
+        # 503 tant que le chemin chaud n'est pas prêt.
+        ready, report = check_readiness()
+        return Response(
+            {'status': 'ready' if ready else 'not_ready', **report},
+            status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+        )
@@ -0,0 +1,144 @@
+"""
+Préchauffage des workers web et état de disponibilité (readiness).
+
+Les dépendances lourdes (PyPDF2, python-docx, numpy/scipy) et le modèle ne
+sont chargés qu'au premier usage, ce qui accélère `manage.py` et le démarrage
+des workers mais reporte ce coût sur la première requête. Deux façons de le
+payer avant le trafic:
+- RESUMES_WARMUP = True: `cvclassifier.wsgi` et `cvclassifier.asgi` appellent
+  warm_up() après la création de l'application. warm_up() ne démarre pas le
+  pool d'extraction: avec un serveur qui importe l'application avant le fork
+  (gunicorn --preload), ses threads ne seraient pas copiés dans les workers;
+  le pool de chaque worker est créé par sa sonde ou sa première extraction;
+- GET /api/health/ready/: check_readiness() fait une inférence et une
+  extraction de préchauffage, et ne répond 200 qu'une fois le chemin chaud
+  prêt. Le répartiteur de charge n'envoie alors du trafic qu'aux workers
+  préchauffés.
+"""
+import importlib
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+from .ml_classifier import cv_classifier
+from .extraction_pool import extract_document
+
+logger = logging.getLogger(__name__)
+
+MODULES = ('PyPDF2', 'docx', 'resumes.matching', 'resumes.near_duplicates')
+
+WARMUP_TEXT = "python django sql project management"
+
+# Dernier rapport de disponibilité réussi du processus (refait après un
+# rechargement du modèle) et verrou pour qu'un seul préchauffage tourne.
+_report = None
+_report_lock = threading.Lock()
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def warm_up_model():
+    """Charge le modèle et fait une inférence complète hors cache; renvoie son état."""
+    state = cv_classifier.snapshot()
+    if state is None:
+        raise ValueError("Modèle non chargé")
+
+    started = time.perf_counter()
+    state.model.predict_proba(state.vectorizer.transform([WARMUP_TEXT]))
+    return {
+        'version': state.version,
+        'load_seconds': state.load_seconds,
+        'vocabulary_size': len(state.vectorizer.vocabulary_),
+        'categories': len(state.model.classes_),
+        'warmup_ms': _elapsed_ms(started),
+    }
+
+
+def warm_up_extraction():
+    """Extrait un DOCX minimal dans le pool d'extraction; renvoie la durée en ms."""
+    from docx import Document
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'warmup.docx')
+        document = Document()
+        document.add_paragraph(WARMUP_TEXT)
+        document.save(path)
+
+        started = time.perf_counter()
+        text, _ = extract_document(path)
+        if WARMUP_TEXT not in text:
+            raise ValueError("Texte extrait inattendu")
+        return _elapsed_ms(started)
+
+
+def check_readiness():
+    """
+    (prêt, rapport). Le préchauffage n'est refait que s'il a échoué ou si la
+    version du modèle a changé: les sondes suivantes sont immédiates.
+    """
+    global _report
+
+    report = _report
+    if report is not None and report['model']['version'] == cv_classifier.version:
+        return True, report
+
+    with _report_lock:
+        report = {'model': {'loaded': False}, 'extraction': {'ok': False}}
+        try:
+            report['model'] = {'loaded': True, **warm_up_model()}
+        except Exception as e:
+            logger.error(f"Préchauffage du modèle impossible: {str(e)}")
+            report['model']['error'] = str(e)
+        try:
+            report['extraction'] = {'ok': True, 'warmup_ms': warm_up_extraction()}
+        except Exception as e:
+            logger.error(f"Préchauffage de l'extraction impossible: {str(e)}")
+            report['extraction']['error'] = str(e)
+
+        ready = report['model']['loaded'] and report['extraction']['ok']
+        if ready:
+            _report = report
+        return ready, report
+
+
+def warm_up():
+    """
+    Charge modules, modèle et compétences; renvoie la durée (s) de chaque
+    étape. Sans pool d'extraction: cette fonction peut tourner avant le fork.
+    """
+    from .skills import get_skill_matcher
+
+    timings = {}
+    for module in MODULES:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            logger.error(f"Préchauffage de {module} impossible: {str(e)}")
+        timings[module] = round(time.perf_counter() - started, 4)
+
+    started = time.perf_counter()
+    try:
+        warm_up_model()
+    except Exception as e:
+        logger.error(f"Préchauffage du modèle impossible: {str(e)}")
+    timings['model'] = round(time.perf_counter() - started, 4)
+
+    started = time.perf_counter()
+    get_skill_matcher()
+    timings['skills'] = round(time.perf_counter() - started, 4)
+
+    logger.info(f"Préchauffage terminé en {sum(timings.values()):.2f}s: {timings}")
+    return timings
+
+
+def warm_up_if_enabled():
+    if getattr(settings, 'RESUMES_WARMUP', False):
+        return warm_up()
+    return None